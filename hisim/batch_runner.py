@@ -0,0 +1,184 @@
+""" Runs a batch of simulations, for example a parameter sweep, on a process pool.
+
+A task is either a setup function in a module, optionally with a module config, or a json file of the JsonExecutor.
+Every task starts with new singletons, so the SingletonSimRepository and the ResultPathProviderSingleton of one
+simulation never leak into the next one in the same process. The stores of the parsed LPG result files get reset
+as well, so long running workers do not keep the profiles of all households. The TABULA, PV and weather input data
+is read once in the parent process. With the fork start method, the workers inherit it and use it read only.
+
+Usage: python -m hisim.batch_runner --workers 4 system_setups/basic_household.py:setup_function my_config.json
+"""
+# clean
+import argparse
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import List, Optional
+
+from hisim import hisim_main, log
+from hisim.json_executor import JsonExecutor
+from hisim.lpg_result_store import reset_lpg_result_stores
+from hisim.sim_repository_singleton import SingletonMeta
+
+
+@dataclass
+class BatchTask:
+
+    """ A single simulation of a batch, either a setup function in a module or a json file. """
+
+    name: str
+    path_to_module: Optional[str] = None
+    function_in_module: Optional[str] = None
+    module_config_path: Optional[str] = None
+    json_filepath: Optional[str] = None
+
+    @classmethod
+    def from_string(cls, task_string: str) -> "BatchTask":
+        """ Parses a json file or module.py:setup_function with an optional :module_config.json. """
+        if task_string.endswith(".json") and ".py:" not in task_string:
+            return cls(name=task_string, json_filepath=task_string)
+        # the paths can contain colons after windows drive letters, so the module path ends at the first .py:
+        path_to_module, separator, function_and_config = task_string.partition(".py:")
+        function_in_module, _, module_config_path = function_and_config.partition(":")
+        if not separator or not function_in_module:
+            raise ValueError("A task must be a json file or module.py:setup_function[:module_config.json]: " + task_string)
+        return cls(
+            name=task_string,
+            path_to_module=path_to_module + ".py",
+            function_in_module=function_in_module,
+            module_config_path=module_config_path or None,
+        )
+
+
+@dataclass
+class BatchTaskResult:
+
+    """ The outcome of a task. """
+
+    name: str
+    succeeded: bool
+    attempts: int
+    duration_in_seconds: float
+    error: str = ""
+
+
+def preload_inputs(weather_locations: List[str], year: Optional[int]) -> None:
+    """ Reads the TABULA, PV and preprocessed weather data into the caches of this process, so forked workers can share it. """
+    # pylint: disable=import-outside-toplevel
+    from hisim.components import building, generic_pv_system, weather
+
+    building.get_tabula_index()
+    generic_pv_system.get_module_and_inverter_data()
+    for location in weather_locations:
+        if year is None:
+            raise ValueError("The year is needed to preload the weather data.")
+        weather_config = weather.WeatherConfig.get_default(weather.LocationEnum[location])
+        weather.get_preprocessed_weather_data(weather_config.source_path, weather_config.data_source, year)
+
+
+def run_task(task: BatchTask, retries: int = 0) -> BatchTaskResult:
+    """ Runs one task with new singletons and retries it if it fails. """
+    starttime = time.perf_counter()
+    error = ""
+    for attempt in range(1, retries + 2):
+        SingletonMeta.reset_instances()
+        reset_lpg_result_stores()
+        try:
+            if task.json_filepath is not None:
+                JsonExecutor(task.json_filepath).execute_all()
+            else:
+                if task.path_to_module is None or task.function_in_module is None:
+                    raise ValueError("The task " + task.name + " has neither a json file nor a setup function.")
+                hisim_main.main(
+                    path_to_module=task.path_to_module,
+                    function_in_module=task.function_in_module,
+                    my_module_config_path=task.module_config_path,
+                )
+            return BatchTaskResult(task.name, True, attempt, time.perf_counter() - starttime)
+        except Exception as exception:  # pylint: disable=broad-except
+            error = type(exception).__name__ + ": " + str(exception)
+            log.error("Task " + task.name + " failed in attempt " + str(attempt) + ":\n" + traceback.format_exc())
+        finally:
+            SingletonMeta.reset_instances()
+            reset_lpg_result_stores()
+    return BatchTaskResult(task.name, False, retries + 1, time.perf_counter() - starttime, error)
+
+
+def run_batch(
+    tasks: List[BatchTask],
+    number_of_workers: int = 1,
+    retries: int = 0,
+    weather_locations: Optional[List[str]] = None,
+    year: Optional[int] = None,
+) -> List[BatchTaskResult]:
+    """ Runs all tasks on a process pool and returns the results in the order of the tasks. 0 workers uses all cores. """
+    if number_of_workers <= 0:
+        number_of_workers = os.cpu_count() or 1
+    number_of_workers = min(number_of_workers, max(len(tasks), 1))
+    preload_inputs(weather_locations or [], year)
+    if number_of_workers == 1:
+        results = [run_task(task, retries) for task in tasks]
+    else:
+        # forked workers inherit the preloaded inputs, other start methods read them on first use
+        mp_context = None
+        if "fork" in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context("fork")
+        log.flush()
+        with ProcessPoolExecutor(max_workers=number_of_workers, mp_context=mp_context) as process_pool:
+            results = list(process_pool.map(partial(run_task, retries=retries), tasks))
+    for line in get_summary_lines(results):
+        log.information(line)
+    return results
+
+
+def get_summary_lines(results: List[BatchTaskResult]) -> List[str]:
+    """ Formats the results as table. """
+    name_width = max([len("Task")] + [len(result.name) for result in results])
+    lines = ["Task".ljust(name_width) + " | Status | Attempts | Duration [s] | Error"]
+    lines.append("-" * len(lines[0]))
+    for result in results:
+        status = "ok" if result.succeeded else "failed"
+        lines.append(
+            result.name.ljust(name_width)
+            + " | "
+            + status.ljust(6)
+            + " | "
+            + str(result.attempts).rjust(8)
+            + " | "
+            + f"{result.duration_in_seconds:12.1f}"
+            + " | "
+            + result.error
+        )
+    number_of_failures = sum(1 for result in results if not result.succeeded)
+    lines.append(str(len(results) - number_of_failures) + " of " + str(len(results)) + " tasks succeeded.")
+    return lines
+
+
+def main() -> None:
+    """ Command line interface to run a batch of simulations. """
+    parser = argparse.ArgumentParser(description="Run a batch of HiSim simulations on a process pool.")
+    parser.add_argument("tasks", nargs="+", help="json files or module.py:setup_function[:module_config.json]")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes, 0 uses all cores.")
+    parser.add_argument("--retries", type=int, default=0, help="How often a failed task is repeated.")
+    parser.add_argument(
+        "--weather-location", action="append", default=[], help="Weather location to preload, e.g. Aachen."
+    )
+    parser.add_argument("--year", type=int, help="Year of the weather data to preload.")
+    arguments = parser.parse_args()
+    results = run_batch(
+        [BatchTask.from_string(task_string) for task_string in arguments.tasks],
+        number_of_workers=arguments.workers,
+        retries=arguments.retries,
+        weather_locations=arguments.weather_location,
+        year=arguments.year,
+    )
+    if not all(result.succeeded for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+""" Reads and writes the cache files of the components in different file formats.
+
+Every cache file holds a table of equally long columns and optionally some metadata.
+The format is chosen by the file extension, see CacheFormat in the simulation parameters.
+"""
+# clean
+import io
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hisim import log
+from hisim.cache_manager import write_file_atomically
+from hisim.simulationparameters import CacheFormat
+
+CacheColumns = Dict[str, np.ndarray]
+
+
+class CacheBackend:
+
+    """ Base class for a cache file format. """
+
+    def save(self, filepath: str, columns: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> None:
+        """ Saves the columns and the metadata. """
+        raise NotImplementedError()
+
+    def load(self, filepath: str) -> Tuple[CacheColumns, Dict[str, Any]]:
+        """ Loads the columns and the metadata. """
+        raise NotImplementedError()
+
+
+class CsvCacheBackend(CacheBackend):
+
+    """ The original text format.
+
+    Either a plain csv table or, if there is metadata, a json file with the metadata and the csv table as string
+    in the entry "data", like the UTSP connector used to save its results.
+    """
+
+    def save(self, filepath: str, columns: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> None:
+        """ Saves the columns as csv table. """
+        dataframe = pd.DataFrame(columns)
+        if metadata is None:
+            write_file_atomically(
+                filepath, "w", lambda file: dataframe.to_csv(file, sep=",", decimal=".", index=False), encoding="utf-8"
+            )
+            return
+        cache_content = dict(metadata)
+        cache_content["data"] = dataframe.to_csv(sep=",", decimal=".", index=False)
+        write_file_atomically(filepath, "w", lambda file: json.dump(cache_content, file), encoding="utf-8")
+
+    def load(self, filepath: str) -> Tuple[CacheColumns, Dict[str, Any]]:
+        """ Parses the csv table. The index column written by older versions gets dropped. """
+        with open(filepath, "r", encoding="cp1252") as file:
+            content = file.read()
+        metadata: Dict[str, Any] = {}
+        if content.startswith("{"):
+            metadata = json.loads(content)
+            content = metadata.pop("data")
+        dataframe = pd.read_csv(io.StringIO(content), sep=",", decimal=".")
+        columns = {
+            str(name): dataframe[name].to_numpy() for name in dataframe.columns if not str(name).startswith("Unnamed")
+        }
+        return columns, metadata
+
+
+class NumpyCacheBackend(CacheBackend):
+
+    """ Binary format: one structured .npy array with a field per column, which gets memory mapped on load.
+
+    The metadata is saved as json file next to the array.
+    """
+
+    def save(self, filepath: str, columns: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> None:
+        """ Saves the columns as fields of a structured array. """
+        arrays = {name: np.asarray(values) for name, values in columns.items()}
+        number_of_rows = len(next(iter(arrays.values()))) if arrays else 0
+        table = np.empty(number_of_rows, dtype=[(name, array.dtype) for name, array in arrays.items()])
+        for name, array in arrays.items():
+            table[name] = array
+        # the metadata comes first, because the existence of the array marks the cache file as complete
+        if metadata is not None:
+            write_file_atomically(
+                self.get_metadata_filepath(filepath), "w", lambda file: json.dump(metadata, file), encoding="utf-8"
+            )
+        write_file_atomically(filepath, "wb", lambda file: np.save(file, table, allow_pickle=False))
+
+    def load(self, filepath: str) -> Tuple[CacheColumns, Dict[str, Any]]:
+        """ Memory maps the array, so only the columns that are actually used get read from the disk. """
+        table = np.load(filepath, mmap_mode="r", allow_pickle=False)
+        columns = {name: table[name] for name in table.dtype.names}
+        metadata: Dict[str, Any] = {}
+        metadata_filepath = self.get_metadata_filepath(filepath)
+        if os.path.isfile(metadata_filepath):
+            with open(metadata_filepath, "r", encoding="utf-8") as file:
+                metadata = json.load(file)
+        return columns, metadata
+
+    @staticmethod
+    def get_metadata_filepath(filepath: str) -> str:
+        """ Gets the path of the json file with the metadata. """
+        return os.path.splitext(filepath)[0] + ".json"
+
+
+CACHE_BACKENDS: Dict[CacheFormat, CacheBackend] = {
+    CacheFormat.CSV: CsvCacheBackend(),
+    CacheFormat.NUMPY: NumpyCacheBackend(),
+}
+
+
+def get_cache_backend(filepath: str) -> CacheBackend:
+    """ Gets the backend for a cache file by its extension. """
+    extension = os.path.splitext(filepath)[1]
+    for cache_format, backend in CACHE_BACKENDS.items():
+        if cache_format.value == extension:
+            return backend
+    raise ValueError("No cache backend is registered for the file " + filepath)
+
+
+def migrate_cache_file(legacy_filepath: str, filepath: str) -> bool:
+    """ Converts a cache file into the format of the new file path and deletes the old file.
+
+    Returns False if the old file could not be read, in which case it is left untouched.
+    """
+    try:
+        columns, metadata = get_cache_backend(legacy_filepath).load(legacy_filepath)
+        get_cache_backend(filepath).save(filepath, columns, metadata if metadata else None)
+    except (ValueError, KeyError, UnicodeDecodeError, pd.errors.ParserError) as error:
+        log.warning("Could not migrate the cache file " + legacy_filepath + ": " + str(error))
+        if os.path.isfile(filepath):
+            os.remove(filepath)
+        return False
+    os.remove(legacy_filepath)
+    log.information("Migrated the cache file " + legacy_filepath + " to " + filepath)
+    return True
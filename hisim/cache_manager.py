@@ -0,0 +1,243 @@
+""" Keeps an index of the cache files and limits the size of the cache directory.
+
+The index in HISIMPATH["cache_indices"] holds for every cache file the producing component, the size and the
+creation and last access times. If a size limit is set, the least recently used files get deleted whenever a new
+cache file gets written. Several simulations can share the cache directory: the index is replaced atomically and
+files that are missing in the index, for example because two processes wrote the index at the same time,
+get added again from the directory on the next change.
+
+Usage: python -m hisim.cache_manager list | prune [--max-size-mb SIZE] [--older-than-days DAYS] [--component NAME]
+| set-limit SIZE_MB | rebuild
+"""
+# clean
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from hisim import log
+from hisim.simulationparameters import CacheFormat
+
+
+def write_file_atomically(filepath: str, mode: str, write_function: Any, encoding: Optional[str] = None) -> None:
+    """ Writes into a temporary file in the same directory and renames it afterwards.
+
+    Readers therefore either see the complete old file, the complete new file or no file, but never half a file.
+    """
+    directory, filename = os.path.split(filepath)
+    file_descriptor, temporary_filepath = tempfile.mkstemp(prefix=filename + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(file_descriptor, mode, encoding=encoding) as file:
+            write_function(file)
+        os.replace(temporary_filepath, filepath)
+    except BaseException:
+        if os.path.isfile(temporary_filepath):
+            os.remove(temporary_filepath)
+        raise
+
+
+class CacheManager:
+
+    """ Maintains the index of one cache directory. """
+
+    def __init__(self, cache_directory: str, index_filepath: str) -> None:
+        """ Initializes the manager. The index gets read lazily on every change, so it is never stale. """
+        self.cache_directory: str = cache_directory
+        self.index_filepath: str = index_filepath
+
+    @staticmethod
+    def get_entry_name(filepath: str) -> str:
+        """ Gets the name of a cache file in the index. """
+        return os.path.basename(filepath)
+
+    @staticmethod
+    def get_component_name(entry_name: str) -> str:
+        """ Gets the component key from a cache file name, which is the component key followed by the hash. """
+        return os.path.splitext(entry_name)[0].rsplit("_", 1)[0]
+
+    def get_entry_filepaths(self, entry_name: str) -> List[str]:
+        """ Gets the cache file and the metadata file that belongs to it, if there is one. """
+        filepath = os.path.join(self.cache_directory, entry_name)
+        metadata_filepath = os.path.splitext(filepath)[0] + ".json"
+        return [path for path in [filepath, metadata_filepath] if os.path.isfile(path)]
+
+    def get_entry_size(self, entry_name: str) -> int:
+        """ Gets the size of a cache file together with its metadata file. """
+        return sum(os.path.getsize(path) for path in self.get_entry_filepaths(entry_name))
+
+    def load_index(self) -> Dict[str, Any]:
+        """ Reads the index and adds or removes entries for files that were changed by someone else. """
+        index: Dict[str, Any] = {"size_limit_in_bytes": None, "entries": {}}
+        if os.path.isfile(self.index_filepath):
+            try:
+                with open(self.index_filepath, "r", encoding="utf-8") as file:
+                    index = json.load(file)
+            except json.JSONDecodeError:
+                log.warning("The cache index " + self.index_filepath + " is broken and gets rebuilt.")
+        entries: Dict[str, Dict[str, Any]] = index["entries"]
+        cache_extensions = [cache_format.value for cache_format in CacheFormat]
+        existing_entry_names = set()
+        if os.path.isdir(self.cache_directory):
+            for entry_name in os.listdir(self.cache_directory):
+                if os.path.splitext(entry_name)[1] in cache_extensions:
+                    existing_entry_names.add(entry_name)
+        for entry_name in list(entries):
+            if entry_name not in existing_entry_names:
+                del entries[entry_name]
+        for entry_name in existing_entry_names - set(entries):
+            modification_time = os.path.getmtime(os.path.join(self.cache_directory, entry_name))
+            entries[entry_name] = {
+                "component": self.get_component_name(entry_name),
+                "size_in_bytes": self.get_entry_size(entry_name),
+                "created": modification_time,
+                "last_access": modification_time,
+            }
+        return index
+
+    def save_index(self, index: Dict[str, Any]) -> None:
+        """ Replaces the index atomically. """
+        if not os.path.isdir(self.cache_directory):
+            os.makedirs(self.cache_directory)
+        write_file_atomically(
+            self.index_filepath, "w", lambda file: json.dump(index, file, indent=1), encoding="utf-8"
+        )
+
+    def record_access(self, filepath: str) -> None:
+        """ Updates the last access time of a cache file that gets read. """
+        index = self.load_index()
+        entry = index["entries"].get(self.get_entry_name(filepath))
+        if entry is not None:
+            entry["last_access"] = time.time()
+        self.save_index(index)
+
+    def record_write(self, filepath: str) -> None:
+        """ Adds a new cache file to the index and enforces the size limit. """
+        index = self.load_index()
+        entry_name = self.get_entry_name(filepath)
+        now = time.time()
+        index["entries"][entry_name] = {
+            "component": self.get_component_name(entry_name),
+            "size_in_bytes": self.get_entry_size(entry_name),
+            "created": now,
+            "last_access": now,
+        }
+        if index["size_limit_in_bytes"] is not None:
+            self.evict_least_recently_used(index, index["size_limit_in_bytes"], keep=[entry_name])
+        self.save_index(index)
+
+    def evict_least_recently_used(
+        self, index: Dict[str, Any], size_limit_in_bytes: int, keep: Optional[List[str]] = None
+    ) -> List[str]:
+        """ Deletes the least recently used files until the cache fits into the size limit. """
+        entries: Dict[str, Dict[str, Any]] = index["entries"]
+        total_size = sum(entry["size_in_bytes"] for entry in entries.values())
+        evicted: List[str] = []
+        for entry_name in sorted(entries, key=lambda name: entries[name]["last_access"]):
+            if total_size <= size_limit_in_bytes:
+                break
+            if keep is not None and entry_name in keep:
+                continue
+            total_size -= entries[entry_name]["size_in_bytes"]
+            self.delete_entry(index, entry_name)
+            evicted.append(entry_name)
+        if evicted:
+            log.information("Evicted " + str(len(evicted)) + " files from the cache to stay within its size limit.")
+        return evicted
+
+    def delete_entry(self, index: Dict[str, Any], entry_name: str) -> None:
+        """ Deletes a cache file, its metadata file and its index entry. """
+        for path in self.get_entry_filepaths(entry_name):
+            os.remove(path)
+        del index["entries"][entry_name]
+
+    def prune(
+        self,
+        max_size_in_bytes: Optional[int] = None,
+        older_than_days: Optional[float] = None,
+        component: Optional[str] = None,
+    ) -> List[str]:
+        """ Deletes files of a component, files that were not used for some days and then the least recently used files. """
+        index = self.load_index()
+        entries: Dict[str, Dict[str, Any]] = index["entries"]
+        deleted: List[str] = []
+        if component is not None or older_than_days is not None:
+            for entry_name in list(entries):
+                entry = entries[entry_name]
+                if component is not None and entry["component"] != component:
+                    continue
+                if older_than_days is not None and time.time() - entry["last_access"] < older_than_days * 86400:
+                    continue
+                self.delete_entry(index, entry_name)
+                deleted.append(entry_name)
+        if max_size_in_bytes is not None:
+            deleted.extend(self.evict_least_recently_used(index, max_size_in_bytes))
+        self.save_index(index)
+        return deleted
+
+    def set_size_limit(self, size_limit_in_bytes: Optional[int]) -> None:
+        """ Sets the size limit that is enforced whenever a new cache file gets written. None means no limit. """
+        index = self.load_index()
+        index["size_limit_in_bytes"] = size_limit_in_bytes
+        if size_limit_in_bytes is not None:
+            self.evict_least_recently_used(index, size_limit_in_bytes)
+        self.save_index(index)
+
+    def get_report_lines(self) -> List[str]:
+        """ Lists all cache files, the most recently used first. """
+        index = self.load_index()
+        entries: Dict[str, Dict[str, Any]] = index["entries"]
+        lines: List[str] = []
+        for entry_name in sorted(entries, key=lambda name: entries[name]["last_access"], reverse=True):
+            entry = entries[entry_name]
+            lines.append(
+                f"{entry['component']}: {entry['size_in_bytes'] / 1e6:.1f} MB, "
+                f"created {datetime.datetime.fromtimestamp(entry['created']):%Y-%m-%d %H:%M}, "
+                f"last used {datetime.datetime.fromtimestamp(entry['last_access']):%Y-%m-%d %H:%M} ({entry_name})"
+            )
+        total_size = sum(entry["size_in_bytes"] for entry in entries.values())
+        size_limit = index["size_limit_in_bytes"]
+        lines.append(
+            f"{len(entries)} cache files with {total_size / 1e6:.1f} MB in total, size limit: "
+            + ("none" if size_limit is None else f"{size_limit / 1e6:.1f} MB")
+        )
+        return lines
+
+
+def main() -> None:
+    """ Command line interface to inspect and prune the cache. """
+    from hisim import utils  # pylint: disable=import-outside-toplevel
+
+    parser = argparse.ArgumentParser(description="Inspect and prune the HiSim cache directory.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List all cache files.")
+    prune_parser = subparsers.add_parser("prune", help="Delete cache files.")
+    prune_parser.add_argument("--max-size-mb", type=float, help="Delete the least recently used files above this size.")
+    prune_parser.add_argument("--older-than-days", type=float, help="Delete files that were not used for this many days.")
+    prune_parser.add_argument("--component", help="Delete the files of this component.")
+    limit_parser = subparsers.add_parser("set-limit", help="Set the size limit, 0 removes the limit.")
+    limit_parser.add_argument("size_mb", type=float)
+    subparsers.add_parser("rebuild", help="Rebuild the index from the files in the cache directory.")
+    arguments = parser.parse_args()
+
+    cache_manager = utils.get_cache_manager()
+    if arguments.command == "list":
+        for line in cache_manager.get_report_lines():
+            log.information(line)
+    elif arguments.command == "prune":
+        max_size_in_bytes = None if arguments.max_size_mb is None else int(arguments.max_size_mb * 1e6)
+        deleted = cache_manager.prune(max_size_in_bytes, arguments.older_than_days, arguments.component)
+        log.information("Deleted " + str(len(deleted)) + " cache files.")
+    elif arguments.command == "set-limit":
+        cache_manager.set_size_limit(int(arguments.size_mb * 1e6) if arguments.size_mb > 0 else None)
+    elif arguments.command == "rebuild":
+        index = cache_manager.load_index()
+        index["entries"] = {}
+        cache_manager.save_index(index)
+        cache_manager.save_index(cache_manager.load_index())
+
+
+if __name__ == "__main__":
+    main()
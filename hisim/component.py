@@ -10,6 +10,7 @@ import typing
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple, Type
 
+import numpy as np
 import pandas as pd
 from dataclass_wizard import JSONWizard
 
@@ -111,27 +112,34 @@ class ComponentInput:  # noqa: too-few-public-methods
 
 class SingleTimeStepValues:
 
-    """ Contains the values for a single time step. """
+    """ Contains the values for a single time step.
+
+    The values are kept in a preallocated float64 numpy array, so copying and the convergence check
+    can be done in a single vectorized operation instead of walking a python list.
+    """
 
     def __init__(self, number_of_values: int):
         """ Initializes a new single time step values class. """
-        self.values = [0.0] * number_of_values
+        self.values: np.ndarray = np.zeros(number_of_values, dtype=np.float64)
+        # scratch buffer for the convergence check, so no temporary arrays are allocated in every iteration
+        self.difference_buffer: np.ndarray = np.empty(number_of_values, dtype=np.float64)
 
-    def copy_values_from_other(self, other):
-        """ Copy all values from a single time step values. """
-        self.values = other.values[:]
+    def copy_values_from_other(self, other: "SingleTimeStepValues") -> None:
+        """ Copy all values from a single time step values into the existing buffer. """
+        np.copyto(self.values, other.values)
 
-    def clone(self):
+    def clone(self) -> "SingleTimeStepValues":
         """ Makes a copy of the current object. """
         newstsv = SingleTimeStepValues(len(self.values))
-        newstsv.values = self.values[:]
+        np.copyto(newstsv.values, self.values)
         return newstsv
 
     def get_input_value(self, component_input: ComponentInput) -> float:
         """ Gets a value for an input from the single time step values. """
         if component_input.source_output is None:
             return 0
-        return self.values[component_input.source_output.global_index]
+        # a plain python float, so the components keep calculating with python floats
+        return float(self.values[component_input.source_output.global_index])
 
     def set_output_value(self, output: ComponentOutput, value: float) -> None:
         """ Sets a single output value in the single time step values array. """
@@ -139,20 +147,18 @@ class SingleTimeStepValues:
 
     def is_close_enough_to_previous(self, previous_values: "SingleTimeStepValues") -> bool:
         """ Checks if the values are sufficiently similar to another array. """
-        count = len(self.values)
-        for i in range(count):
-            if abs(previous_values.values[i] - self.values[i]) > 0.0001:
-                return False
-        return True
+        np.subtract(previous_values.values, self.values, out=self.difference_buffer)
+        np.abs(self.difference_buffer, out=self.difference_buffer)
+        # "not any larger" instead of a max or allclose, so nan values are ignored exactly like before
+        return not (self.difference_buffer > 0.0001).any()
 
     def get_differences_for_error_msg(self, previous_values: Any, outputs: List[ComponentOutput]) -> str:
         """ Gets a pretty error message for the differences between two time steps. """
-        count = len(self.values)
         error_msg = ""
-        for i in range(count):
-            if abs(previous_values.values[i] - self.values[i]) > 0.0001:
-                error_msg += outputs[i].get_pretty_name() + " previously: " + f"{previous_values.values[i]:4.2f}" \
-                    + " currently: " + f"{self.values[i]:4.2f}" + " | "
+        differing_indices = np.flatnonzero(np.abs(previous_values.values - self.values) > 0.0001)
+        for i in differing_indices:
+            error_msg += outputs[i].get_pretty_name() + " previously: " + f"{previous_values.values[i]:4.2f}" \
+                + " currently: " + f"{self.values[i]:4.2f}" + " | "
         return error_msg
 
 
@@ -197,7 +203,7 @@ class Component:
             if connection.source_class_name != component_name:
                 raise ValueError("Trying to add connections to different components in one go.")
         self.default_connections[component_name] = connections
-        log.trace("added default connections for connections from : " + component_name + "\n" + str(self.default_connections))
+        log.trace("added default connections for connections from : %s\n%s", component_name, self.default_connections)
 
     def i_prepare_simulation(self) -> None:
         """ Gets called before the simulation to prepare the calculation. """
@@ -223,7 +229,7 @@ class Component:
         """ Adds an output definition. """
         if output_description is None:
             raise ValueError("Missing an output description for " + object_name + " - " + field_name)
-        log.debug("adding output: " + field_name + " to component " + object_name)
+        log.debug("adding output: %s to component %s", field_name, object_name)
         outp = ComponentOutput(object_name, field_name, load_type, unit, postprocessing_flag, sankey_flow_direction, output_description)
         self.outputs.append(outp)
         return outp
@@ -333,6 +339,14 @@ class Component:
         """ Performs the actual calculation. """
         raise NotImplementedError()
 
+    def i_get_exogenous_timeseries(self) -> Optional[Dict[ComponentOutput, np.ndarray]]:
+        """ Optional. Returns the series for all outputs and all timesteps, if they are already known after i_prepare_simulation.
+
+        Only components whose outputs do not depend on any input and whose i_simulate has no side effects may return
+        something here. The simulator then copies the series into the results in one go and never calls i_simulate.
+        """
+        return None
+
     def write_to_report(self) -> Any:
         """ Abstract function for writing the report entry for this component. """
         raise NotImplementedError("In " + self.component_name)
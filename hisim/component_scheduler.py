@@ -0,0 +1,146 @@
+""" Orders the components by their input/output dependencies for the simulator.
+
+The components and their connections form a directed graph. Components that depend on each other in a circle
+form a strongly connected component and need to be iterated until convergence, everything else only needs to be
+calculated once per time step, as long as it gets calculated after all the components it depends on.
+"""
+# clean
+import heapq
+from typing import Dict, List, Set
+
+from hisim import log
+from hisim.component_wrapper import ComponentWrapper
+
+
+class ComponentGroup:  # noqa: too-few-public-methods
+
+    """ A set of components that gets calculated together in a time step. """
+
+    def __init__(self, wrapped_components: List[ComponentWrapper], is_cyclic: bool) -> None:
+        """ Initializes the group. Cyclic groups need to be iterated until their outputs converge. """
+        self.wrapped_components: List[ComponentWrapper] = wrapped_components
+        self.is_cyclic: bool = is_cyclic
+
+    def get_component_names(self) -> List[str]:
+        """ Gets the names of all components in the group. """
+        return [wrapped_component.my_component.component_name for wrapped_component in self.wrapped_components]
+
+
+class ComponentScheduler:
+
+    """ Builds the dependency graph of the connected components and determines the calculation order. """
+
+    def __init__(self, wrapped_components: List[ComponentWrapper]) -> None:
+        """ Builds the graph. Needs to be called after all inputs were connected. """
+        self.wrapped_components: List[ComponentWrapper] = wrapped_components
+        self.dependencies: List[Set[int]] = self.get_dependencies()
+        self.component_groups: List[ComponentGroup] = self.get_ordered_component_groups()
+
+    def get_dependencies(self) -> List[Set[int]]:
+        """ Gets for every component the indices of the components whose outputs it uses as inputs. """
+        component_index_by_output_index: Dict[int, int] = {}
+        for component_index, wrapped_component in enumerate(self.wrapped_components):
+            for output in wrapped_component.component_outputs:
+                component_index_by_output_index[output.global_index] = component_index
+        dependencies: List[Set[int]] = []
+        for wrapped_component in self.wrapped_components:
+            sources: Set[int] = set()
+            for component_input in wrapped_component.my_component.inputs:
+                # outputs of components that are not scheduled, e.g. precomputed timeseries, are known beforehand
+                if component_input.source_output is not None and component_input.source_output.global_index in component_index_by_output_index:
+                    sources.add(component_index_by_output_index[component_input.source_output.global_index])
+            dependencies.append(sources)
+        return dependencies
+
+    def get_strongly_connected_components(self) -> List[List[int]]:
+        """ Finds the circles in the graph with Tarjan's algorithm, written iteratively to avoid deep recursion. """
+        number_of_components = len(self.wrapped_components)
+        index_counter = 0
+        indices: List[int] = [-1] * number_of_components
+        lowlinks: List[int] = [0] * number_of_components
+        on_stack: List[bool] = [False] * number_of_components
+        stack: List[int] = []
+        strongly_connected_components: List[List[int]] = []
+        for root in range(number_of_components):
+            if indices[root] != -1:
+                continue
+            work_stack = [(root, iter(sorted(self.dependencies[root])))]
+            indices[root] = lowlinks[root] = index_counter
+            index_counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work_stack:
+                node, neighbours = work_stack[-1]
+                descended = False
+                for neighbour in neighbours:
+                    if indices[neighbour] == -1:
+                        indices[neighbour] = lowlinks[neighbour] = index_counter
+                        index_counter += 1
+                        stack.append(neighbour)
+                        on_stack[neighbour] = True
+                        work_stack.append((neighbour, iter(sorted(self.dependencies[neighbour]))))
+                        descended = True
+                        break
+                    if on_stack[neighbour]:
+                        lowlinks[node] = min(lowlinks[node], indices[neighbour])
+                if descended:
+                    continue
+                work_stack.pop()
+                if work_stack:
+                    parent = work_stack[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+                if lowlinks[node] == indices[node]:
+                    members: List[int] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        members.append(member)
+                        if member == node:
+                            break
+                    strongly_connected_components.append(sorted(members))
+        return strongly_connected_components
+
+    def get_ordered_component_groups(self) -> List[ComponentGroup]:
+        """ Sorts the strongly connected components topologically.
+
+        Ties are broken by the order in which the components were added to the simulator,
+        so the order stays as close as possible to the one from the setup function.
+        """
+        strongly_connected_components = self.get_strongly_connected_components()
+        group_index_by_component: Dict[int, int] = {}
+        for group_index, members in enumerate(strongly_connected_components):
+            for member in members:
+                group_index_by_component[member] = group_index
+        predecessors: List[Set[int]] = [set() for _ in strongly_connected_components]
+        successors: List[Set[int]] = [set() for _ in strongly_connected_components]
+        for component_index, sources in enumerate(self.dependencies):
+            target_group = group_index_by_component[component_index]
+            for source in sources:
+                source_group = group_index_by_component[source]
+                if source_group != target_group:
+                    predecessors[target_group].add(source_group)
+                    successors[source_group].add(target_group)
+
+        open_predecessors = [len(entry) for entry in predecessors]
+        ready = [
+            (members[0], group_index)
+            for group_index, members in enumerate(strongly_connected_components)
+            if open_predecessors[group_index] == 0
+        ]
+        heapq.heapify(ready)
+        component_groups: List[ComponentGroup] = []
+        while ready:
+            _first_member, group_index = heapq.heappop(ready)
+            members = strongly_connected_components[group_index]
+            is_cyclic = len(members) > 1 or members[0] in self.dependencies[members[0]]
+            component_groups.append(
+                ComponentGroup([self.wrapped_components[member] for member in members], is_cyclic)
+            )
+            for successor in successors[group_index]:
+                open_predecessors[successor] -= 1
+                if open_predecessors[successor] == 0:
+                    heapq.heappush(ready, (strongly_connected_components[successor][0], successor))
+        for group in component_groups:
+            if group.is_cyclic:
+                log.information("Iterating the circularly connected components " + ", ".join(group.get_component_names()))
+        return component_groups
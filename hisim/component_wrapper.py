@@ -1,6 +1,8 @@
 """ Wraps components for use in the simulator. """
 # clean
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import numpy as np
 
 import hisim.component as cp
 import hisim.loadtypes as lt
@@ -39,7 +41,7 @@ class ComponentWrapper:
                 if output.full_name == col.full_name:
                     raise ValueError("trying to register the same key twice: " + col.full_name)
             all_outputs.append(col)
-            log.debug("Registered output " + col.full_name)
+            log.debug("Registered output %s", col.full_name)
             self.component_outputs.append(col)
 
     def register_component_inputs(self, global_column_dict: Dict[str, Any]) -> None:
@@ -78,6 +80,20 @@ class ComponentWrapper:
         """ Wrapper for the core simulation function in each component. """
         self.my_component.i_simulate(timestep, stsv, force_convergence)
 
+    def get_exogenous_timeseries(self, number_of_timesteps: int) -> Optional[Dict[cp.ComponentOutput, np.ndarray]]:
+        """ Wrapper for i_get_exogenous_timeseries, checks that every output has a complete series. """
+        exogenous_timeseries = self.my_component.i_get_exogenous_timeseries()
+        if exogenous_timeseries is None:
+            return None
+        for output in self.component_outputs:
+            if output not in exogenous_timeseries:
+                raise ValueError("The exogenous timeseries of " + self.my_component.component_name + " are missing the output " + output.full_name)
+            if len(exogenous_timeseries[output]) != number_of_timesteps:
+                raise ValueError("The exogenous timeseries for " + output.full_name + " has " + str(len(exogenous_timeseries[output]))
+                                 + " values, but the simulation has " + str(number_of_timesteps) + " timesteps.")
+        log.information("Using the precomputed timeseries of " + self.my_component.component_name + " instead of simulating it.")
+        return exogenous_timeseries
+
     def prepare_calculation(self):
         """ Wrapper for i_prepare_calculation. """
         log.information("Preparing " + self.my_component.component_name + " for simulation.")
@@ -111,7 +127,7 @@ class ComponentWrapper:
                                 f"might not have compatible units.")  #
                             # Connect, i.e, save ComponentOutput in ComponentInput
                             cinput.source_output = global_output
-                            log.debug("Connected input '" + cinput.fullname + "' to '" + global_output.full_name + "'")
+                            log.debug("Connected input '%s' to '%s'", cinput.fullname, global_output.full_name)
                         else:
                             raise SystemError(
                                 f"The input {cinput.field_name} (cp: {cinput.component_name}, unit: {cinput.unit}) and "
@@ -120,7 +136,7 @@ class ComponentWrapper:
                     else:
                         # Connect, i.e, save ComponentOutput in ComponentInput
                         cinput.source_output = global_output
-                        log.debug(f"connected input {cinput.fullname} to {global_output.full_name}")
+                        log.debug("connected input %s to %s", cinput.fullname, global_output.full_name)
 
             # Check if there are inputs that have been not connected
             if cinput.is_mandatory and cinput.source_output is None:
@@ -4,6 +4,8 @@ See library on https://github.com/FZJ-IEK3-VSA/hplib/tree/main/hplib
 """
 
 # clean
+import math
+from functools import lru_cache
 from typing import Any, List, Optional, Tuple
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
@@ -70,6 +72,8 @@ class HeatPumpHplibConfig(ConfigBase):
     maintenance_cost_as_percentage_of_investment: float
     #: consumption of the heatpump in kWh
     consumption: float
+    #: relative tolerance of the fast hplib evaluation against hpl.simulate, checked before the simulation (None skips the check)
+    hplib_tolerance: Optional[float] = 1e-9
 
     @classmethod
     def get_default_generic_advanced_hp_lib(cls) -> "HeatPumpHplibConfig":
@@ -130,6 +134,184 @@ class HeatPumpHplibConfig(ConfigBase):
         )
 
 
+# p_th, p_el, cop, eer, t_out, m_dot
+HplibResults = Tuple[float, float, float, float, float, float]
+
+
+class HplibEvaluator:
+
+    """Fast evaluation of the hplib model for single temperatures.
+
+    hpl.simulate builds a DataFrame on every call. The evaluator reads the parameters once and calculates the
+    scalar path of hpl.simulate with the same formulas in the same order, so the results are the same.
+    Inputs that were seen before are answered from a memo.
+    """
+
+    # number of input combinations that are kept in the memo
+    MemoSize = 4096
+    # inlet temperature is supposed to be heated up or cooled down by 5 K
+    DeltaT = 5
+    # J/(kg*K), specific heat capacity of water as used by hplib
+    SpecificHeatCapacity = 4200
+
+    def __init__(self, parameters: pd.DataFrame) -> None:
+        """Reads the parameters from hpl.get_parameters."""
+        self.parameters = parameters
+        self.group_id = parameters["Group"].array[0]
+        self.p1_p_el_h = parameters["p1_P_el_h [1/°C]"].array[0]
+        self.p2_p_el_h = parameters["p2_P_el_h [1/°C]"].array[0]
+        self.p3_p_el_h = parameters["p3_P_el_h [-]"].array[0]
+        self.p4_p_el_h = parameters["p4_P_el_h [1/°C]"].array[0]
+        self.p1_cop = parameters["p1_COP [-]"].array[0]
+        self.p2_cop = parameters["p2_COP [-]"].array[0]
+        self.p3_cop = parameters["p3_COP [-]"].array[0]
+        self.p4_cop = parameters["p4_COP [-]"].array[0]
+        self.p_el_ref = parameters["P_el_h_ref [W]"].array[0]
+        self.p_th_ref = parameters["P_th_h_ref [W]"].array[0]
+        # the cooling parameters only exist for some models
+        cooling_columns = [
+            "p1_EER [-]",
+            "p2_EER [-]",
+            "p3_EER [-]",
+            "p4_EER [-]",
+            "p1_P_el_c [1/°C]",
+            "p2_P_el_c [1/°C]",
+            "p3_P_el_c [-]",
+            "p4_P_el_c [1/°C]",
+            "P_el_c_ref [W]",
+        ]
+        if all(column in parameters.columns for column in cooling_columns):
+            cooling_parameters = [parameters[column].array[0] for column in cooling_columns]
+        else:
+            cooling_parameters = [math.nan] * len(cooling_columns)
+        (
+            self.p1_eer,
+            self.p2_eer,
+            self.p3_eer,
+            self.p4_eer,
+            self.p1_p_el_c,
+            self.p2_p_el_c,
+            self.p3_p_el_c,
+            self.p4_p_el_c,
+            self.p_el_col_ref,
+        ) = cooling_parameters
+        self.memoized_calculate = lru_cache(maxsize=self.MemoSize)(self.calculate)
+
+    def simulate(self, t_in_primary: float, t_in_secondary: float, t_amb: float, mode: int) -> HplibResults:
+        """Returns p_th, p_el, cop, eer, t_out and m_dot like hpl.simulate, for mode 1 (heating) or 2 (cooling)."""
+        return self.memoized_calculate(t_in_primary, t_in_secondary, t_amb, mode)
+
+    def calculate(self, t_in_primary: float, t_in_secondary: float, t_amb: float, mode: int) -> HplibResults:
+        """Calculates the outputs like hpl.simulate with p_th_min = 0."""
+        group_id = self.group_id
+        p_th_min = 0
+        if mode == 2 and group_id > 1:
+            raise ValueError("Cooling is only possible with heat pumps of group id = 1.")
+        if mode == 1:
+            t_out = t_in_secondary + self.DeltaT
+            eer: float = 0
+        elif mode == 2:
+            t_out = t_in_secondary - self.DeltaT
+            cop: float = 0
+        else:
+            raise ValueError("Unknown mode for hplib: " + str(mode))
+
+        t_in = t_in_primary
+        # for subtype = air/water heat pump
+        if group_id in (1, 4):
+            t_amb = t_in
+        # for regulated heat pumps
+        if group_id in (1, 2, 3):
+            if mode == 1:
+                cop = self.p1_cop * t_in + self.p2_cop * t_out + self.p3_cop + self.p4_cop * t_amb
+                p_el = self.p_el_ref * (
+                    self.p1_p_el_h * t_in + self.p2_p_el_h * t_out + self.p3_p_el_h + self.p4_p_el_h * t_amb
+                )
+                if group_id == 1:
+                    t_in = -7
+                    t_amb = t_in
+                elif group_id == 2:
+                    t_amb = -7
+                p_el_25 = (
+                    0.25
+                    * self.p_el_ref
+                    * (self.p1_p_el_h * t_in + self.p2_p_el_h * t_out + self.p3_p_el_h + self.p4_p_el_h * t_amb)
+                )
+                if p_el < p_el_25:
+                    p_el = p_el_25
+                p_th = p_el * cop
+                if cop <= 1:
+                    cop = 1
+                    p_el = self.p_th_ref
+                    p_th = self.p_th_ref
+                elif p_th < p_th_min:
+                    if self.p_el_ref > p_th_min / cop:
+                        p_el = p_th_min / cop
+                        p_th = p_th_min
+                    else:
+                        p_el = self.p_el_ref + self.p_th_ref
+                        p_th = self.p_el_ref * cop + self.p_th_ref
+                        cop = p_th / p_el
+            else:
+                eer = self.p1_eer * t_in + self.p2_eer * t_out + self.p3_eer + self.p4_eer * t_amb
+                if t_in < 25:
+                    t_in = 25
+                t_amb = t_in
+                p_el = (
+                    self.p1_p_el_c * t_in + self.p2_p_el_c * t_out + self.p3_p_el_c + self.p4_p_el_c * t_amb
+                ) * self.p_el_col_ref
+                if p_el < 0:
+                    eer = 0
+                    p_el = 0
+                p_th = -(eer * p_el)
+                if eer < 1:
+                    eer = 0
+                    p_el = 0
+                    p_th = 0
+        # for subtype = On-Off
+        elif group_id in (4, 5, 6):
+            p_el = (
+                self.p1_p_el_h * t_in + self.p2_p_el_h * t_out + self.p3_p_el_h + self.p4_p_el_h * t_amb
+            ) * self.p_el_ref
+            cop = self.p1_cop * t_in + self.p2_cop * t_out + self.p3_cop + self.p4_cop * t_amb
+            p_th = p_el * cop
+            if cop <= 1:
+                cop = 1
+                p_el = self.p_th_ref
+                p_th = self.p_th_ref
+            elif p_th < p_th_min:
+                p_th = p_th + self.p_th_ref
+                p_el = p_el + self.p_th_ref
+                cop = p_th / p_el
+        else:
+            raise ValueError("Unknown group id for hplib: " + str(group_id))
+
+        m_dot = abs(p_th / (self.DeltaT * self.SpecificHeatCapacity))
+        return p_th, p_el, cop, eer, t_out, m_dot
+
+    def check_against_hplib(self, tolerance: float) -> None:
+        """Compares the evaluator with hpl.simulate on a grid of temperatures and raises an error above the tolerance."""
+        modes = [1, 2] if self.group_id == 1 else [1]
+        for mode in modes:
+            for t_in_primary in [-20.0, -7.0, 0.0, 7.0, 15.0, 30.0, 40.0]:
+                for t_in_secondary in [10.0, 25.0, 35.0, 45.0, 55.0]:
+                    reference = hpl.simulate(t_in_primary, t_in_secondary, self.parameters, t_in_primary, mode=mode)
+                    reference_results = [
+                        reference[column].values[0] for column in ["P_th", "P_el", "COP", "EER", "T_out", "m_dot"]
+                    ]
+                    results = self.calculate(t_in_primary, t_in_secondary, t_in_primary, mode)
+                    for value, reference_value in zip(results, reference_results):
+                        if math.isnan(value) and math.isnan(reference_value):
+                            continue
+                        if not math.isclose(value, reference_value, rel_tol=tolerance, abs_tol=tolerance):
+                            raise ValueError(
+                                "The fast hplib evaluation differs from hpl.simulate: "
+                                + str(results)
+                                + " instead of "
+                                + str(reference_results)
+                            )
+
+
 class HeatPumpHplib(Component):
 
     """Simulate the heat pump.
@@ -197,6 +379,8 @@ class HeatPumpHplib(Component):
 
         self.minimum_idle_time_in_seconds = config.minimum_idle_time_in_seconds
 
+        self.hplib_tolerance = config.hplib_tolerance
+
         postprocessing_flag = [InandOutputType.ELECTRICITY_CONSUMPTION_UNCONTROLLED]
 
         # Component has states
@@ -209,6 +393,7 @@ class HeatPumpHplib(Component):
         self.parameters = hpl.get_parameters(
             self.model, self.group_id, self.t_in, self.t_out_val, self.p_th_set
         )
+        self.hplib_evaluator = HplibEvaluator(self.parameters)
 
         # Define component inputs
         self.on_off_switch: ComponentInput = self.add_input(
@@ -391,7 +576,8 @@ class HeatPumpHplib(Component):
 
     def i_prepare_simulation(self) -> None:
         """Prepare simulation."""
-        pass
+        if self.hplib_tolerance is not None:
+            self.hplib_evaluator.check_against_hplib(self.hplib_tolerance)
 
     def i_simulate(
         self, timestep: int, stsv: SingleTimeStepValues, force_convergence: bool
@@ -436,15 +622,9 @@ class HeatPumpHplib(Component):
         # OnOffSwitch
         if on_off == 1:
             # Calulate outputs for heating mode
-            results = hpl.simulate(
-                t_in_primary, t_in_secondary, self.parameters, t_amb, mode=1
+            p_th, p_el, cop, eer, t_out, m_dot = self.hplib_evaluator.simulate(
+                t_in_primary, t_in_secondary, t_amb, mode=1
             )
-            p_th = results["P_th"].values[0]
-            p_el = results["P_el"].values[0]
-            cop = results["COP"].values[0]
-            eer = results["EER"].values[0]
-            t_out = results["T_out"].values[0]
-            m_dot = results["m_dot"].values[0]
             time_on_heating = (
                 time_on_heating + self.my_simulation_parameters.seconds_per_timestep
             )
@@ -453,15 +633,9 @@ class HeatPumpHplib(Component):
 
         elif on_off == -1:
             # Calulate outputs for cooling mode
-            results = hpl.simulate(
-                t_in_primary, t_in_secondary, self.parameters, t_amb, mode=2
+            p_th, p_el, cop, eer, t_out, m_dot = self.hplib_evaluator.simulate(
+                t_in_primary, t_in_secondary, t_amb, mode=2
             )
-            p_th = results["P_th"].values[0]
-            p_el = results["P_el"].values[0]
-            cop = results["COP"].values[0]
-            eer = results["EER"].values[0]
-            t_out = results["T_out"].values[0]
-            m_dot = results["m_dot"].values[0]
             time_on_cooling = (
                 time_on_cooling + self.my_simulation_parameters.seconds_per_timestep
             )
@@ -1,9 +1,10 @@
 # pylint: skip-file
-from copy import deepcopy
 from math import pi
 from typing import List, Any
 import math
 
+import numpy as np
+
 # Owned
 from hisim.component import (
     Component,
@@ -113,11 +114,18 @@ class WaterSlice:
         :param other_slice: the slice which should be mixed with the 'self' slice
         :return: no return (changes in self.__) --> Parameters of newly mixed slice are set
         """
-        self.temperature = (
-            self.mass * self.temperature + other_slice.mass * other_slice.temperature
-        ) / (self.mass + other_slice.mass)
-        self.height += other_slice.height
-        self.mass += other_slice.mass
+        self.add_water(other_slice.height, other_slice.mass, other_slice.temperature)
+
+    def add_water(self, height: float, mass: float, temperature: float) -> None:
+        """
+        Mixes water with the given values into the slice, see add_another_slice
+        -> used for the slices of the storage, which are no WaterSlice objects
+        """
+        self.temperature = (self.mass * self.temperature + mass * temperature) / (
+            self.mass + mass
+        )
+        self.height += height
+        self.mass += mass
         # The new enthalpy is based in the new parameters
         # ToDo: Idea: self.enthalpy = self.enthalpy + other_slice.enthalpy -> should work
         self.enthalpy = self.mass * self.specific_heat_capacity * self.temperature
@@ -207,9 +215,18 @@ class WarmWaterStorageSimulation:
     """
     The most important function is simulate_one_timestep. It calls all other functions needed.
 
-    The storage is defined by its diameter, height and temperature. Inside there are water slices represented by my_slices
+    The storage is defined by its diameter, height and temperature. The water slices inside are kept in the columns
+    start to end of the array slice_values, from top to bottom, with one row each for height, mass, temperature and
+    enthalpy. Slices only get added or removed at the top and the bottom of the tank, which just moves start or end.
+    Free columns on both sides make room for that; the array only gets reallocated if they are used up.
     """
 
+    Height = 0
+    Mass = 1
+    Temperature = 2
+    Enthalpy = 3
+    InitialCapacity = 64
+
     def __init__(self, config: WarmWaterStorageConfig) -> None:
         # Initialises a starting tank and adds one slice with the tanks height and the starting temperature
         self.diameter = config.tank_diameter
@@ -220,8 +237,13 @@ class WarmWaterStorageSimulation:
 
         self.area = (pi / 4) * (self.diameter**2)
         self.volume = self.area * self.height_storage  # [m^3]
-        self.my_slices = []
-        self.my_slices.append(
+        self.specific_heat_capacity = (
+            PhysicsConfig.water_specific_heat_capacity_in_joule_per_kilogram_per_kelvin
+        )
+        self.slice_values = np.zeros((4, self.InitialCapacity))
+        self.start = self.InitialCapacity // 2
+        self.end = self.start
+        self.append_slice_at_bottom(
             WaterSlice(self.diameter, self.height_storage, self.start_temperature)
         )
 
@@ -241,36 +263,102 @@ class WarmWaterStorageSimulation:
         if self.start_temperature >= 100:
             raise ValueError  # -> Boiling Water
 
-    def begin_new_timestep_alternative(self) -> None:
-        """try to write an alternative to deepcopy"""
-        slices_to_save = len(self.my_slices)
-        save_slices_step = []
-        for i in range(slices_to_save):
-            save_slices_step.append(
-                WaterSlice.init_from_another_slice(self.my_slices[i])
-            )
-            # Todo: auf restore anwenden
+    @property
+    def number_of_slices(self) -> int:
+        """Amount of slices in the tank."""
+        return self.end - self.start
 
-    def reset_to_last_timestep_alternative(self, save_values_step_1: Any) -> None:
-        """try to write an alternative to deepcopy"""
-        amount_of_saved_slices = len(save_values_step_1)
-        for i in range(amount_of_saved_slices):
-            self.my_slices[i] = save_values_step_1[i]
+    def get_slices(self) -> np.ndarray:
+        """View on the values of the slices in the tank, from top to bottom."""
+        return self.slice_values[:, self.start : self.end]
+
+    def make_room(self) -> None:
+        """
+        Doubles the capacity of slice_values and puts the slices into the middle again.
+        Only needed if the free columns on one side are used up.
+        """
+        number_of_slices = self.number_of_slices
+        capacity = 2 * self.slice_values.shape[1]
+        slice_values = np.zeros((4, capacity))
+        start = (capacity - number_of_slices) // 2
+        slice_values[:, start : start + number_of_slices] = self.get_slices()
+        self.slice_values = slice_values
+        self.start = start
+        self.end = start + number_of_slices
+
+    def insert_slice_at_top(self, ws: WaterSlice) -> None:
+        if self.start == 0:
+            self.make_room()
+        self.start -= 1
+        self.set_slice(self.start, ws.height, ws.mass, ws.temperature, ws.enthalpy)
+
+    def append_slice_at_bottom(self, ws: WaterSlice) -> None:
+        if self.end == self.slice_values.shape[1]:
+            self.make_room()
+        self.end += 1
+        self.set_slice(self.end - 1, ws.height, ws.mass, ws.temperature, ws.enthalpy)
+
+    def set_slice(
+        self, column: int, height: float, mass: float, temperature: float, enthalpy: float
+    ) -> None:
+        self.slice_values[self.Height, column] = height
+        self.slice_values[self.Mass, column] = mass
+        self.slice_values[self.Temperature, column] = temperature
+        self.slice_values[self.Enthalpy, column] = enthalpy
+
+    def mix_into_slice(self, column: int, other_column: int) -> None:
+        """
+        Mixes the slice in other_column into the slice in column, calculated like WaterSlice.add_another_slice.
+        -> removing the other slice must be done manually
+        """
+        values = self.slice_values
+        mass = values[self.Mass, column]
+        other_mass = values[self.Mass, other_column]
+        values[self.Temperature, column] = (
+            mass * values[self.Temperature, column]
+            + other_mass * values[self.Temperature, other_column]
+        ) / (mass + other_mass)
+        values[self.Height, column] += values[self.Height, other_column]
+        values[self.Mass, column] = mass + other_mass
+        values[self.Enthalpy, column] = (
+            values[self.Mass, column]
+            * self.specific_heat_capacity
+            * values[self.Temperature, column]
+        )
+
+    def mix_water_slice_into_slice(self, column: int, ws: WaterSlice) -> None:
+        """Mixes a new water slice into the slice in column, calculated like WaterSlice.add_another_slice."""
+        values = self.slice_values
+        mass = values[self.Mass, column]
+        values[self.Temperature, column] = (
+            mass * values[self.Temperature, column] + ws.mass * ws.temperature
+        ) / (mass + ws.mass)
+        values[self.Height, column] += ws.height
+        values[self.Mass, column] = mass + ws.mass
+        values[self.Enthalpy, column] = (
+            values[self.Mass, column]
+            * self.specific_heat_capacity
+            * values[self.Temperature, column]
+        )
 
     def begin_new_timestep(self) -> Any:
         """
-        Deep copy of my_slices
+        Copy of the slice values
         -> relevant for framework. This allows to reset to the previous state
         """
-        save_values_step_1 = deepcopy(self.my_slices)
+        save_values_step_1 = (self.start, self.get_slices().copy())
         return save_values_step_1
 
     def reset_to_last_timestep(self, save_values_step_1: Any) -> Any:
         """
         Get back the step before
         Use together with def begin_new_timestep
+        The capacity of slice_values never shrinks, so the saved columns are always available
         """
-        self.my_slices = deepcopy(save_values_step_1)
+        start, saved_slice_values = save_values_step_1
+        self.start = start
+        self.end = start + saved_slice_values.shape[1]
+        self.slice_values[:, self.start : self.end] = saved_slice_values
         return
 
     def create_water_slice(
@@ -308,7 +396,7 @@ class WarmWaterStorageSimulation:
         Checking the temperature gradient (--> T_top < T_bottom)
         Slice will be mixed with the next one until the temperature gradient is correct
         - Its enough to only check the first and second slide. The temperature gradient of the other layers should be intact due to the previous steps.
-        - this is not relevant if there is only one slice -> len() > 1
+        - this is not relevant if there is only one slice -> number_of_slices > 1
         - after mixing slice a) [1] or b) [-1] will be removed
 
         :param ws:          water slice which should be inserted
@@ -316,40 +404,43 @@ class WarmWaterStorageSimulation:
         :return:            not return, changes are made with self.___
         """
         temperature_difference = WarmWaterStorageConfig.temperature_difference
+        temperatures = self.slice_values[self.Temperature]
         if ws.height == 0:
             # no empty slices will be inserted into the tank
             pass
         else:
             if is_from_top:
-                outer_slice = self.my_slices[0]
-                if ws.temperature >= (outer_slice.temperature + temperature_difference):
-                    self.my_slices.insert(0, ws)
+                if ws.temperature >= (
+                    temperatures[self.start] + temperature_difference
+                ):
+                    self.insert_slice_at_top(ws)
                 else:
-                    outer_slice.add_another_slice(ws)
+                    self.mix_water_slice_into_slice(self.start, ws)
                     # Check temperature profile
                     # Only the first two slices are compared. The temperature profile of the rest should be ok due to the previous timestep
                     # The while loop will check the two upper slices until the temperature profile is correct. This can tanke more loops because the secound slice is always replaced by the third after it is combined with the  first
                     while (
-                        len(self.my_slices) > 1
-                        and outer_slice.temperature < self.my_slices[1].temperature
+                        self.number_of_slices > 1
+                        and temperatures[self.start] < temperatures[self.start + 1]
                     ):
-                        outer_slice.add_another_slice(self.my_slices[1])
-                        self.my_slices.remove(self.my_slices[1])
+                        self.mix_into_slice(self.start + 1, self.start)
+                        # the mixed slice moves down one column, which removes the top column
+                        self.start += 1
 
             elif not is_from_top:
-                outer_slice = self.my_slices[-1]
-                if ws.temperature <= (outer_slice.temperature - temperature_difference):
-                    self.my_slices.append(ws)
+                if ws.temperature <= (
+                    temperatures[self.end - 1] - temperature_difference
+                ):
+                    self.append_slice_at_bottom(ws)
                 else:
-                    outer_slice.add_another_slice(ws)
+                    self.mix_water_slice_into_slice(self.end - 1, ws)
                     # connect the bottom slices till the temperature profile is correct
                     while (
-                        len(self.my_slices) > 1
-                        and self.my_slices[-1].temperature
-                        > self.my_slices[-2].temperature
+                        self.number_of_slices > 1
+                        and temperatures[self.end - 1] > temperatures[self.end - 2]
                     ):
-                        self.my_slices[-2].add_another_slice(self.my_slices[-1])
-                        self.my_slices.remove(self.my_slices[-1])
+                        self.mix_into_slice(self.end - 2, self.end - 1)
+                        self.end -= 1
 
     # def push_slices(self, ws_height, is_from_top: bool):
     def push_slices(self, ws_height: Any, is_from_top: bool) -> Any:
@@ -364,7 +455,7 @@ class WarmWaterStorageSimulation:
         Its also possible to collect only a part of a slice. The rest will stay in the tank a the outer layer.
 
         Caution:
-        slice_to_push =     the previously existing slice in the tank
+        slice_to_push =     the column of the previously existing slice in the tank
         pushed_out_slice =  the new created slice which will leave the tank
 
         :param ws_height:   Height of the incoming and already inserted water slice. The same slice height has to be pushed out
@@ -372,67 +463,74 @@ class WarmWaterStorageSimulation:
         :return:            The slice which is pushed out in this timestep on the opposite side of bool: is_from_top
         """
         # maybe redundant lines?
-        while self.my_slices[0].height == 0:
-            self.my_slices.remove(self.my_slices[0])
+        if self.slice_values[self.Height, self.start] == 0:
+            self.start += 1
             raise ValueError
-        while self.my_slices[-1].height == 0:
-            self.my_slices.remove(self.my_slices[-1])
+        if self.slice_values[self.Height, self.end - 1] == 0:
+            self.end -= 1
             raise ValueError
 
         pushed_out_slice = WaterSlice(self.diameter, 0, 0)
         if ws_height > 0:
             collected_height_so_far: float = 0
             while collected_height_so_far < ws_height:
+                if self.number_of_slices == 0:
+                    raise ValueError("The tank is empty.")
+                values = self.slice_values
                 height_still_needed = ws_height - collected_height_so_far
                 if is_from_top:
-                    slice_to_push = self.my_slices[
-                        -1
-                    ]  # The slice which will added to the pushed_out_slice next
+                    # The slice which will added to the pushed_out_slice next
+                    slice_to_push = self.end - 1
                 else:  # is_fom_top == False
-                    slice_to_push = self.my_slices[0]
-                if (
-                    slice_to_push.height <= height_still_needed
-                ):  # the whole slice will be pushed
-                    self.my_slices.remove(slice_to_push)  # removing whole slice
-                    pushed_out_slice.add_another_slice(
-                        slice_to_push
-                    )  # add the whole slice to pushed_out_slice
-                    collected_height_so_far += slice_to_push.height
+                    slice_to_push = self.start
+                slice_height = values[self.Height, slice_to_push]
+                if slice_height <= height_still_needed:  # the whole slice will be pushed
+                    # removing whole slice
+                    if is_from_top:
+                        self.end -= 1
+                    else:
+                        self.start += 1
+                    # add the whole slice to pushed_out_slice
+                    pushed_out_slice.add_water(
+                        slice_height,
+                        values[self.Mass, slice_to_push],
+                        values[self.Temperature, slice_to_push],
+                    )
+                    collected_height_so_far += slice_height
                 else:  # Only a part of the outermost layer has to be removed. This part will be added to pushed_out_slice and removed from the remaining slice
+                    slice_temperature = values[self.Temperature, slice_to_push]
                     pushed_out_slice.add_another_slice(
                         WaterSlice(
                             self.diameter,
                             height_still_needed,
-                            slice_to_push.temperature,
+                            slice_temperature,
                         )
                     )
                     # Height, mass & enthalpy have to be changed in the remaining slice
-                    slice_to_push.height -= height_still_needed
-                    slice_to_push.mass -= (
+                    values[self.Height, slice_to_push] -= height_still_needed
+                    values[self.Mass, slice_to_push] -= (
                         height_still_needed * self.area * pushed_out_slice.density
                     )
-                    slice_to_push.enthalpy -= (
+                    values[self.Enthalpy, slice_to_push] -= (
                         (height_still_needed * self.area * pushed_out_slice.density)
-                        * slice_to_push.specific_heat_capacity
-                        * slice_to_push.temperature
+                        * self.specific_heat_capacity
+                        * slice_temperature
                     )
                     collected_height_so_far += (
                         height_still_needed  # -> this should be zero
                     )
-                    if collected_height_so_far != ws_height:
-                        a = collected_height_so_far
-                        b = ws_height
 
                     # The remaining slice (slice_to_push) must have a minimum size
                     if (
-                        slice_to_push.height
+                        values[self.Height, slice_to_push]
                         < WarmWaterStorageConfig.slice_height_minimum
                     ):
-                        self.my_slices.remove(slice_to_push)
                         if is_from_top:
-                            self.my_slices[-1].add_another_slice(slice_to_push)
+                            self.end -= 1
+                            self.mix_into_slice(self.end - 1, slice_to_push)
                         else:
-                            self.my_slices[0].add_another_slice(slice_to_push)
+                            self.start += 1
+                            self.mix_into_slice(self.start, slice_to_push)
         return pushed_out_slice
 
     def check_slice_temperature_order(self) -> None:
@@ -442,23 +540,25 @@ class WarmWaterStorageSimulation:
         The temperature profile of the two highest and the two lowest slices are checked.
         The slices in between are not influenced by this effect.
         """
+        temperatures = self.slice_values[self.Temperature]
 
         # check from top
-        if len(self.my_slices) >= 2:
-            while self.my_slices[0].temperature <= self.my_slices[1].temperature:
-                self.my_slices[0].add_another_slice(self.my_slices[1])
-                self.my_slices.remove(self.my_slices[1])
+        if self.number_of_slices >= 2:
+            while temperatures[self.start] <= temperatures[self.start + 1]:
+                self.mix_into_slice(self.start + 1, self.start)
+                # the mixed slice moves down one column, which removes the top column
+                self.start += 1
                 # no more mixing if there is only one slice left
-                if len(self.my_slices) == 1:
+                if self.number_of_slices == 1:
                     break
 
         # check from bottom
-        if len(self.my_slices) >= 2:
-            while self.my_slices[-1].temperature >= self.my_slices[-2].temperature:
-                self.my_slices[-2].add_another_slice(self.my_slices[-1])
-                self.my_slices.remove(self.my_slices[-1])
+        if self.number_of_slices >= 2:
+            while temperatures[self.end - 1] >= temperatures[self.end - 2]:
+                self.mix_into_slice(self.end - 2, self.end - 1)
+                self.end -= 1
                 # no more mixing if there is only one slice left
-                if len(self.my_slices) == 1:
+                if self.number_of_slices == 1:
                     break
 
     def simulate_one_timestep(
@@ -501,8 +601,8 @@ class WarmWaterStorageSimulation:
             slice_temperature_input_bottom, slice_mass_input_bottom
         )
 
-        ws_upper_height = deepcopy(ws_upper.height)
-        ws_bottom_height = deepcopy(ws_bottom.height)
+        ws_upper_height = ws_upper.height
+        ws_bottom_height = ws_bottom.height
 
         if ws_upper.height != slice_mass_input_upper * 4 / (
             pi * (self.diameter**2) * PhysicsConfig.water_density
@@ -552,7 +652,7 @@ class WarmWaterStorageSimulation:
             raise ValueError
 
         # heat losses to environment and energy exchange between the segments
-        if len(self.my_slices) > 1:
+        if self.number_of_slices > 1:
             self.energy_exchange_between_slices(
                 lambda_water_water=0.6, seconds_per_timestep=seconds_per_timestep
             )
@@ -569,26 +669,23 @@ class WarmWaterStorageSimulation:
     ) -> Any:
         """
         Get the temperature at a specific height in the tank. Height is measured from top to bottom.
-        The height of the slices in the tank will be added to collected_height if larger than height_of_interest.
-        The slice counter must be lower than the slices in the tank.
-        The slice counter tells how many slices have been skipped to get to the right height in the tank.
-        To set temperature_of_interest correctly the slice counter has to be reduced by one before the temperature is assigned.
-        Except the height_of_interest is zero. Then the top slice [0] is taken.
+        The heights of the slices are summed up from the top until the collected height reaches height_of_interest.
+        The temperature of the slice where this happens is returned, or of the bottom slice if the tank is lower.
+        Except the height_of_interest is zero. Then the top slice is taken.
 
         :param height_of_interest:          The height of the slice whose temperature is to be returned
         :return: temperature_of_interest    Temperature of interest [°C]
         """
-        collected_height: float = 0
-        slice_counter: int = 0
-        slices_in_tank = len(self.my_slices)
-        while slice_counter < slices_in_tank and height_of_interest > collected_height:
-            collected_height += self.my_slices[slice_counter].height
-            slice_counter += 1
+        slices = self.get_slices()
         if height_of_interest == 0:
-            temperature_of_interest = self.my_slices[0].temperature
-        else:
-            # numbers of my_slice start at 0, so 1 has to be subtracted
-            temperature_of_interest = self.my_slices[slice_counter - 1].temperature
+            return slices[self.Temperature, 0]
+        collected_heights = slices[self.Height].cumsum()
+        slice_number = int(
+            np.searchsorted(collected_heights, height_of_interest, side="left")
+        )
+        temperature_of_interest = slices[
+            self.Temperature, min(slice_number, self.number_of_slices - 1)
+        ]
 
         return temperature_of_interest
 
@@ -599,15 +696,12 @@ class WarmWaterStorageSimulation:
         :param minimum_temperature: Only slices with this temperature or above this temperature-level can be used properly
         :return: usable_percentage_of_tank: % which are above minimum temperature
         """
+        slices = self.get_slices()
+        too_cold = np.flatnonzero(slices[self.Temperature] < minimum_temperature)
+        usable_slices = too_cold[0] if too_cold.size > 0 else self.number_of_slices
         usable_height: float = 0
-        slice_counter = 0
-        slices_in_tank = len(self.my_slices)
-        while (
-            slice_counter < slices_in_tank
-            and self.my_slices[slice_counter].temperature >= minimum_temperature
-        ):
-            usable_height += self.my_slices[slice_counter].height
-            slice_counter += 1
+        if usable_slices > 0:
+            usable_height = slices[self.Height, :usable_slices].cumsum()[-1]
         usable_percentage_of_tank = usable_height / self.height_storage * 100
 
         return usable_percentage_of_tank, usable_height
@@ -619,9 +713,8 @@ class WarmWaterStorageSimulation:
         Calculation from Ws to kWh; 3600s = 1h, 1000W = 1kW
         :return enthalpy_tank   Enthalpy of the tank [kWh]
         """
-        enthalpy_tank: float = 0
-        for i in range(len(self.my_slices)):
-            enthalpy_tank += self.my_slices[i].enthalpy
+        # cumsum adds up slice by slice, np.sum would round differently
+        enthalpy_tank = self.get_slices()[self.Enthalpy].cumsum()[-1]
 
         enthalpy_tank = enthalpy_tank / 3600 / 1000
         return enthalpy_tank
@@ -634,19 +727,41 @@ class WarmWaterStorageSimulation:
         temperature(i) * mass(i) / total_mass
         :return average_temperature     Average tank temperature [°C]
         """
-        total_energy: float = 0
+        slices = self.get_slices()
         average_density = PhysicsConfig.water_density
-        for i in range(len(self.my_slices)):
-            total_energy += self.my_slices[i].mass * self.my_slices[i].temperature
+        total_energy = (slices[self.Mass] * slices[self.Temperature]).cumsum()[-1]
         average_temperature: float = total_energy / (self.volume * average_density)
         return average_temperature
 
     def calculate_tanks_mass(self) -> Any:
-        total_mass: float = 0
-        for i in range(len(self.my_slices)):
-            total_mass += self.my_slices[i].mass
+        total_mass = self.get_slices()[self.Mass].cumsum()[-1]
         return total_mass
 
+    def energy_losses_top_or_bottom(
+        self,
+        column: int,
+        u_value_tank: float,
+        seconds_per_timestep: float = 1,
+        ambient_temperature: float = 20,
+    ) -> float:
+        """
+        Heat losses through top OR bottom of the tank, like WaterSlice.heat_losses_vertical_top_or_bottom
+        Temperature and enthalpy of the slice in column will be changed
+        :return: Vertical energy losses through top or bottom in this timestep [W]
+        """
+        values = self.slice_values
+        energy_losses: float = (
+            u_value_tank
+            * self.area
+            * (values[self.Temperature, column] - ambient_temperature)
+            * seconds_per_timestep
+        )
+        values[self.Enthalpy, column] -= energy_losses
+        values[self.Temperature, column] = values[self.Enthalpy, column] / (
+            values[self.Mass, column] * self.specific_heat_capacity
+        )
+        return energy_losses
+
     def energy_losses_in_one_timestep(
         self,
         u_value_tank: Any,
@@ -655,23 +770,33 @@ class WarmWaterStorageSimulation:
     ) -> Any:
         """
         Energy losses for all the slices in the tank
-        The called function 'heat_losses_to_ambient' & 'heat_losses_top_bottom' sets a new enthalpy and temperature for slices
+        The losses through top and bottom and the horizontal losses of all slices set a new enthalpy and temperature for slices
         :return losses_this_timestep [Ws]    Sum of all heat losses to the ambient in this timestep
         """
-        losses_this_timestep = 0.0
         # Losses at top and bottom
-        losses_this_timestep += self.my_slices[0].heat_losses_vertical_top_or_bottom(
-            u_value_tank, seconds_per_timestep, ambient_temperature
+        losses_top = self.energy_losses_top_or_bottom(
+            self.start, u_value_tank, seconds_per_timestep, ambient_temperature
         )
-        losses_this_timestep += self.my_slices[-1].heat_losses_vertical_top_or_bottom(
-            u_value_tank, seconds_per_timestep, ambient_temperature
+        losses_bottom = self.energy_losses_top_or_bottom(
+            self.end - 1, u_value_tank, seconds_per_timestep, ambient_temperature
         )
 
-        # Losses to the sides
-        for i in range(len(self.my_slices)):
-            losses_this_timestep += self.my_slices[i].heat_losses_horizontal(
-                u_value_tank, seconds_per_timestep, ambient_temperature
-            )
+        # Losses to the sides, like WaterSlice.heat_losses_horizontal for every slice
+        slices = self.get_slices()
+        perimeter_tank = math.pi * self.diameter
+        losses_horizontal = (
+            u_value_tank
+            * (perimeter_tank * slices[self.Height])
+            * (slices[self.Temperature] - ambient_temperature)
+            * seconds_per_timestep
+        )
+        slices[self.Enthalpy] -= losses_horizontal
+        slices[self.Temperature] = slices[self.Enthalpy] / (
+            slices[self.Mass] * self.specific_heat_capacity
+        )
+        losses_this_timestep = np.cumsum(
+            np.concatenate(([0.0, losses_top, losses_bottom], losses_horizontal))
+        )[-1]
         return losses_this_timestep
 
     def energy_exchange_between_slices(
@@ -683,7 +808,7 @@ class WarmWaterStorageSimulation:
         slice_height saves all the distances between the slices.
         energy_transfer saves the energy which is transferred to the slice below.
         The transferred energy ( = Enthalpy) is subtracted from the slices and a new temperature is calculated.
-        The storing of transferred energy is necessary because a direct subtraction would influence the iterative process.
+        The transfers are calculated from the temperatures before any exchange, so all slices are handled at once.
 
         u_value Water-Water = ~0.6 ?!
         Upper slice (warmer):
@@ -694,44 +819,27 @@ class WarmWaterStorageSimulation:
         --> top slice just looses energy
         --> bottom slice just gains energy
         """
+        slices = self.get_slices()
+        heights = slices[self.Height]
+        temperatures = slices[self.Temperature]
 
-        energy_transfer = []
-        slice_height = []
-        # for i in range(len(self.my_slices)):
-        # log.information("Schicht: " + str(i) + " Höhe: " + str(self.my_slices[i].height) + " Temperatur: " + str(self.my_slices[i].temperature))
-
-        for i in range(len(self.my_slices) - 1):
-            slice_height.append(
-                (self.my_slices[i].height + self.my_slices[i + 1].height) / 2
-            )
-
-        for i in range(len(self.my_slices) - 1):
-            energy_transfer.append(
-                (
-                    lambda_water_water
-                    * self.area
-                    / slice_height[i]
-                    * (
-                        self.my_slices[i].temperature
-                        - self.my_slices[i + 1].temperature
-                    )
-                )
-                * seconds_per_timestep
-            )
-
-        assert len(energy_transfer) == len(slice_height)
+        slice_height = (heights[:-1] + heights[1:]) / 2
+        energy_transfer = (
+            lambda_water_water
+            * self.area
+            / slice_height
+            * (temperatures[:-1] - temperatures[1:])
+        ) * seconds_per_timestep
 
-        for i in range(len(self.my_slices) - 1):
-            self.my_slices[i].enthalpy -= energy_transfer[i]
-            self.my_slices[i + 1].enthalpy += energy_transfer[i]
+        # every slice first receives the energy from above and then passes energy to the slice below
+        slices[self.Enthalpy, 1:] += energy_transfer
+        slices[self.Enthalpy, :-1] -= energy_transfer
 
-        for i in range(len(self.my_slices)):
-            # log.information("slice number " + str(i))
-            previous = deepcopy(self.my_slices[i].temperature)
-            self.my_slices[i].calculate_new_temperature()
-            # log.information(previous)
-            # log.information(self.my_slices[i].temperature)
-            assert abs(previous - self.my_slices[i].temperature) > 0
+        previous_temperatures = temperatures.copy()
+        slices[self.Temperature] = slices[self.Enthalpy] / (
+            slices[self.Mass] * self.specific_heat_capacity
+        )
+        assert np.all(np.abs(previous_temperatures - slices[self.Temperature]) > 0)
 
     def energy_exchange_between_slices_differential_equation(
         self, lambda_water_water: float = 0.06, seconds_per_timestep: int = 1
@@ -748,61 +856,49 @@ class WarmWaterStorageSimulation:
         :param seconds_per_timestep:
         :return:
         """
-        slice_height = []
-        for i in range(len(self.my_slices)):
+        slices = self.get_slices()
+        for i in range(self.number_of_slices):
             log.information(
                 "Schicht: "
                 + str(i)
                 + " Höhe: "
-                + str(self.my_slices[i].height)
+                + str(slices[self.Height, i])
                 + " Temperatur: "
-                + str(self.my_slices[i].temperature)
+                + str(slices[self.Temperature, i])
             )
 
-        for i in range(len(self.my_slices) - 1):
-            slice_height.append(
-                (self.my_slices[i].height + self.my_slices[i + 1].height) / 2
-            )
-        slice_height.append(0)
+        slice_height = np.append(
+            (slices[self.Height, :-1] + slices[self.Height, 1:]) / 2, 0
+        )
 
         def ode_sd():
             # ab 2. Schicht
-            division_factor = (
-                self.my_slices[i].specific_heat_capacity * self.my_slices[i].mass
-            )
+            division_factor = self.specific_heat_capacity * slices[self.Mass, i]
             coefficient_T_slice = (
-                (lambda_water_water * self.my_slices[i].area) / slice_height[i]
-                + (lambda_water_water * self.my_slices[i].area) / slice_height[i + 1]
+                (lambda_water_water * self.area) / slice_height[i]
+                + (lambda_water_water * self.area) / slice_height[i + 1]
             ) / division_factor
 
             coefficient_constant_T_slice = (
-                (
-                    lambda_water_water
-                    * self.my_slices[i].area
-                    * self.my_slices[i - 1].temperature
-                )
+                (lambda_water_water * self.area * slices[self.Temperature, i - 1])
                 / slice_height[i]
-                + (
-                    lambda_water_water
-                    * self.my_slices[i].area
-                    * self.my_slices[i + 1].temperature
-                )
+                + (lambda_water_water * self.area * slices[self.Temperature, i + 1])
                 / slice_height[i + 1]
             ) / division_factor
 
-            dT_waterslice_dt = (-1) * self.my_slices[
-                i
-            ].temperature * coefficient_T_slice + coefficient_constant_T_slice
+            dT_waterslice_dt = (-1) * slices[
+                self.Temperature, i
+            ] * coefficient_T_slice + coefficient_constant_T_slice
 
             return dT_waterslice_dt
 
         new_temperatures: List[float] = []
-        for i in range(len(self.my_slices)):
+        for i in range(self.number_of_slices):
             # y = odeint(ode_sd, y0, ts)
             # new_temperatures.append(y)
             pass
-        for i in range(len(self.my_slices)):
-            self.my_slices[i].temperature = new_temperatures[i]
+        for i in range(self.number_of_slices):
+            slices[self.Temperature, i] = new_temperatures[i]
         pass
 
 
@@ -1096,7 +1192,7 @@ class StratifiedWarmWaterStorage(Component):
         tank_mass = self.wws.calculate_tanks_mass()
 
         # amount of slices in the tank
-        amount_of_slices = len(self.wws.my_slices)
+        amount_of_slices = self.wws.number_of_slices
 
         # water slice input values
         # mass is in kg/s --> converted to kg/timestep
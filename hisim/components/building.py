@@ -40,11 +40,12 @@ The module contains the following classes:
 # clean
 
 # Generic/Built-in
-from typing import List, Any, Optional, Tuple
+from typing import List, Any, Dict, Optional, Tuple
 from functools import lru_cache
 import math
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
+import numpy as np
 import pvlib
 import pandas as pd
 
@@ -231,14 +232,8 @@ class Building(dynamic_component.DynamicComponent):
         self.set_heating_temperature_in_celsius: float = 19
         self.set_cooling_temperature_in_celsius: float = 24
 
-        (self.is_in_cache, self.cache_file_path,) = utils.get_cache_file(
-            self.component_name,
-            self.buildingconfig,
-            self.my_simulation_parameters,
-        )
-
-        self.cache: List[float]
-        self.solar_heat_gain_through_windows: List[float]
+        # calculated for all timesteps in i_prepare_simulation from the weather series, otherwise in every timestep
+        self.solar_heat_gain_through_windows: Optional[List[float]] = None
 
         self.my_building_information = BuildingInformation(config=self.buildingconfig)
         self.build()
@@ -541,7 +536,7 @@ class Building(dynamic_component.DynamicComponent):
         """Simulate the thermal behaviour of the building."""
 
         # Gets inputs
-        if hasattr(self, "solar_gain_through_windows") is False:
+        if self.solar_heat_gain_through_windows is None:
             azimuth = stsv.get_input_value(self.azimuth_channel)
             direct_normal_irradiance = stsv.get_input_value(
                 self.direct_normal_irradiance_channel
@@ -590,7 +585,7 @@ class Building(dynamic_component.DynamicComponent):
         )
 
         # Performs calculations
-        if hasattr(self, "solar_gain_through_windows") is False:
+        if self.solar_heat_gain_through_windows is None:
             solar_heat_gain_through_windows = self.get_solar_heat_gain_through_windows(
                 azimuth=azimuth,
                 direct_normal_irradiance=direct_normal_irradiance,
@@ -679,21 +674,6 @@ class Building(dynamic_component.DynamicComponent):
             heat_flux_internal_room_surface_in_watt,
         )
 
-        # Saves solar gains cache
-        if not self.is_in_cache:
-            self.cache[timestep] = solar_heat_gain_through_windows
-            if timestep + 1 == self.my_simulation_parameters.timesteps:
-                database = pd.DataFrame(
-                    self.cache,
-                    columns=["solar_gain_through_windows"],
-                )
-                database.to_csv(
-                    self.cache_file_path,
-                    sep=",",
-                    decimal=".",
-                    index=False,
-                )
-
     # =================================================================================================================================
 
     def i_save_state(
@@ -705,8 +685,45 @@ class Building(dynamic_component.DynamicComponent):
     def i_prepare_simulation(
         self,
     ) -> None:
-        """Prepare the simulation."""
-        pass
+        """Prepare the simulation.
+
+        The solar gains through the windows only depend on the weather. If the weather provides its yearly series,
+        they are calculated for all timesteps at once, so i_simulate only looks them up.
+        """
+        if not self.simulation_repository.exist_entry(
+            Weather.Weather_DirectNormalIrradiance_yearly_forecast
+        ):
+            return
+        timesteps = self.my_simulation_parameters.timesteps
+        weather_series = {
+            argument_name: np.array(
+                self.simulation_repository.get_entry(entry_name)[:timesteps],
+                dtype=np.float64,
+            )
+            for argument_name, entry_name in [
+                ("azimuth", Weather.Weather_Azimuth_yearly_forecast),
+                (
+                    "direct_normal_irradiance",
+                    Weather.Weather_DirectNormalIrradiance_yearly_forecast,
+                ),
+                (
+                    "direct_horizontal_irradiance",
+                    Weather.Weather_DiffuseHorizontalIrradiance_yearly_forecast,
+                ),
+                (
+                    "global_horizontal_irradiance",
+                    Weather.Weather_GlobalHorizontalIrradiance_yearly_forecast,
+                ),
+                (
+                    "direct_normal_irradiance_extra",
+                    Weather.Weather_DirectNormalIrradianceExtra_yearly_forecast,
+                ),
+                ("apparent_zenith", Weather.Weather_ApparentZenith_yearly_forecast),
+            ]
+        }
+        self.solar_heat_gain_through_windows = self.get_solar_heat_gain_through_windows_for_all_timesteps(
+            **weather_series
+        ).tolist()
 
     def i_restore_state(
         self,
@@ -873,17 +890,6 @@ class Building(dynamic_component.DynamicComponent):
             total_windows_area += (
                 self.my_building_information.scaled_window_areas_in_m2[index]
             )
-        # if nothing exists, initialize the empty arrays for caching, else read stuff
-        if (
-            not self.is_in_cache
-        ):  # cache_filepath is None or  (not os.path.isfile(cache_filepath)):
-            self.cache = [0] * self.my_simulation_parameters.timesteps
-        else:
-            self.solar_heat_gain_through_windows = pd.read_csv(
-                self.cache_file_path,
-                sep=",",
-                decimal=".",
-            )["solar_gain_through_windows"].tolist()
 
         return windows, total_windows_area
 
@@ -1253,6 +1259,38 @@ class Building(dynamic_component.DynamicComponent):
                 solar_heat_gains += solar_heat_gain
         return solar_heat_gains
 
+    def get_solar_heat_gain_through_windows_for_all_timesteps(
+        self,
+        azimuth: np.ndarray,
+        direct_normal_irradiance: np.ndarray,
+        direct_horizontal_irradiance: np.ndarray,
+        global_horizontal_irradiance: np.ndarray,
+        direct_normal_irradiance_extra: np.ndarray,
+        apparent_zenith: np.ndarray,
+    ) -> np.ndarray:
+        """Calculate the thermal solar gain through the windows for whole series at once, like get_solar_heat_gain_through_windows."""
+        solar_heat_gains = np.zeros(len(azimuth))
+        for window in self.windows:
+            solar_heat_gains += Window.calc_solar_heat_gains_for_all_timesteps(
+                sun_azimuth=azimuth,
+                direct_normal_irradiance=direct_normal_irradiance,
+                direct_horizontal_irradiance=direct_horizontal_irradiance,
+                global_horizontal_irradiance=global_horizontal_irradiance,
+                direct_normal_irradiance_extra=direct_normal_irradiance_extra,
+                apparent_zenith=apparent_zenith,
+                window_tilt_angle=window.window_tilt_angle,
+                window_azimuth_angle=window.window_azimuth_angle,
+                reduction_factor_with_area=window.reduction_factor_with_area,
+            )
+        # without any irradiance there is no solar gain
+        no_irradiance = (
+            (direct_normal_irradiance == 0)
+            & (direct_horizontal_irradiance == 0)
+            & (global_horizontal_irradiance == 0)
+        )
+        solar_heat_gains[no_irradiance] = 0.0
+        return solar_heat_gains
+
     # =====================================================================================================================================
     # Calculation of the heat flows from internal and solar heat sources.
     # (**/*** Check header)
@@ -1881,6 +1919,62 @@ class Window:
 
         return poa_irrad["poa_direct"] * reduction_factor_with_area
 
+    @staticmethod
+    def calc_solar_heat_gains_for_all_timesteps(
+        sun_azimuth: np.ndarray,
+        direct_normal_irradiance: np.ndarray,
+        direct_horizontal_irradiance: np.ndarray,
+        global_horizontal_irradiance: np.ndarray,
+        direct_normal_irradiance_extra: np.ndarray,
+        apparent_zenith: np.ndarray,
+        window_tilt_angle: float,
+        window_azimuth_angle: Optional[float],
+        reduction_factor_with_area: float,
+    ) -> np.ndarray:
+        """Calculate the Solar Gains through the set Window for whole series at once, like calc_solar_heat_gains."""
+        if window_azimuth_angle is None:
+            window_azimuth_angle = 0
+            log.warning(
+                "window azimuth angle was set to 0 south because no value was set."
+            )
+        poa_irrad = pvlib.irradiance.get_total_irradiance(
+            window_tilt_angle,
+            window_azimuth_angle,
+            apparent_zenith,
+            sun_azimuth,
+            direct_normal_irradiance,
+            global_horizontal_irradiance,
+            direct_horizontal_irradiance,
+            direct_normal_irradiance_extra,
+        )
+        poa_direct = np.asarray(poa_irrad["poa_direct"], dtype=np.float64)
+        return np.where(np.isnan(poa_direct), 0.0, poa_direct * reduction_factor_with_area)
+
+
+@lru_cache(maxsize=1)
+def get_tabula_data() -> pd.DataFrame:
+    """Reads the TABULA building data once per process. The data frame is shared, so it must not be changed."""
+    return pd.read_csv(
+        utils.HISIMPATH["housing"],
+        decimal=",",
+        sep=";",
+        encoding="cp1252",
+        low_memory=False,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_tabula_index() -> Dict[str, np.ndarray]:
+    """Maps every building variant code of the TABULA data to its row positions."""
+    tabula_index: Dict[str, np.ndarray] = get_tabula_data().groupby("Code_BuildingVariant", sort=False).indices
+    return tabula_index
+
+
+def get_tabula_building_data(building_code: str) -> pd.DataFrame:
+    """Gets the TABULA rows of a building variant without searching the whole table."""
+    row_positions = get_tabula_index().get(building_code, np.zeros(0, dtype=np.int64))
+    return get_tabula_data().iloc[row_positions]
+
 
 @dataclass_json
 @dataclass
@@ -1908,18 +2002,8 @@ class BuildingInformation:
         self,
     ):
         """Get the building code from a TABULA building."""
-        d_f = pd.read_csv(
-            utils.HISIMPATH["housing"],
-            decimal=",",
-            sep=";",
-            encoding="cp1252",
-            low_memory=False,
-        )
-
         # Gets parameters from chosen building
-        self.buildingdata = d_f.loc[
-            d_f["Code_BuildingVariant"] == self.buildingconfig.building_code
-        ]
+        self.buildingdata = get_tabula_building_data(self.buildingconfig.building_code)
         self.buildingcode = self.buildingconfig.building_code
         self.building_heat_capacity_class = (
             self.buildingconfig.building_heat_capacity_class
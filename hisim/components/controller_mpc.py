@@ -2,7 +2,7 @@
 
 from numpy.linalg import inv
 import numpy as np
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
 from scipy.ndimage import interpolation
@@ -157,6 +157,307 @@ class MPCcontrollerState:
         return MPCcontrollerState(self.t_m, self.soc, self.cost_optimal_thermal_power)
 
 
+class MpcOptimizationProblem:
+    """CasADi problem of the MPC for one horizon configuration.
+
+    The problem is built once and solved again for every optimization. Forecasts, prices and initial states are
+    parameters of the problem, and every solve is warm started from the solution of the previous one.
+    """
+
+    def __init__(
+        self, controller: "MPC_Controller", scaled_horizon: int, sampling_rate: int
+    ) -> None:
+        """Builds the variables, constraints, objective and the solver."""
+        N = scaled_horizon  # scaled prediction horizon
+        flexibility_element = controller.flexibility_element
+
+        # Discretization of the state space model:
+        I = np.identity(controller.A.shape[0])  # this is an identity matrix
+        Ad = np.matrix(np.exp(controller.A * sampling_rate))
+        Bd = np.linalg.inv(controller.A) * (Ad - I) * controller.B
+
+        # symbolic defenition of system variables:
+
+        # 1. manipulated variable
+        phi_hc = ca.MX.sym("phi_hc")
+
+        # 2. state: controlled variable (thermal power delivered)
+        t_m = ca.MX.sym("t_m")
+
+        # 3. Disturbances (outside temperature - solar gains - internal gains - dynamic price signal)
+        t_out = ca.MX.sym("t_out")
+        t_sup = ca.MX.sym("t_sup")
+        phi_ia = ca.MX.sym("phi_ia")
+        phi_st = ca.MX.sym("phi_st")
+        phi_m = ca.MX.sym("phi_m")
+
+        disturbances = ca.vertcat(t_out, t_sup, phi_ia, phi_st, phi_m)
+        n_disturbances = disturbances.numel()
+
+        t_m_discrete = (
+            Ad * t_m
+            + Bd[0, 0] * phi_hc
+            + Bd[0, 1] * t_out
+            + Bd[0, 2] * t_sup
+            + Bd[0, 3] * phi_ia
+            + Bd[0, 4] * phi_st
+            + Bd[0, 5] * phi_m
+        )
+
+        F = ca.Function(
+            "F",
+            [t_m, phi_hc, t_out, t_sup, phi_ia, phi_st, phi_m],
+            [t_m_discrete],
+            ["t_m", "phi_hc", "t_out", "t_sup", "phi_ia", "phi_st", "phi_m"],
+            ["t_m_next"],
+        )
+
+        # multiple shooting approach : multiple shooting means more than one decision variable (state variables, thermal power , grid import, ....)
+
+        opti = ca.Opti()
+
+        x = opti.variable(1, N + 1)  # state variable: controlled temperature
+        u = opti.variable(1, N)  # manipulated variable: thermal power delivered
+        dist = opti.variable(
+            n_disturbances, N
+        )  # disturbances: 1. ambient temperature 2. supply temperature = ambient temperature 3. heat flux to the node Ti (indoor air) 4. heat flux to the node s (internal surfaces) 5. heat flux to thermal mass node
+        Pbuy = opti.variable(1, N)
+        self.variables = {"u": u, "Pbuy": Pbuy}
+
+        if flexibility_element in {"PV_only", "PV_and_Battery"}:
+            Ppv = opti.variable(1, N)
+            Psell = opti.variable(1, N)
+            PV = opti.variable(1, N)
+            self.variables.update({"Ppv": Ppv, "Psell": Psell})
+
+        if flexibility_element == "PV_and_Battery":
+            soc = opti.variable(1, N + 1)
+            battery_charging_power = opti.variable(1, N)
+            battery_discharging_power = opti.variable(1, N)
+            battery_power_flow = opti.variable(1, N)
+            # flow=opti.variable(1,N)
+            self.variables.update(
+                {
+                    "soc": soc,
+                    "battery_charging_power": battery_charging_power,
+                    "battery_discharging_power": battery_discharging_power,
+                    "battery_power_flow": battery_power_flow,
+                }
+            )
+
+        x_init = opti.parameter(1, 1)
+        # u_init=opti.parameter(1,1)
+        disturbance_forecast = opti.parameter(n_disturbances, N)
+        cop_values = opti.parameter(
+            1, N
+        )  # coefiiecient of performance: heating air conditioner efficiency
+        eer_values = opti.parameter(
+            1, N
+        )  # energy efficiency ratio: cooling air conditioner efficiency
+        p_el = opti.parameter(1, N)  # purchase price
+        FIT = opti.parameter(1, N)  # feed in tariff
+        self.parameters = {
+            "x_init": x_init,
+            "disturbance_forecast": disturbance_forecast,
+            "cop_values": cop_values,
+            "eer_values": eer_values,
+            "p_el": p_el,
+            "FIT": FIT,
+        }
+
+        if flexibility_element in {"PV_only", "PV_and_Battery"}:
+            pv_production = opti.parameter(1, N)
+            self.parameters["pv_production"] = pv_production
+
+        if flexibility_element == "PV_and_Battery":
+            soc_init = opti.parameter(1, 1)
+            self.parameters["soc_init"] = soc_init
+
+        # Cost Function
+
+        if flexibility_element == "basic_buidling_configuration":
+            opti.minimize(sum(ca.horzsplit(p_el * Pbuy, 1)))
+
+        if flexibility_element == "PV_only":
+            # a weighting factor of 0.5 is added to the revenue to priortize using the pv production instead of selling to the grid
+            opti.minimize(sum(ca.horzsplit((p_el * Pbuy - 0.5 * FIT * Psell))))
+
+        if flexibility_element == "PV_and_Battery":
+            opti.minimize(sum(ca.horzsplit((p_el * Pbuy - 0.5 * FIT * Psell))))
+
+        # Constraints
+        for k in range(N):
+            opti.subject_to(
+                x[:, k + 1]
+                == F(
+                    x[:, k],
+                    u[:, k],
+                    disturbance_forecast[0, k],
+                    disturbance_forecast[1, k],
+                    disturbance_forecast[2, k],
+                    disturbance_forecast[3, k],
+                    disturbance_forecast[4, k],
+                )
+            )
+            if flexibility_element == "PV_and_Battery":
+                opti.subject_to(
+                    soc[:, k + 1]
+                    == soc[:, k]
+                    + (battery_power_flow[:, k])
+                    * (
+                        controller.my_simulation_parameters.seconds_per_timestep
+                        * sampling_rate
+                        / 3600
+                    )
+                )
+
+        opti.subject_to(
+            opti.bounded(controller.min_comfort_temp, x, controller.max_comfort_temp)
+        )
+
+        """ a Terminal Constraint is added if Hisim resolution is different than the optimizer resolution:
+            e.g, if you run hisim at 60 sec per time step and you would like to reduce the optimization is done by sampling each 20 or 15 min
+            This ensures that inital guess at the following optimization is within the constraint"""
+
+        if sampling_rate != 1:
+            opti.subject_to(x[-1] > controller.min_comfort_temp + 0.3)
+
+        opti.subject_to(opti.bounded(0, ca.fabs(u), 16000))
+
+        if flexibility_element == "basic_buidling_configuration":
+            opti.subject_to(
+                Pbuy
+                == ca.if_else(u > 0, ca.fabs(u) / cop_values, ca.fabs(u) / eer_values)
+            )
+
+        if flexibility_element == "PV_only":
+
+            """Energy Balance constraint for Grid , PV  interaction"""
+            opti.subject_to(
+                Pbuy
+                == ca.if_else(
+                    u > 0,
+                    ca.fabs(u) / cop_values - (pv_production - Psell),
+                    ca.fabs(u) / eer_values - (pv_production - Psell),
+                )
+            )
+            opti.subject_to(Ppv == pv_production - Psell)
+
+        if flexibility_element == "PV_and_Battery":
+
+            """Battery charging and discharging bounds / making sure that charging and discharging doesn't occur at the same time"""
+            opti.subject_to(
+                opti.bounded(
+                    controller.minimum_storage_capacity,
+                    soc,
+                    controller.maximum_storage_capacity,
+                )
+            )
+            opti.subject_to(
+                opti.bounded(
+                    -controller.maximum_discharging_power,
+                    battery_power_flow,
+                    controller.maximum_charging_power,
+                )
+            )
+            opti.subject_to(
+                battery_charging_power
+                == ca.if_else(
+                    battery_power_flow > 0,
+                    battery_power_flow * controller.battery_efficiency,
+                    0,
+                )
+            )
+            opti.subject_to(
+                battery_discharging_power
+                == ca.if_else(
+                    battery_power_flow < 0,
+                    -battery_power_flow
+                    / (controller.battery_efficiency * controller.inverter_efficiency),
+                    0,
+                )
+            )
+            opti.subject_to(
+                opti.bounded(
+                    0, battery_charging_power, controller.maximum_charging_power
+                )
+            )
+
+            """ Energy Balance constraint for Grid , PV , Battery interaction"""
+
+            opti.subject_to(
+                Pbuy
+                == ca.if_else(
+                    u > 0,
+                    ca.fabs(u) / cop_values - Ppv - battery_discharging_power,
+                    ca.fabs(u) / eer_values - Ppv - battery_discharging_power,
+                )
+            )
+            opti.subject_to(Psell == pv_production - battery_charging_power - Ppv)
+
+        if flexibility_element in {"PV_only", "PV_and_Battery"}:
+            opti.subject_to(opti.bounded(0, Psell, pv_production))
+            opti.subject_to(Pbuy >= 0)
+            opti.subject_to(
+                Pbuy
+                <= ca.if_else(u > 0, ca.fabs(u) / cop_values, ca.fabs(u) / eer_values)
+            )
+
+        """ Initial conditions """
+        opti.subject_to(x[:, 0] == x_init)  # controlled temperature temperature
+        opti.subject_to(
+            dist == disturbance_forecast
+        )  # building disturbances (solar gains / internal gains / ambient temperature)
+
+        if flexibility_element in {"PV_only", "PV_and_Battery"}:
+            opti.subject_to(
+                PV == pv_production
+            )  # forecasted PV generation by the generic_pv_component
+
+        if flexibility_element == "PV_and_Battery":
+            opti.subject_to(soc[:, 0] == soc_init)  # battery state of charge
+
+        """ choose a concerete solver: The default linear solver used with ipopt is mumps (MUltifrontal Massively Parallel Solver).
+        For a faster solution, the default sover is replced with HSL solver 'ma27' (see 'sol_opts' > 'linear_solver'). A free version is available for Academic Purposes ONLY. Please follow the steps provided at the end of the script to obtain, compile, and interface HSL solver.
+
+        * Remark: when including the battery in the building energy system one optimization time step with { HiSim time_step = 60 sec and sampling rate = 1 }  takes around 57 sec using the ma27 solver.
+        The aforementioned is only for the optimization and not the entire household.
+
+        This's  reduced to 0.5 sec with { HiSim time_step = 60 sec and sampling rate = 15 } or { HiSim time_step = 60*20 sec and sampling rate = 1 }and 'ma27' solver and even less with sampling rate of 20 min.
+
+        Also it is not guarnteed that a one year simulation will work for all systems with the default solver.
+
+        However, it is possible to do the simulation with the default solver for a building with PV installation ONLY.
+            """
+
+        sol_opts = {
+            "ipopt": {
+                "max_iter": 2000,
+                "print_level": 0,
+                "sb": "yes",
+                "acceptable_tol": 1e-3,
+                # 'linear_solver':'ma27', # options: 'mumps','ma27'
+                "acceptable_obj_change_tol": 1e-3,
+            },
+            "print_time": False,
+        }
+        opti.solver("ipopt", sol_opts)
+
+        self.opti = opti
+        self.previous_solution: Optional[List[Any]] = None
+
+    def solve(self, parameter_values: Dict[str, Any]) -> Dict[str, Any]:
+        """Sets the parameters, solves the problem and returns the values of the variables."""
+        for name, value in parameter_values.items():
+            self.opti.set_value(self.parameters[name], value)
+        if self.previous_solution is not None:
+            # warm start: the optimizations of successive timesteps have almost the same solution
+            self.opti.set_initial(self.previous_solution)
+        sol = self.opti.solve()
+        self.previous_solution = sol.value_variables()
+        return {name: sol.value(variable) for name, variable in self.variables.items()}
+
+
 class MPC_Controller(cp.Component):
 
     """MPC Controller class."""
@@ -303,6 +604,8 @@ class MPC_Controller(cp.Component):
         self.max_comfort_temp = self.mpcconfig.max_comfort_temp
         self.sampling_rate = self.mpcconfig.optimizer_sampling_rate
         self.flexibility_element = self.mpcconfig.flexibility_element
+        # optimization problems by scaled horizon and sampling rate, built on the first use
+        self.optimization_problems: Dict[Tuple[int, int], MpcOptimizationProblem] = {}
 
         self.temp_forecast = self.mpcconfig.temp_forecast
         self.phi_m_forecast = self.mpcconfig.phi_m_forecast
@@ -588,12 +891,7 @@ class MPC_Controller(cp.Component):
     ):
         """MPC Implementation."""
         sampling_rate = int(self.prediction_horizon / scaled_horizon)
-        N = scaled_horizon  # scaled prediction horizon
-
-        # Discretization of the state space model:
         I = np.identity(self.A.shape[0])  # this is an identity matrix
-        Ad = np.matrix(np.exp(self.A * sampling_rate))
-        Bd = np.linalg.inv(self.A) * (Ad - I) * self.B
 
         # numerical values of the disturbances
         D_val = ca.horzcat(
@@ -637,264 +935,33 @@ class MPC_Controller(cp.Component):
             np.array(PriceInjection_Forecast_24h), (1, len(PriceInjection_Forecast_24h))
         )
 
-        # symbolic defenition of system variables:
-
-        # 1. manipulated variable
-        phi_hc = ca.MX.sym("phi_hc")
-
-        # 2. state: controlled variable (thermal power delivered)
-        t_m = ca.MX.sym("t_m")
-
-        # 3. Disturbances (outside temperature - solar gains - internal gains - dynamic price signal)
-        t_out = ca.MX.sym("t_out")
-        t_sup = ca.MX.sym("t_sup")
-        phi_ia = ca.MX.sym("phi_ia")
-        phi_st = ca.MX.sym("phi_st")
-        phi_m = ca.MX.sym("phi_m")
-
-        disturbances = ca.vertcat(t_out, t_sup, phi_ia, phi_st, phi_m)
-        n_disturbances = disturbances.numel()
-
-        t_m_discrete = (
-            Ad * t_m
-            + Bd[0, 0] * phi_hc
-            + Bd[0, 1] * t_out
-            + Bd[0, 2] * t_sup
-            + Bd[0, 3] * phi_ia
-            + Bd[0, 4] * phi_st
-            + Bd[0, 5] * phi_m
-        )
-
-        F = ca.Function(
-            "F",
-            [t_m, phi_hc, t_out, t_sup, phi_ia, phi_st, phi_m],
-            [t_m_discrete],
-            ["t_m", "phi_hc", "t_out", "t_sup", "phi_ia", "phi_st", "phi_m"],
-            ["t_m_next"],
-        )
-
-        # multiple shooting approach : multiple shooting means more than one decision variable (state variables, thermal power , grid import, ....)
-
-        opti = ca.Opti()
-
-        x = opti.variable(1, N + 1)  # state variable: controlled temperature
-        u = opti.variable(1, N)  # manipulated variable: thermal power delivered
-        dist = opti.variable(
-            n_disturbances, N
-        )  # disturbances: 1. ambient temperature 2. supply temperature = ambient temperature 3. heat flux to the node Ti (indoor air) 4. heat flux to the node s (internal surfaces) 5. heat flux to thermal mass node
-        Pbuy = opti.variable(1, N)
-
-        if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
-            Ppv = opti.variable(1, N)
-            Psell = opti.variable(1, N)
-            PV = opti.variable(1, N)
-
-        if self.flexibility_element == "PV_and_Battery":
-            soc = opti.variable(1, N + 1)
-            battery_charging_power = opti.variable(1, N)
-            battery_discharging_power = opti.variable(1, N)
-            battery_power_flow = opti.variable(1, N)
-            # flow=opti.variable(1,N)
-
-        x_init = opti.parameter(1, 1)
-        # u_init=opti.parameter(1,1)
-        disturbance_forecast = opti.parameter(n_disturbances, N)
-        cop_values = opti.parameter(
-            1, N
-        )  # coefiiecient of performance: heating air conditioner efficiency
-        eer_values = opti.parameter(
-            1, N
-        )  # energy efficiency ratio: cooling air conditioner efficiency
-
-        if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
-            pv_production = opti.parameter(1, N)
-
-        if self.flexibility_element == "PV_and_Battery":
-            soc_init = opti.parameter(1, 1)
-
-        # Cost Function
-
-        if self.flexibility_element == "basic_buidling_configuration":
-            opti.minimize(sum(ca.horzsplit(p_el * Pbuy, 1)))
-
-        if self.flexibility_element == "PV_only":
-            # a weighting factor of 0.5 is added to the revenue to priortize using the pv production instead of selling to the grid
-            opti.minimize(sum(ca.horzsplit((p_el * Pbuy - 0.5 * FIT * Psell))))
-
-        if self.flexibility_element == "PV_and_Battery":
-            opti.minimize(sum(ca.horzsplit((p_el * Pbuy - 0.5 * FIT * Psell))))
-
-        # Constraints
-        for k in range(N):
-            opti.subject_to(
-                x[:, k + 1]
-                == F(
-                    x[:, k],
-                    u[:, k],
-                    disturbance_forecast[0, k],
-                    disturbance_forecast[1, k],
-                    disturbance_forecast[2, k],
-                    disturbance_forecast[3, k],
-                    disturbance_forecast[4, k],
-                )
-            )
-            if self.flexibility_element == "PV_and_Battery":
-                opti.subject_to(
-                    soc[:, k + 1]
-                    == soc[:, k]
-                    + (battery_power_flow[:, k])
-                    * (
-                        self.my_simulation_parameters.seconds_per_timestep
-                        * sampling_rate
-                        / 3600
-                    )
-                )
-
-        opti.subject_to(opti.bounded(self.min_comfort_temp, x, self.max_comfort_temp))
-
-        """ a Terminal Constraint is added if Hisim resolution is different than the optimizer resolution:
-            e.g, if you run hisim at 60 sec per time step and you would like to reduce the optimization is done by sampling each 20 or 15 min
-            This ensures that inital guess at the following optimization is within the constraint"""
-
-        if sampling_rate != 1:
-            opti.subject_to(x[-1] > self.min_comfort_temp + 0.3)
-
-        opti.subject_to(opti.bounded(0, ca.fabs(u), 16000))
-
-        if self.flexibility_element == "basic_buidling_configuration":
-            opti.subject_to(
-                Pbuy
-                == ca.if_else(u > 0, ca.fabs(u) / cop_values, ca.fabs(u) / eer_values)
-            )
-
-        if self.flexibility_element == "PV_only":
-
-            """Energy Balance constraint for Grid , PV  interaction"""
-            opti.subject_to(
-                Pbuy
-                == ca.if_else(
-                    u > 0,
-                    ca.fabs(u) / cop_values - (pv_production - Psell),
-                    ca.fabs(u) / eer_values - (pv_production - Psell),
-                )
-            )
-            opti.subject_to(Ppv == pv_production - Psell)
-
-        if self.flexibility_element == "PV_and_Battery":
-
-            """Battery charging and discharging bounds / making sure that charging and discharging doesn't occur at the same time"""
-            opti.subject_to(
-                opti.bounded(
-                    self.minimum_storage_capacity, soc, self.maximum_storage_capacity
-                )
-            )
-            opti.subject_to(
-                opti.bounded(
-                    -self.maximum_discharging_power,
-                    battery_power_flow,
-                    self.maximum_charging_power,
-                )
-            )
-            opti.subject_to(
-                battery_charging_power
-                == ca.if_else(
-                    battery_power_flow > 0,
-                    battery_power_flow * self.battery_efficiency,
-                    0,
-                )
-            )
-            opti.subject_to(
-                battery_discharging_power
-                == ca.if_else(
-                    battery_power_flow < 0,
-                    -battery_power_flow
-                    / (self.battery_efficiency * self.inverter_efficiency),
-                    0,
-                )
-            )
-            opti.subject_to(
-                opti.bounded(0, battery_charging_power, self.maximum_charging_power)
-            )
-
-            """ Energy Balance constraint for Grid , PV , Battery interaction"""
-
-            opti.subject_to(
-                Pbuy
-                == ca.if_else(
-                    u > 0,
-                    ca.fabs(u) / cop_values - Ppv - battery_discharging_power,
-                    ca.fabs(u) / eer_values - Ppv - battery_discharging_power,
-                )
+        problem_key = (scaled_horizon, sampling_rate)
+        if problem_key not in self.optimization_problems:
+            self.optimization_problems[problem_key] = MpcOptimizationProblem(
+                self, scaled_horizon, sampling_rate
             )
-            opti.subject_to(Psell == pv_production - battery_charging_power - Ppv)
-
-        if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
-            opti.subject_to(opti.bounded(0, Psell, pv_production))
-            opti.subject_to(Pbuy >= 0)
-            opti.subject_to(
-                Pbuy
-                <= ca.if_else(u > 0, ca.fabs(u) / cop_values, ca.fabs(u) / eer_values)
-            )
-
-        """ Initial conditions """
-        opti.subject_to(x[:, 0] == x_init)  # controlled temperature temperature
-        opti.subject_to(
-            dist == disturbance_forecast
-        )  # building disturbances (solar gains / internal gains / ambient temperature)
-
-        if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
-            opti.subject_to(
-                PV == pv_production
-            )  # forecasted PV generation by the generic_pv_component
-
-        if self.flexibility_element == "PV_and_Battery":
-            opti.subject_to(soc[:, 0] == soc_init)  # battery state of charge
-
-        """ choose a concerete solver: The default linear solver used with ipopt is mumps (MUltifrontal Massively Parallel Solver).
-        For a faster solution, the default sover is replced with HSL solver 'ma27' (see 'sol_opts' > 'linear_solver'). A free version is available for Academic Purposes ONLY. Please follow the steps provided at the end of the script to obtain, compile, and interface HSL solver.
-
-        * Remark: when including the battery in the building energy system one optimization time step with { HiSim time_step = 60 sec and sampling rate = 1 }  takes around 57 sec using the ma27 solver.
-        The aforementioned is only for the optimization and not the entire household.
-
-        This's  reduced to 0.5 sec with { HiSim time_step = 60 sec and sampling rate = 15 } or { HiSim time_step = 60*20 sec and sampling rate = 1 }and 'ma27' solver and even less with sampling rate of 20 min.
-
-        Also it is not guarnteed that a one year simulation will work for all systems with the default solver.
-
-        However, it is possible to do the simulation with the default solver for a building with PV installation ONLY.
-            """
-
-        sol_opts = {
-            "ipopt": {
-                "max_iter": 2000,
-                "print_level": 0,
-                "sb": "yes",
-                "acceptable_tol": 1e-3,
-                # 'linear_solver':'ma27', # options: 'mumps','ma27'
-                "acceptable_obj_change_tol": 1e-3,
-            },
-            "print_time": False,
-        }
-        opti.solver("ipopt", sol_opts)
 
         # numerical values of the parameter
-
-        opti.set_value(x_init, self.state.t_m)
-        opti.set_value(disturbance_forecast, D_val)
-        opti.set_value(cop_values, cop_sampled)
-        opti.set_value(eer_values, eer_sampled)
+        parameter_values = {
+            "x_init": self.state.t_m,
+            "disturbance_forecast": D_val,
+            "cop_values": cop_sampled,
+            "eer_values": eer_sampled,
+            "p_el": p_el,
+            "FIT": FIT,
+        }
 
         if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
-            opti.set_value(pv_production, pv_forecast_24h)
+            parameter_values["pv_production"] = pv_forecast_24h
 
         if self.flexibility_element == "PV_and_Battery":
-            opti.set_value(soc_init, self.state.soc)
+            parameter_values["soc_init"] = self.state.soc
 
-        sol = opti.solve()
+        solution = self.optimization_problems[problem_key].solve(parameter_values)
 
         # solution Optimizer resolution
-        # t_m_opt=sol.value(x)
-        p_th_opt = sol.value(u)
-        grid_import = sol.value(Pbuy)
+        p_th_opt = solution["u"]
+        grid_import = solution["Pbuy"]
 
         # solution for actual HiSim timestep
         p_th_opt_timstep = np.repeat(p_th_opt, sampling_rate).tolist()
@@ -923,8 +990,8 @@ class MPC_Controller(cp.Component):
         if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
 
             # solution Optimizer resolution
-            pv_consumption = sol.value(Ppv)
-            grid_export = sol.value(Psell)
+            pv_consumption = solution["Ppv"]
+            grid_export = solution["Psell"]
 
             # solution for actual HiSim timestep
             pv_consumption_timestep = np.repeat(pv_consumption, sampling_rate).tolist()
@@ -941,11 +1008,11 @@ class MPC_Controller(cp.Component):
         if self.flexibility_element == "PV_and_Battery":
 
             # solution Optimizer resolution
-            battery_to_load = sol.value(battery_discharging_power)
-            pv_to_battery = sol.value(battery_charging_power)
-            battery_power_flow = sol.value(battery_power_flow)
-            batt_soc_actual = sol.value(soc)
-            batt_soc_normalized = sol.value(soc) / self.maximum_storage_capacity
+            battery_to_load = solution["battery_discharging_power"]
+            pv_to_battery = solution["battery_charging_power"]
+            battery_power_flow = solution["battery_power_flow"]
+            batt_soc_actual = solution["soc"]
+            batt_soc_normalized = solution["soc"] / self.maximum_storage_capacity
             if self.mpc_scheme == "optimization_once_aday_only":
                 self.state.soc = batt_soc_actual[-1]
                 if self.state.soc < 0.2 * self.maximum_storage_capacity:
@@ -5,10 +5,8 @@ Evaluates diesel or electricity consumption based on driven kilometers and proce
 
 # -*- coding: utf-8 -*-
 from typing import List, Any, Tuple
-from os import listdir, path
 from dataclasses import dataclass
 import datetime as dt
-import json
 from dataclasses_json import dataclass_json
 
 import pandas as pd
@@ -18,7 +16,7 @@ from hisim import component as cp
 from hisim import loadtypes as lt
 from hisim.simulationparameters import SimulationParameters
 from hisim.components.configuration import EmissionFactorsAndCostsForFuelsConfig
-from hisim import utils
+from hisim import lpg_result_store, utils
 from hisim.component import OpexCostDataClass
 
 __authors__ = "Johanna Ganglbauer"
@@ -280,32 +278,18 @@ class Car(cp.Component):
         )
         if file_exists:
             # load from cache
-            dataframe = pd.read_csv(
-                cache_filepath, sep=",", decimal=".", encoding="cp1252"
-            )
+            dataframe = utils.load_cache(cache_filepath)
             self.car_location = dataframe["car_location"].tolist()
             self.meters_driven = dataframe["meters_driven"].tolist()
         else:
-            # load car data from LPG output
-            filepaths = listdir(utils.HISIMPATH["utsp_results"])
-            filepath_location = [
-                elem for elem in filepaths if "CarLocation." + self.config.name in elem
-            ][0]
-            filepath_meters_driven = [
-                elem
-                for elem in filepaths
-                if "DrivingDistance." + self.config.name in elem
-            ][0]
-            with open(
-                path.join(utils.HISIMPATH["utsp_results"], filepath_location),
-                encoding="utf-8",
-            ) as json_file:
-                car_location = json.load(json_file)
-            with open(
-                path.join(utils.HISIMPATH["utsp_results"], filepath_meters_driven),
-                encoding="utf-8",
-            ) as json_file:
-                meters_driven = json.load(json_file)
+            # load car data from LPG output, the files get parsed once for all cars
+            lpg_results = lpg_result_store.get_lpg_result_store()
+            car_location = lpg_results.load_json(
+                lpg_results.get_result_filepath("CarLocation." + self.config.name)
+            )
+            meters_driven = lpg_results.load_values(
+                lpg_results.get_result_filepath("DrivingDistance." + self.config.name)
+            )
 
             # compare time resolution of LPG to time resolution of hisim
             time_resolution_original = dt.datetime.strptime(
@@ -351,14 +335,14 @@ class Car(cp.Component):
                         - dt.timedelta(seconds=60),
                         freq="T",
                     ),
-                    "meters_driven": meters_driven["Values"][:steps_desired_in_minutes],
+                    "meters_driven": meters_driven[:steps_desired_in_minutes],
                     "car_location": [
                         location_translator[elem] for elem in car_location["Values"]
                     ][:steps_desired_in_minutes],
                 }
             )
             initial_data = utils.convert_lpg_data_to_utc(
-                data=initial_data, year=self.my_simulation_parameters.year
+                data=initial_data, year=self.my_simulation_parameters.year, format_time=False
             )
             meters_driven = pd.to_numeric(initial_data["meters_driven"]).tolist()
             car_location = pd.to_numeric(initial_data["car_location"]).tolist()
@@ -387,14 +371,13 @@ class Car(cp.Component):
                 self.car_location = car_location
 
             # save data in cache
-            database = pd.DataFrame(
+            utils.save_cache(
+                cache_filepath,
                 {
                     "car_location": self.car_location,
                     "meters_driven": self.meters_driven,
-                }
+                },
             )
-            database.to_csv(cache_filepath)
-            del database
 
     def write_to_report(self) -> List[str]:
         """Writes Car values to report."""
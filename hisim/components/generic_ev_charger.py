@@ -2,8 +2,8 @@
 import json
 import copy
 import sqlite3
-import datetime
-import os
+from contextlib import closing
+import numpy as np
 import pandas as pd
 from hisim.simulationparameters import SimulationParameters
 
@@ -13,7 +13,7 @@ from hisim import loadtypes as lt
 from hisim import utils
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 
 __authors__ = "Vitor Hugo Bellotto Zago"
 __copyright__ = "Copyright 2021, the House Infrastructure Project"
@@ -120,6 +120,44 @@ class EVChargerConfig(cp.ConfigBase):
         )
 
 
+def read_ev_data_of_load_profile_generator(
+    database_filepath: str, first_year: int = 2019
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Reads the states of the charging car from the household database of the Load Profile Generator.
+
+    Only the needed columns of the states from the first year on get queried, with one connection for all
+    queries. Returns if the car is in the charging station and the discharge in Wh for each state.
+    """
+    with closing(sqlite3.connect(database_filepath)) as connection:
+        # the battery information is used to calculate the discharging while not at home
+        vehicles = connection.execute(
+            "SELECT Json FROM TransportationDevices WHERE instr(Name, 'Charging') > 0;"
+        ).fetchall()
+        if not vehicles:
+            raise ValueError("No charging transportation device in " + database_filepath)
+        convert_factor = json.loads(vehicles[-1][0])["EnergyToDistanceFactor"]
+        # the DateTime column has the format %d/%m/%Y %H:%M, the year follows the second slash
+        transportation_devices_stats = pd.read_sql(
+            "SELECT DeviceState, CurrentRange FROM TransportationDeviceStates "
+            "WHERE CAST(substr(DateTime, instr(DateTime, '/') "
+            "+ instr(substr(DateTime, instr(DateTime, '/') + 1), '/') + 1, 4) AS INTEGER) >= ?;",
+            connection,
+            params=(first_year,),
+        )
+
+    device_states = transportation_devices_stats["DeviceState"].astype(str)
+    car_in_charging_station = (
+        device_states.str.contains("ParkingAndFullyCharged", regex=False)
+        | device_states.str.contains("ParkingAndCharging", regex=False)
+    ).to_numpy(dtype=bool)
+    current_range = transportation_devices_stats["CurrentRange"].to_numpy(dtype=float)
+    convert_factor_meters_by_wh = convert_factor * 3600
+    discharge = np.concatenate(
+        ([0.0], np.minimum(np.diff(current_range), 0) / convert_factor_meters_by_wh)
+    )
+    return car_in_charging_station, discharge
+
+
 class VehiclePure(cp.Component):
     """
     Vehicle component class
@@ -198,123 +236,28 @@ class VehiclePure(cp.Component):
             self.component_name, self.evconfig, self.my_simulation_parameters
         )
         if cache_file_exists:
-            self.car_in_charging_station = pd.read_csv(
-                cache_filepath, sep=",", decimal="."
-            )["CarInChargingStation"].tolist()
-            self.discharge = pd.read_csv(cache_filepath, sep=",", decimal=".")[
-                "Discharge"
-            ].tolist()
+            cached_data = utils.load_cache(cache_filepath)
+            self.car_in_charging_station = cached_data["CarInChargingStation"].tolist()
+            self.discharge = cached_data["Discharge"].tolist()
         else:
-
-            def open_sql(path, table_name):
-                sql_file = sqlite3.connect(path)
-                return pd.read_sql("SELECT * FROM {};".format(table_name), sql_file)
-
-            def open_ev_json(filepath):
-                with open(filepath, encoding="utf-8") as f:
-                    data = json.load(f)
-                return data["Values"]
-
             FILEPATH = utils.load_export_load_profile_generator(
                 target=self.evconfig.profile_name
             )
             if FILEPATH is None:
                 FILEPATH = utils.HISIMPATH
 
-            ev_files = {}
-            filepaths = open_sql(FILEPATH["electric_vehicle"][1], "ResultFileEntries")
-            list_columns = []
-            list_values = []
-            for _, row in filepaths.iterrows():
-                json_info = json.loads(row["Json"])
-                if (
-                    "Charging" in json_info["FileName"]
-                    and "png" not in json_info["FileName"]
-                ):
-                    filepath = os.path.normpath(json_info["FullFileName"])
-                    filepath_list = filepath.split(os.sep)
-                    ev_files[filepath_list[-1].split(".")[0]] = json_info[
-                        "FullFileName"
-                    ]
-                    list_columns.append(filepath_list[-1].split(".")[0])
-                    list_values.append(open_ev_json(json_info["FullFileName"]))
-            list_values = list(map(list, zip(*list_values)))
-            # ev_pd = pd.DataFrame(list_values, columns=list_columns)
-
-            # Gets battery information to calculate discharging while not at home
-            transportation_devices = open_sql(
-                FILEPATH["electric_vehicle"][0], "TransportationDevices"
+            car_in_charging_station, discharge_stats = read_ev_data_of_load_profile_generator(
+                FILEPATH["electric_vehicle"][0]
             )
-            for _, vehicle in transportation_devices.iterrows():
-                if "Charging" in vehicle["Name"]:
-                    vehicle_info = json.loads(vehicle["Json"])
-                    battery_stored_energy_meters = vehicle_info["FullRangeInMeters"]
-                    convert_factor = vehicle_info["EnergyToDistanceFactor"]
-                    # battery_stored_energy_wh = battery_stored_energy_meters * convert_factor
-
-            convert_factor_meters_by_wh = convert_factor * 3600
-            soc = []
-            load_stats = []
-            car_in_charging_station = []
-            # car_state = []
-            discharge_stats = [0]
-            # Gets transportation stats
-            transportation_devices_stats = open_sql(
-                FILEPATH["electric_vehicle"][0], "TransportationDeviceStates"
+            self.car_in_charging_station = car_in_charging_station.tolist()
+            self.discharge = discharge_stats.tolist()
+            utils.save_cache(
+                cache_filepath,
+                {
+                    "CarInChargingStation": car_in_charging_station,
+                    "Discharge": discharge_stats,
+                },
             )
-            for _, column in transportation_devices_stats.iterrows():
-                if datetime.datetime.strptime(
-                    column["DateTime"], "%d/%m/%Y %H:%M"
-                ) > datetime.datetime.strptime("31/12/2018 23:59", "%d/%m/%Y %H:%M"):
-                    if (
-                        "ParkingAndFullyCharged" in column["DeviceState"]
-                        or "ParkingAndCharging" in column["DeviceState"]
-                    ):
-                        car_in_charging_station.append(True)
-                    else:
-                        car_in_charging_station.append(False)
-                    load_stats.append(float(column["CurrentRange"]))
-                    soc.append(
-                        float(column["CurrentRange"]) / battery_stored_energy_meters
-                    )
-                    if len(load_stats) > 1:
-                        diff = load_stats[-1] - load_stats[-2]
-                        if diff < 0:
-                            discharge_stats.append(diff / convert_factor_meters_by_wh)
-                        else:
-                            discharge_stats.append(0)
-
-            # discharge = []
-            # load = []
-            # for index, row in ev_pd.iterrows():
-            #    load.append(row["Soc"] * battery_stored_energy_wh)
-            #    if index == 0:
-            #        discharge.append(0)
-            #    else:
-            #        diff = load[-1] - load[-2]
-            #        if diff < 0:
-            #            discharge.append(diff)
-            #        else:
-            #            discharge.append(0)
-
-            # ev_pd["Discharge"] = discharge
-            # data = [ev_pd["CarLocation"].tolist()]
-            # data.append(discharge)
-            # data.append(car_state)
-            # data_parameters = ["CarLocation", "Discharging","CarInChargingStation","RealDischarge","CarState"]
-
-            data: List = []
-            data.append(car_in_charging_station)
-            data.append(discharge_stats)
-            data = list(map(list, zip(*data)))
-
-            data_parameters = ["CarInChargingStation", "Discharge"]
-            database = pd.DataFrame(data, columns=data_parameters)
-
-            self.car_in_charging_station = car_in_charging_station
-            self.discharge = discharge_stats
-            database.to_csv(cache_filepath)
-            # utils.save_cache("Vehicle", [self.evconfig.profile_name], database)
 
     def i_save_state(self) -> None:
         pass
@@ -4,7 +4,7 @@ import math
 import os
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import Any, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -42,6 +42,20 @@ https://github.com/FZJ-IEK3-VSA/tsib
 """
 
 
+@lru_cache(maxsize=1)
+def get_module_and_inverter_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Reads the module and inverter data once per process. The data frames are shared, so they must not be changed."""
+    modules = pd.read_csv(
+        os.path.join(utils.HISIMPATH["photovoltaic"]["modules"]),
+        index_col=0,
+    )
+    inverters = pd.read_csv(
+        os.path.join(utils.HISIMPATH["photovoltaic"]["inverters"]),
+        index_col=0,
+    )
+    return modules, inverters
+
+
 def simPhotovoltaicFast(
     temperature_model: Any,
     dni_extra: Any,
@@ -100,6 +114,54 @@ def simPhotovoltaicFast(
     return pv_dc
 
 
+def simPhotovoltaicFastForAllTimesteps(
+    temperature_model: Any,
+    dni_extra: np.ndarray,
+    DNI: np.ndarray,
+    DHI: np.ndarray,
+    GHI: np.ndarray,
+    azimuth: np.ndarray,
+    apparent_zenith: np.ndarray,
+    temperature: np.ndarray,
+    wind_speed: np.ndarray,
+    surface_azimuth: float,
+    surface_tilt: float,
+) -> np.ndarray:
+    """
+    Same model as simPhotovoltaicFast, but for whole weather series at once.
+
+    The pvlib functions work on arrays, so the PV output of all timesteps gets calculated in a single call
+    instead of calling simPhotovoltaicFast once per timestep.
+    """
+
+    poa_irrad = pvlib.irradiance.get_total_irradiance(
+        surface_tilt,
+        surface_azimuth,
+        apparent_zenith,
+        azimuth,
+        DNI,
+        GHI,
+        DHI,
+        dni_extra,
+    )
+
+    pvtemps = pvlib.temperature.sapm_cell(
+        poa_irrad["poa_global"], temperature, wind_speed, **temperature_model
+    )
+
+    pv_dc = np.asarray(
+        pvlib.pvsystem.pvwatts_dc(
+            poa_irrad["poa_global"],
+            temp_cell=pvtemps,
+            pdc0=1,
+            gamma_pdc=-0.002,
+            temp_ref=25.0,
+        ),
+        dtype=np.float64,
+    )
+    return np.where(np.isnan(pv_dc), 0.0, pv_dc)
+
+
 def simPhotovoltaicSimple(
     temperature_model,
     dni_extra=None,
@@ -617,9 +679,7 @@ class PVSystem(cp.Component):
             stsv.set_output_value(self.electricity_outputC, resultingvalue)
             self.data[timestep] = ac_power
             if timestep + 1 == self.data_length:
-                database = pd.DataFrame(self.data, columns=["output"])
-
-                database.to_csv(self.cache_filepath, sep=",", decimal=".", index=False)
+                utils.save_cache(self.cache_filepath, {"output": self.data})
 
         if (
             self.my_simulation_parameters.predictive_control
@@ -678,6 +738,12 @@ class PVSystem(cp.Component):
     def i_doublecheck(self, timestep: int, stsv: cp.SingleTimeStepValues) -> None:
         pass
 
+    def i_get_exogenous_timeseries(self) -> Optional[Dict[cp.ComponentOutput, np.ndarray]]:
+        """Returns the cached PV output. Without the cache or with predictive control the PV needs to be simulated."""
+        if not hasattr(self, "output") or self.my_simulation_parameters.predictive_control:
+            return None
+        return {self.electricity_outputC: np.array(self.output, dtype=np.float64) * self.pvconfig.power}
+
     def i_prepare_simulation(self) -> None:
         """Prepares the component for the simulation"""
         log.information(self.pvconfig.to_json())  # type: ignore
@@ -686,9 +752,7 @@ class PVSystem(cp.Component):
         )
 
         if file_exists:
-            self.output = pd.read_csv(self.cache_filepath, sep=",", decimal=".")[
-                "output"
-            ].tolist()
+            self.output = utils.load_cache(self.cache_filepath)["output"].tolist()
             if len(self.output) != self.my_simulation_parameters.timesteps:
                 raise Exception(
                     "Reading the cached PV values seems to have failed. Expected "
@@ -701,71 +765,42 @@ class PVSystem(cp.Component):
             # Factor to guarantee peak power based on module with 250 Wh
             self.ac_power_factor = math.ceil((self.pvconfig.power * 1e3) / 250)
 
-            # when predictive control is activated, the PV simulation is run beforhand to make forecasting easier
-            if self.my_simulation_parameters.predictive_control:
-                # get yearly weather data from dictionary
-                dni_extra = self.simulation_repository.get_entry(
-                    Weather.Weather_DirectNormalIrradianceExtra_yearly_forecast
-                )
-                DNI = self.simulation_repository.get_entry(
-                    Weather.Weather_DirectNormalIrradiance_yearly_forecast
-                )
-                DHI = self.simulation_repository.get_entry(
-                    Weather.Weather_DiffuseHorizontalIrradiance_yearly_forecast
-                )
-                GHI = self.simulation_repository.get_entry(
-                    Weather.Weather_GlobalHorizontalIrradiance_yearly_forecast
-                )
-                azimuth = self.simulation_repository.get_entry(
-                    Weather.Weather_Azimuth_yearly_forecast
-                )
-                apparent_zenith = self.simulation_repository.get_entry(
-                    Weather.Weather_ApparentZenith_yearly_forecast
-                )
-                temperature = self.simulation_repository.get_entry(
-                    Weather.Weather_TemperatureOutside_yearly_forecast
-                )
-                wind_speed = self.simulation_repository.get_entry(
-                    Weather.Weather_WindSpeed_yearly_forecast
-                )
-
-                x = []
-                for i in range(self.my_simulation_parameters.timesteps):
-                    x.append(
-                        simPhotovoltaicFast(
-                            temperature_model=self.temp_model,
-                            dni_extra=dni_extra[i],
-                            DNI=DNI[i],
-                            DHI=DHI[i],
-                            GHI=GHI[i],
-                            azimuth=azimuth[i],
-                            apparent_zenith=apparent_zenith[i],
-                            temperature=temperature[i],
-                            wind_speed=wind_speed[i],
-                            surface_azimuth=self.pvconfig.azimuth,
-                            surface_tilt=self.pvconfig.tilt,
-                        )
+            # the PV simulation is run beforehand for all timesteps at once, if the weather provides its yearly series.
+            # This also makes forecasting for predictive control easier.
+            if self.simulation_repository.exist_entry(
+                Weather.Weather_DirectNormalIrradiance_yearly_forecast
+            ):
+                timesteps = self.my_simulation_parameters.timesteps
+                weather_series = {
+                    argument_name: np.array(
+                        self.simulation_repository.get_entry(entry_name)[:timesteps],
+                        dtype=np.float64,
                     )
-
-                self.output = x
-
-                database = pd.DataFrame(self.output, columns=["output"])
-
-                database.to_csv(self.cache_filepath, sep=",", decimal=".", index=False)
+                    for argument_name, entry_name in [
+                        ("dni_extra", Weather.Weather_DirectNormalIrradianceExtra_yearly_forecast),
+                        ("DNI", Weather.Weather_DirectNormalIrradiance_yearly_forecast),
+                        ("DHI", Weather.Weather_DiffuseHorizontalIrradiance_yearly_forecast),
+                        ("GHI", Weather.Weather_GlobalHorizontalIrradiance_yearly_forecast),
+                        ("azimuth", Weather.Weather_Azimuth_yearly_forecast),
+                        ("apparent_zenith", Weather.Weather_ApparentZenith_yearly_forecast),
+                        ("temperature", Weather.Weather_TemperatureOutside_yearly_forecast),
+                        ("wind_speed", Weather.Weather_WindSpeed_yearly_forecast),
+                    ]
+                }
+                self.output = simPhotovoltaicFastForAllTimesteps(
+                    temperature_model=self.temp_model,
+                    surface_azimuth=self.pvconfig.azimuth,
+                    surface_tilt=self.pvconfig.tilt,
+                    **weather_series,
+                ).tolist()
+
+                utils.save_cache(self.cache_filepath, {"output": self.output})
 
             else:
                 self.data = [0] * self.my_simulation_parameters.timesteps
                 self.data_length = self.my_simulation_parameters.timesteps
 
-        self.modules = pd.read_csv(
-            os.path.join(utils.HISIMPATH["photovoltaic"]["modules"]),
-            index_col=0,
-        )
-
-        self.inverters = pd.read_csv(
-            os.path.join(utils.HISIMPATH["photovoltaic"]["inverters"]),
-            index_col=0,
-        )
+        self.modules, self.inverters = get_module_and_inverter_data()
 
         self.temp_model = pvlib.temperature.TEMPERATURE_MODEL_PARAMETERS["sapm"][
             "open_rack_glass_glass"
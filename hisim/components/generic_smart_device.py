@@ -4,9 +4,7 @@ The device is activated at the end of the time window when no surplus was availa
 the configuration is automatically adopted from the information provided by the LPG. """
 
 # Generic/Built-in
-import json
 import math as ma
-from os import path
 from typing import List, Tuple
 
 import pandas as pd
@@ -16,7 +14,7 @@ from dataclasses_json import dataclass_json
 # Owned
 from hisim import component as cp
 from hisim import loadtypes as lt
-from hisim import utils
+from hisim import lpg_result_store, utils
 from hisim.simulationparameters import SimulationParameters
 from hisim.component import OpexCostDataClass
 
@@ -253,13 +251,10 @@ class SmartDevice(cp.Component):
         :raises TypeError: _description_
         """
 
-        # load smart device profile
-        smart_device_profile = []
-        filepath = path.join(
-            utils.HISIMPATH["utsp_reports"], "FlexibilityEvents.HH1.json"
+        # load smart device profile, the flexibility events get parsed once for all smart devices
+        smart_device_profile = (
+            lpg_result_store.get_lpg_result_store().get_flexibility_events_by_device()
         )
-        with open(filepath, encoding="utf-8") as f:
-            smart_device_profile = json.load(f)
 
         if not smart_device_profile:
             raise NameError(
@@ -278,56 +273,52 @@ class SmartDevice(cp.Component):
         minutes_per_timestep = int(minutes_per_timestep)
 
         # reading in data from json file and adopting to given time resolution
-        for sample in smart_device_profile:
-            device_name = str(sample["Device"]["Name"])
-            if device_name == identifier:
-                # earliest start in given time resolution -> integer value
-                x = sample["EarliestStart"]["ExternalStep"]
-                # skip if occurs in calibration days (negative sign )
-                if x < 0:
-                    continue
-                # timestep (in minutes) the profile is shifted in the first step of the external time resolution
-                offset = minutes_per_timestep - x % minutes_per_timestep
-                # earliest start in given time resolution -> float value
-                x = x / minutes_per_timestep
-                # latest start in given time resolution
-                y = sample["LatestStart"]["ExternalStep"] / minutes_per_timestep
-                # number of timesteps in given time resolution -> integer value
-                z = ma.ceil(
-                    x + sample["TotalDuration"] / minutes_per_timestep
-                ) - ma.floor(x)
-                # earliest and latest start in new time resolution -> integer value
-                earliest_start.append(ma.floor(x))
-                latest_start.append(ma.ceil(y))
-
-                # get shiftable load profile
-                el = (
-                    sample["Profiles"][2]["TimeOffsetInSteps"] * [0]
-                    + sample["Profiles"][2]["Values"]
-                )
+        for sample in smart_device_profile.get(identifier, []):
+            # earliest start in given time resolution -> integer value
+            x = sample["EarliestStart"]["ExternalStep"]
+            # skip if occurs in calibration days (negative sign )
+            if x < 0:
+                continue
+            # timestep (in minutes) the profile is shifted in the first step of the external time resolution
+            offset = minutes_per_timestep - x % minutes_per_timestep
+            # earliest start in given time resolution -> float value
+            x = x / minutes_per_timestep
+            # latest start in given time resolution
+            y = sample["LatestStart"]["ExternalStep"] / minutes_per_timestep
+            # number of timesteps in given time resolution -> integer value
+            z = ma.ceil(x + sample["TotalDuration"] / minutes_per_timestep) - ma.floor(x)
+            # earliest and latest start in new time resolution -> integer value
+            earliest_start.append(ma.floor(x))
+            latest_start.append(ma.ceil(y))
+
+            # get shiftable load profile
+            el = (
+                sample["Profiles"][2]["TimeOffsetInSteps"] * [0]
+                + sample["Profiles"][2]["Values"]
+            )
 
-                # average profiles given in 1 minute resolution to given time resolution
-                elem_el = []
-                # append first timestep which may not fill  the entire 15 minutes
-                elem_el.append(sum(el[:offset]) / offset)
-
-                i = 0
-                for i in range(z - 2):
-                    elem_el.append(
-                        sum(
-                            el[
-                                offset
-                                + minutes_per_timestep * i : offset
-                                + (i + 1) * minutes_per_timestep
-                            ]
-                        )
-                        / minutes_per_timestep
+            # average profiles given in 1 minute resolution to given time resolution
+            elem_el = []
+            # append first timestep which may not fill  the entire 15 minutes
+            elem_el.append(sum(el[:offset]) / offset)
+
+            i = 0
+            for i in range(z - 2):
+                elem_el.append(
+                    sum(
+                        el[
+                            offset
+                            + minutes_per_timestep * i : offset
+                            + (i + 1) * minutes_per_timestep
+                        ]
                     )
+                    / minutes_per_timestep
+                )
 
-                last = el[offset + (i + 1) * minutes_per_timestep :]
-                if offset != minutes_per_timestep:
-                    elem_el.append(sum(last) / (minutes_per_timestep - offset))
-                electricity_profile.append(elem_el)
+            last = el[offset + (i + 1) * minutes_per_timestep :]
+            if offset != minutes_per_timestep:
+                elem_el.append(sum(last) / (minutes_per_timestep - offset))
+            electricity_profile.append(elem_el)
 
         self.source_weight = source_weight
         earliest_start = earliest_start + [
@@ -1,13 +1,11 @@
 """LoadProfile Generator Connector Module."""
 
 # Generic/Built-in
-import json
-from typing import Any, Tuple
+from typing import Any, Dict, Optional, Tuple
 from os import path, makedirs
 from dataclasses import dataclass
 from dataclasses_json import dataclass_json
 import pandas as pd
-import datetime as dt
 import numpy as np
 
 # Owned
@@ -15,6 +13,7 @@ from hisim import component as cp
 from hisim import loadtypes as lt
 from hisim import utils
 from hisim import log
+from hisim import lpg_result_store
 from hisim.simulationparameters import SimulationParameters
 
 __authors__ = "Vitor Hugo Bellotto Zago"
@@ -261,6 +260,37 @@ class Occupancy(cp.Component):
     def i_doublecheck(self, timestep: int, stsv: cp.SingleTimeStepValues) -> None:
         pass
 
+    def i_get_exogenous_timeseries(
+        self,
+    ) -> Optional[Dict[cp.ComponentOutput, np.ndarray]]:
+        """Returns the scaled profiles, unless the demand forecast needs to be published in every timestep."""
+        if self.my_simulation_parameters.predictive_control:
+            return None
+        timesteps = self.my_simulation_parameters.timesteps
+        scaling_factor = self.scaling_factor_according_to_number_of_apartments
+        return {
+            self.number_of_residentsC: np.asarray(
+                self.number_of_residents[:timesteps], dtype=np.float64
+            )
+            * scaling_factor,
+            self.heating_by_residentsC: np.asarray(
+                self.heating_by_residents[:timesteps], dtype=np.float64
+            )
+            * scaling_factor,
+            self.heating_by_devices_channel: np.asarray(
+                self.heating_by_devices[:timesteps], dtype=np.float64
+            )
+            * scaling_factor,
+            self.electricity_outputC: np.asarray(
+                self.electricity_consumption[:timesteps], dtype=np.float64
+            )
+            * scaling_factor,
+            self.water_consumptionC: np.asarray(
+                self.water_consumption[:timesteps], dtype=np.float64
+            )
+            * scaling_factor,
+        }
+
     def i_simulate(
         self, timestep: int, stsv: cp.SingleTimeStepValues, force_convergence: bool
     ) -> None:
@@ -391,9 +421,7 @@ class Occupancy(cp.Component):
                 makedirs(utils.HISIMPATH[tag])
 
         if file_exists:
-            dataframe = pd.read_csv(
-                cache_filepath, sep=",", decimal=".", encoding="cp1252"
-            )
+            dataframe = utils.load_cache(cache_filepath)
             self.number_of_residents = dataframe["number_of_residents"].tolist()
             self.heating_by_residents = dataframe["heating_by_residents"].tolist()
             self.heating_by_devices = dataframe["heating_by_devices"].tolist()
@@ -403,24 +431,18 @@ class Occupancy(cp.Component):
         else:
             ################################
             # Calculates heating generated by residents and loads number of residents
-            # Heat power generated per resident in W
-            # mode 1: awake
-            # mode 2: sleeping
-            gain_per_person = [150, 100]
-
             (
                 scaling_electricity_consumption,
                 scaling_water_consumption,
             ) = self.occupancy_config.get_factors_from_country_and_profile()
             # load occupancy profile
-            occupancy_profile = []
-            filepaths = utils.HISIMPATH["occupancy"][self.profile_name][
-                "number_of_residents"
+            lpg_results = lpg_result_store.get_lpg_result_store()
+            bodily_activity_values = [
+                lpg_results.load_values(filepath)
+                for filepath in utils.HISIMPATH["occupancy"][self.profile_name][
+                    "number_of_residents"
+                ]
             ]
-            for filepath in filepaths:
-                with open(filepath, encoding="utf-8") as json_file:
-                    json_filex = json.load(json_file)
-                occupancy_profile.append(json_filex)
 
             # see how long csv files from LPG are to check if averaging has to be done and calculate desired length
             simulation_time_span = (
@@ -437,20 +459,13 @@ class Occupancy(cp.Component):
             )
             steps_desired_in_minutes = steps_desired * minutes_per_timestep
 
-            # initialize number of residence and heating by residents
-            heating_by_residents = [0] * steps_desired_in_minutes
-            number_of_residents = [0] * steps_desired_in_minutes
-
             # compute heat gains and number of persons
-            for mode, gain in enumerate(gain_per_person):
-                for timestep in range(steps_desired_in_minutes):
-                    number_of_residents[timestep] += occupancy_profile[mode]["Values"][
-                        timestep
-                    ]
-                    heating_by_residents[timestep] = (
-                        heating_by_residents[timestep]
-                        + gain * occupancy_profile[mode]["Values"][timestep]
-                    )
+            (
+                number_of_residents,
+                heating_by_residents,
+            ) = lpg_result_store.compute_residents_and_heating_by_residents(
+                bodily_activity_values, steps_desired_in_minutes
+            )
 
             if self.occupancy_config.profile_with_washing_machine_and_dishwasher:
                 profile_path = utils.HISIMPATH["occupancy"][self.profile_name][
@@ -498,81 +513,36 @@ class Occupancy(cp.Component):
                 pre_heating_by_devices.loc[:, "Sum [kWh]"] * 1000 * 60
             ).tolist()  # 1 kWh/min == 60W / min
 
-            # convert heat gains and number of persons to data frame and evaluate
-            initial_data = pd.DataFrame(
-                {
-                    "Time": pd.date_range(
-                        start=dt.datetime(
-                            year=self.my_simulation_parameters.year, month=1, day=1
-                        ),
-                        end=dt.datetime(
-                            year=self.my_simulation_parameters.year, month=1, day=1
-                        )
-                        + dt.timedelta(days=simulation_time_span.days)
-                        - dt.timedelta(seconds=60),
-                        freq="T",
-                    ),
+            # convert everything to utc and to the time resolution of the simulation
+            profiles = lpg_result_store.convert_occupancy_profiles_to_simulation_time(
+                profiles={
                     "number_of_residents": number_of_residents,
                     "heating_by_residents": heating_by_residents,
                     "electricity_consumption": electricity_consumption,
                     "water_consumption": water_consumption,
                     "heating_by_devices": heating_by_devices,
-                }
-            )
-            initial_data = utils.convert_lpg_data_to_utc(
-                data=initial_data, year=self.my_simulation_parameters.year
+                },
+                year=self.my_simulation_parameters.year,
+                minutes_per_timestep=minutes_per_timestep,
+                summed_profiles=["water_consumption"],
             )
-
-            # extract everything from data frame
-            self.electricity_consumption = initial_data[
-                "electricity_consumption"
-            ].tolist()
-            self.heating_by_residents = initial_data["heating_by_residents"].tolist()
-            self.number_of_residents = initial_data["number_of_residents"].tolist()
-            self.water_consumption = initial_data["water_consumption"].tolist()
-            self.heating_by_devices = initial_data["heating_by_devices"].tolist()
-
-            # average data, when time resolution of inputs is coarser than time resolution of simulation
-            if minutes_per_timestep > 1:
-                # power needs averaging, not sum
-                self.electricity_consumption = [
-                    sum(self.electricity_consumption[n : n + minutes_per_timestep])
-                    / minutes_per_timestep
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
-                self.heating_by_devices = [
-                    sum(self.heating_by_devices[n : n + minutes_per_timestep])
-                    / minutes_per_timestep
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
-                self.water_consumption = [
-                    sum(self.water_consumption[n : n + minutes_per_timestep])
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
-                self.heating_by_residents = [
-                    sum(self.heating_by_residents[n : n + minutes_per_timestep])
-                    / minutes_per_timestep
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
-                self.number_of_residents = [
-                    sum(self.number_of_residents[n : n + minutes_per_timestep])
-                    / minutes_per_timestep
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
+            self.electricity_consumption = profiles["electricity_consumption"].tolist()
+            self.heating_by_residents = profiles["heating_by_residents"].tolist()
+            self.number_of_residents = profiles["number_of_residents"].tolist()
+            self.water_consumption = profiles["water_consumption"].tolist()
+            self.heating_by_devices = profiles["heating_by_devices"].tolist()
 
             # Saves data in cache
-            database = pd.DataFrame(
+            utils.save_cache(
+                cache_filepath,
                 {
                     "number_of_residents": self.number_of_residents,
                     "heating_by_residents": self.heating_by_residents,
                     "electricity_consumption": self.electricity_consumption,
                     "water_consumption": self.water_consumption,
                     "heating_by_devices": self.heating_by_devices,
-                }
+                },
             )
-
-            database.to_csv(cache_filepath)
-            del database  # utils.save_cache("Occupancy", parameters, database)
         self.max_hot_water_demand = max(self.water_consumption)
 
     def write_to_report(self):
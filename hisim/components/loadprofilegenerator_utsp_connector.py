@@ -27,7 +27,7 @@ from utspclient.helpers.lpgpythonbindings import CalcOption, JsonReference
 # Owned
 from hisim import component as cp
 from hisim import loadtypes as lt
-from hisim import log, utils
+from hisim import log, lpg_result_store, utils
 from hisim.components.configuration import HouseholdWarmWaterDemandConfig, PhysicsConfig
 from hisim.simulationparameters import SimulationParameters
 from hisim.component import OpexCostDataClass
@@ -440,9 +440,7 @@ class UtspLpgConnector(cp.Component):
         )
         cache_complete = False
         if file_exists:
-            with open(cache_filepath, "r", encoding="utf-8") as file:
-                cache_content: Dict = json.load(file)
-            saved_files = cache_content["saved_files"]
+            saved_files = utils.load_cache_metadata(cache_filepath)["saved_files"]
             cache_complete = True
             # check if all of the additionally saved files that belong to the cached results
             # are also still there
@@ -456,10 +454,7 @@ class UtspLpgConnector(cp.Component):
                     cache_complete = False
                     break
             if cache_complete:
-                cached_data = io.StringIO(cache_content["data"])
-                dataframe = pd.read_csv(
-                    cached_data, sep=",", decimal=".", encoding="cp1252"
-                )
+                dataframe = utils.load_cache(cache_filepath)
                 self.number_of_residents = dataframe["number_of_residents"].tolist()
                 self.heating_by_residents = dataframe["heating_by_residents"].tolist()
                 self.electricity_consumption = dataframe[
@@ -480,18 +475,11 @@ class UtspLpgConnector(cp.Component):
 
             ################################
             # Calculates heating generated by residents and loads number of residents
-            # Heat power generated per resident in W
-            # mode 1: awake
-            # mode 2: sleeping
-            gain_per_person = [150, 100]
-
             # load occupancy profile
-            occupancy_profile = []
-            bodily_activity_files = [high_activity, low_activity]
-            for filecontent in bodily_activity_files:
-                json_filex = json.loads(filecontent)
-
-                occupancy_profile.append(json_filex)
+            bodily_activity_values = [
+                np.asarray(json.loads(filecontent)["Values"])
+                for filecontent in [high_activity, low_activity]
+            ]
 
             # see how long csv files from LPG are to check if averaging has to be done and calculate desired length
             simulation_time_span = (
@@ -508,20 +496,13 @@ class UtspLpgConnector(cp.Component):
             )
             steps_desired_in_minutes = steps_desired * minutes_per_timestep
 
-            # initialize number of residence and heating by residents
-            heating_by_residents = [0] * steps_desired_in_minutes
-            number_of_residents = [0] * steps_desired_in_minutes
-
             # compute heat gains and number of persons
-            for mode, gain in enumerate(gain_per_person):
-                for timestep in range(steps_desired_in_minutes):
-                    number_of_residents[timestep] += occupancy_profile[mode]["Values"][
-                        timestep
-                    ]
-                    heating_by_residents[timestep] = (
-                        heating_by_residents[timestep]
-                        + gain * occupancy_profile[mode]["Values"][timestep]
-                    )
+            (
+                number_of_residents,
+                heating_by_residents,
+            ) = lpg_result_store.compute_residents_and_heating_by_residents(
+                bodily_activity_values, steps_desired_in_minutes
+            )
 
             # load electricity consumption, water consumption and inner device heat gains
             electricity_data = io.StringIO(electricity)
@@ -557,89 +538,37 @@ class UtspLpgConnector(cp.Component):
                 pre_inner_device_heat_gains["Sum [kWh]"] * 1000 * 60
             ).tolist()  # 1 kWh/min == 60W / min
 
-            # put everything in a data frame and convert to utc
-            initial_data = pd.DataFrame(
-                {
-                    "Time": pd.date_range(
-                        start=datetime.datetime(
-                            year=self.my_simulation_parameters.year, month=1, day=1
-                        ),
-                        end=datetime.datetime(
-                            year=self.my_simulation_parameters.year, month=1, day=1
-                        )
-                        + datetime.timedelta(days=simulation_time_span.days)
-                        - datetime.timedelta(seconds=60),
-                        freq="T",
-                    )
-                }
+            # convert everything to utc and to the time resolution of the simulation
+            profiles = lpg_result_store.convert_occupancy_profiles_to_simulation_time(
+                profiles={
+                    "number_of_residents": number_of_residents,
+                    "heating_by_residents": heating_by_residents,
+                    "electricity_consumption": electricity_consumption_list,
+                    "water_consumption": water_consumption_list,
+                    "heating_by_devices": inner_device_heat_gains_list,
+                },
+                year=self.my_simulation_parameters.year,
+                minutes_per_timestep=minutes_per_timestep,
+                summed_profiles=["water_consumption"],
             )
-
-            initial_data["number_of_residents"] = number_of_residents
-            initial_data["heating_by_residents"] = heating_by_residents
-            initial_data["electricity_consumption"] = electricity_consumption_list
-            initial_data["water_consumption"] = water_consumption_list
-            initial_data["inner_device_heat_gains"] = inner_device_heat_gains_list
-
-            initial_data = utils.convert_lpg_data_to_utc(
-                data=initial_data, year=self.my_simulation_parameters.year
-            )
-
-            # extract everything from data frame
-            self.electricity_consumption = initial_data[
-                "electricity_consumption"
-            ].tolist()
-            self.heating_by_residents = initial_data["heating_by_residents"].tolist()
-            self.number_of_residents = initial_data["number_of_residents"].tolist()
-            self.water_consumption = initial_data["water_consumption"].tolist()
-            self.heating_by_devices = initial_data["inner_device_heat_gains"].tolist()
-
-            # average data, when time resolution of inputs is coarser than time resolution of simulation
-            if minutes_per_timestep > 1:
-                # power needs averaging, not sum
-                self.electricity_consumption = [
-                    sum(self.electricity_consumption[n : n + minutes_per_timestep])
-                    / minutes_per_timestep
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
-                self.heating_by_devices = [
-                    sum(self.heating_by_devices[n : n + minutes_per_timestep])
-                    / minutes_per_timestep
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
-                self.water_consumption = [
-                    sum(self.water_consumption[n : n + minutes_per_timestep])
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
-                self.heating_by_residents = [
-                    sum(self.heating_by_residents[n : n + minutes_per_timestep])
-                    / minutes_per_timestep
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
-                self.number_of_residents = [
-                    sum(self.number_of_residents[n : n + minutes_per_timestep])
-                    / minutes_per_timestep
-                    for n in range(0, steps_desired_in_minutes, minutes_per_timestep)
-                ]
-
-            # Saves data in cache
-            database = pd.DataFrame(
+            self.electricity_consumption = profiles["electricity_consumption"].tolist()
+            self.heating_by_residents = profiles["heating_by_residents"].tolist()
+            self.number_of_residents = profiles["number_of_residents"].tolist()
+            self.water_consumption = profiles["water_consumption"].tolist()
+            self.heating_by_devices = profiles["heating_by_devices"].tolist()
+
+            # save the data and the list of additional files in the cache
+            utils.save_cache(
+                cache_filepath,
                 {
                     "number_of_residents": self.number_of_residents,
                     "heating_by_residents": self.heating_by_residents,
                     "electricity_consumption": self.electricity_consumption,
                     "water_consumption": self.water_consumption,
                     "heating_by_devices": self.heating_by_devices,
-                }
+                },
+                metadata={"saved_files": saved_files},
             )
-            # dump the dataframe to str
-            cache_file = io.StringIO()
-            database.to_csv(cache_file)
-            database_str = cache_file.getvalue()
-            # save the dataframe and the list of additional files in the cache
-            cache_content = {"saved_files": saved_files, "data": database_str}
-            with open(cache_filepath, "w", encoding="utf-8") as file:
-                json.dump(cache_content, file)
-            del database
         self.max_hot_water_demand = max(self.water_consumption)
 
     def write_to_report(self):
@@ -2,20 +2,24 @@
 
 import csv
 import datetime
+import hashlib
+import json
 import math
 import os
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, List
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import pvlib
 
+from hisim import cache_backend
 from hisim import loadtypes as lt
 from hisim import log, utils
 from hisim.component import Component, ComponentOutput, ConfigBase, SingleTimeStepValues
-from hisim.simulationparameters import SimulationParameters
+from hisim.simulationparameters import CacheFormat, SimulationParameters
 from hisim.sim_repository_singleton import SingletonSimRepository, SingletonDictKeyEnum
 
 __authors__ = "Vitor Hugo Bellotto Zago, Noah Pflugradt"
@@ -608,6 +612,26 @@ class Weather(Component):
             )
         self.last_timestep_with_update = timestep
 
+    def i_get_exogenous_timeseries(self) -> Optional[Dict[ComponentOutput, np.ndarray]]:
+        """Returns the weather series, unless the temperature forecast needs to be published in every timestep."""
+        if self.my_simulation_parameters.predictive_control:
+            return None
+        timesteps = self.my_simulation_parameters.timesteps
+        return {
+            self.air_temperature_output: np.array(self.temperature_list[:timesteps], dtype=np.float64),
+            self.DNI_output: np.array(self.DNI_list[:timesteps], dtype=np.float64),
+            self.DNI_extra_output: np.array(self.DNIextra_list[:timesteps], dtype=np.float64),
+            self.DHI_output: np.array(self.DHI_list[:timesteps], dtype=np.float64),
+            self.GHI_output: np.array(self.GHI_list[:timesteps], dtype=np.float64),
+            self.altitude_output: np.array(self.altitude_list[:timesteps], dtype=np.float64),
+            self.azimuth_output: np.array(self.azimuth_list[:timesteps], dtype=np.float64),
+            self.wind_speed_output: np.array(self.wind_speed_list[:timesteps], dtype=np.float64),
+            self.apparent_zenith_output: np.array(self.apparent_zenith_list[:timesteps], dtype=np.float64),
+            self.daily_average_outside_temperature_output: np.array(
+                self.daily_average_outside_temperature_list_in_celsius[:timesteps], dtype=np.float64
+            ),
+        }
+
     def i_prepare_simulation(self) -> None:
         """Generates the lists to be used later."""
         seconds_per_timestep = self.my_simulation_parameters.seconds_per_timestep
@@ -623,9 +647,7 @@ class Weather(Component):
         )
         if cachefound:
             # read cached files
-            my_weather = pd.read_csv(
-                cache_filepath, sep=",", decimal=".", encoding="cp1252"
-            )
+            my_weather = utils.load_cache(cache_filepath)
             self.temperature_list = my_weather["t_out"].tolist()
             self.daily_average_outside_temperature_list_in_celsius = my_weather[
                 "t_out_daily_average"
@@ -642,195 +664,81 @@ class Weather(Component):
             self.apparent_zenith_list = my_weather["apparent_zenith"].tolist()
             self.wind_speed_list = my_weather["Wspd"].tolist()
         else:
-            tmy_data = read_test_reference_year_data(
-                weatherconfig=self.weather_config,
-                year=self.my_simulation_parameters.year,
+            weather_index, weather_data = get_preprocessed_weather_data(
+                self.weather_config.source_path,
+                self.weather_config.data_source,
+                self.my_simulation_parameters.year,
             )
-            if self.weather_config.data_source == WeatherDataSourceEnum.NSRDB_15min:
-                DNI = (
-                    tmy_data["DNI"].resample("1T").asfreq().interpolate(method="linear")
-                )
-                temperature = (
-                    tmy_data["T"].resample("1T").asfreq().interpolate(method="linear")
-                )
-                DHI = (
-                    tmy_data["DHI"].resample("1T").asfreq().interpolate(method="linear")
-                )
-                GHI = (
-                    tmy_data["GHI"].resample("1T").asfreq().interpolate(method="linear")
-                )
-                wind_speed = (
-                    tmy_data["Wspd"]
-                    .resample("1T")
-                    .asfreq()
-                    .interpolate(method="linear")
-                )
-            else:
-                DNI = self.interpolate(
-                    tmy_data["DNI"], self.my_simulation_parameters.year
-                )
-                temperature = self.interpolate(
-                    tmy_data["T"], self.my_simulation_parameters.year
-                )
-                DHI = self.interpolate(
-                    tmy_data["DHI"], self.my_simulation_parameters.year
-                )
-                GHI = self.interpolate(
-                    tmy_data["GHI"], self.my_simulation_parameters.year
-                )
-                wind_speed = self.interpolate(
-                    tmy_data["Wspd"], self.my_simulation_parameters.year
-                )
-            # calculate extra terrestrial radiation- n eeded for perez array diffuse irradiance models
-            dni_extra = pd.Series(pvlib.irradiance.get_extra_radiation(DNI.index), index=DNI.index)  # type: ignore
-
-            solpos = pvlib.solarposition.get_solarposition(DNI.index, location_dict["latitude"], location_dict["longitude"])  # type: ignore
-            altitude = solpos["elevation"]
-            azimuth = solpos["azimuth"]
-            apparent_zenith = solpos["apparent_zenith"]
-
             if seconds_per_timestep != 60:
-                self.temperature_list = (
-                    temperature.resample(str(seconds_per_timestep) + "S")
-                    .mean()
-                    .tolist()
-                )
-                self.dry_bulb_list = (
-                    temperature.resample(str(seconds_per_timestep) + "S")
-                    .mean()
-                    .to_list()
-                )
-                self.calculate_daily_average_outside_temperature(
-                    temperaturelist=self.temperature_list,
-                    seconds_per_timestep=seconds_per_timestep,
-                )
-
-                self.DHI_list = (
-                    DHI.resample(str(seconds_per_timestep) + "S").mean().tolist()
-                )
-                # np.float64( ## not sure what this is fore. python float and npfloat 64 are the same.
-                self.DNI_list = (
-                    DNI.resample(str(seconds_per_timestep) + "S").mean().tolist()
-                )  # )  # type: ignore
-                self.DNIextra_list = (
-                    dni_extra.resample(str(seconds_per_timestep) + "S").mean().tolist()
-                )
-                self.GHI_list = (
-                    GHI.resample(str(seconds_per_timestep) + "S").mean().tolist()
-                )
-                self.altitude_list = (
-                    altitude.resample(str(seconds_per_timestep) + "S").mean().tolist()
-                )
-                self.azimuth_list = (
-                    azimuth.resample(str(seconds_per_timestep) + "S").mean().tolist()
-                )
-                self.apparent_zenith_list = (
-                    apparent_zenith.resample(str(seconds_per_timestep) + "S")
+                # all variables get resampled at once
+                resampled_weather_data = (
+                    pd.DataFrame(weather_data, index=weather_index)
+                    .resample(str(seconds_per_timestep) + "S")
                     .mean()
-                    .tolist()
-                )
-                self.wind_speed_list = (
-                    wind_speed.resample(str(seconds_per_timestep) + "S").mean().tolist()
-                )
-            else:
-                self.temperature_list = temperature.tolist()
-                self.dry_bulb_list = temperature.to_list()
-                self.calculate_daily_average_outside_temperature(
-                    temperaturelist=self.temperature_list,
-                    seconds_per_timestep=seconds_per_timestep,
                 )
-                self.DHI_list = DHI.tolist()
-                self.DNI_list = DNI.tolist()
-                self.DNIextra_list = dni_extra.tolist()
-                self.GHI_list = GHI.tolist()
-                self.altitude_list = altitude.tolist()
-                self.azimuth_list = azimuth.tolist()
-                self.apparent_zenith_list = apparent_zenith.tolist()
-                self.wind_speed_list = (
-                    wind_speed.resample(str(seconds_per_timestep) + "S").mean().tolist()
-                )
-
-            solardata = [
-                self.DNI_list,
-                self.DHI_list,
-                self.GHI_list,
-                self.temperature_list,
-                self.altitude_list,
-                self.azimuth_list,
-                self.apparent_zenith_list,
-                self.dry_bulb_list,
-                self.wind_speed_list,
-                self.DNIextra_list,
-                self.daily_average_outside_temperature_list_in_celsius,
-            ]
-
-            database = pd.DataFrame(
-                np.transpose(solardata),
-                columns=[
-                    "DNI",
-                    "DHI",
-                    "GHI",
-                    "t_out",
-                    "altitude",
-                    "azimuth",
-                    "apparent_zenith",
-                    "DryBulb",
-                    "Wspd",
-                    "DNIextra",
-                    "t_out_daily_average",
-                ],
-            )
-            database.to_csv(cache_filepath)
-
-        # write one year forecast to simulation repository for PV processing -> if PV forecasts are needed
-        if self.my_simulation_parameters.predictive_control:
-            self.simulation_repository.set_entry(
-                self.Weather_TemperatureOutside_yearly_forecast, self.temperature_list
-            )
-            self.simulation_repository.set_entry(
-                self.Weather_DiffuseHorizontalIrradiance_yearly_forecast, self.DHI_list
-            )
-            self.simulation_repository.set_entry(
-                self.Weather_DirectNormalIrradiance_yearly_forecast, self.DNI_list
-            )
-            self.simulation_repository.set_entry(
-                self.Weather_DirectNormalIrradianceExtra_yearly_forecast,
-                self.DNIextra_list,
+                weather_data = {
+                    name: resampled_weather_data[name].to_numpy()
+                    for name in resampled_weather_data.columns
+                }
+            self.temperature_list = weather_data["T"].tolist()
+            self.dry_bulb_list = weather_data["T"].tolist()
+            self.calculate_daily_average_outside_temperature(
+                temperaturelist=self.temperature_list,
+                seconds_per_timestep=seconds_per_timestep,
             )
-            self.simulation_repository.set_entry(
-                self.Weather_GlobalHorizontalIrradiance_yearly_forecast, self.GHI_list
-            )
-            self.simulation_repository.set_entry(
-                self.Weather_Azimuth_yearly_forecast, self.azimuth_list
-            )
-            self.simulation_repository.set_entry(
-                self.Weather_ApparentZenith_yearly_forecast, self.apparent_zenith_list
-            )
-            self.simulation_repository.set_entry(
-                self.Weather_WindSpeed_yearly_forecast, self.wind_speed_list
+            self.DHI_list = weather_data["DHI"].tolist()
+            self.DNI_list = weather_data["DNI"].tolist()
+            self.DNIextra_list = weather_data["DNIextra"].tolist()
+            self.GHI_list = weather_data["GHI"].tolist()
+            self.altitude_list = weather_data["altitude"].tolist()
+            self.azimuth_list = weather_data["azimuth"].tolist()
+            self.apparent_zenith_list = weather_data["apparent_zenith"].tolist()
+            self.wind_speed_list = weather_data["Wspd"].tolist()
+
+            utils.save_cache(
+                cache_filepath,
+                {
+                    "DNI": self.DNI_list,
+                    "DHI": self.DHI_list,
+                    "GHI": self.GHI_list,
+                    "t_out": self.temperature_list,
+                    "altitude": self.altitude_list,
+                    "azimuth": self.azimuth_list,
+                    "apparent_zenith": self.apparent_zenith_list,
+                    "DryBulb": self.dry_bulb_list,
+                    "Wspd": self.wind_speed_list,
+                    "DNIextra": self.DNIextra_list,
+                    "t_out_daily_average": self.daily_average_outside_temperature_list_in_celsius,
+                },
             )
 
-    def interpolate(self, pd_database: Any, year: int) -> Any:
-        """Interpolates a time series."""
-        firstday = pd.Series(
-            [0.0],
-            index=[
-                pd.to_datetime(
-                    datetime.datetime(year - 1, 12, 31, 23, 0), utc=True
-                ).tz_convert(tz="Europe/Berlin")
-            ],
+        # write the yearly series to the simulation repository, so the PV can be calculated for all timesteps at once
+        # and PV forecasts are available for predictive control
+        self.simulation_repository.set_entry(
+            self.Weather_TemperatureOutside_yearly_forecast, self.temperature_list
+        )
+        self.simulation_repository.set_entry(
+            self.Weather_DiffuseHorizontalIrradiance_yearly_forecast, self.DHI_list
+        )
+        self.simulation_repository.set_entry(
+            self.Weather_DirectNormalIrradiance_yearly_forecast, self.DNI_list
+        )
+        self.simulation_repository.set_entry(
+            self.Weather_DirectNormalIrradianceExtra_yearly_forecast,
+            self.DNIextra_list,
         )
-        lastday = pd.Series(
-            pd_database[-1],
-            index=[
-                pd.to_datetime(
-                    datetime.datetime(year, 12, 31, 22, 59), utc=True
-                ).tz_convert(tz="Europe/Berlin")
-            ],
+        self.simulation_repository.set_entry(
+            self.Weather_GlobalHorizontalIrradiance_yearly_forecast, self.GHI_list
+        )
+        self.simulation_repository.set_entry(
+            self.Weather_Azimuth_yearly_forecast, self.azimuth_list
+        )
+        self.simulation_repository.set_entry(
+            self.Weather_ApparentZenith_yearly_forecast, self.apparent_zenith_list
+        )
+        self.simulation_repository.set_entry(
+            self.Weather_WindSpeed_yearly_forecast, self.wind_speed_list
         )
-        pd_database = pd.concat([pd_database, firstday, lastday])
-        pd_database = pd_database.sort_index()
-        return pd_database.resample("1T").asfreq().interpolate(method="linear")
 
     def calc_sun_position(self, latitude_deg, longitude_deg, year, hoy):
         """Calculates the Sun Position for a specific hour and location.
@@ -919,18 +827,18 @@ class Weather(Component):
     ) -> List[float]:
         """Calculate the daily average outside temperatures."""
         timestep_24h = int(24 * 3600 / seconds_per_timestep)
-        total_number_of_timesteps_temperature_list = len(temperaturelist)
-        self.daily_average_outside_temperature_list_in_celsius = []
-        start_index = 0
-        for index in range(0, total_number_of_timesteps_temperature_list):
-            daily_average_temperature = float(
-                np.mean(temperaturelist[start_index : start_index + timestep_24h])
-            )
-            if index == start_index + timestep_24h:
-                start_index = index
-            self.daily_average_outside_temperature_list_in_celsius.append(
-                daily_average_temperature
-            )
+        temperatures = np.asarray(temperaturelist, dtype=np.float64)
+        # the mean is calculated once per day, the first timestep of a day still gets the mean of the day before
+        daily_averages = np.array(
+            [
+                float(np.mean(temperatures[start_index : start_index + timestep_24h]))
+                for start_index in range(0, len(temperatures), timestep_24h)
+            ]
+        )
+        day_indices = np.maximum(np.arange(len(temperatures)) - 1, 0) // timestep_24h
+        self.daily_average_outside_temperature_list_in_celsius = daily_averages[
+            day_indices
+        ].tolist()
         return self.daily_average_outside_temperature_list_in_celsius
 
 
@@ -963,6 +871,85 @@ def get_coordinates(filepath: str, source_enum: WeatherDataSourceEnum) -> Any:
     # self.index = pd.date_range(f"{year}-01-01 00:00:00", periods=60 * 24 * 365, freq="T", tz="Europe/Berlin")
 
 
+# the weather variables of the weather files, besides the solar position and the extraterrestrial radiation
+WEATHER_FILE_COLUMNS = ["DNI", "DHI", "GHI", "T", "Wspd"]
+# changes of the preprocessing need a new version, so old cache files are not used anymore
+PREPROCESSED_WEATHER_VERSION = 1
+
+
+@lru_cache(maxsize=16)
+def get_preprocessed_weather_data(
+    source_path: str, data_source: WeatherDataSourceEnum, year: int
+) -> Tuple[pd.DatetimeIndex, Dict[str, np.ndarray]]:
+    """Gets the weather data and the solar position of a location and year in one minute resolution.
+
+    The data is calculated once and saved as binary cache file, which gets memory mapped. So all Weather components
+    of a process and all processes of a parameter sweep share the same data. The arrays must not be changed.
+    """
+    key = json.dumps(
+        [os.path.normpath(os.path.abspath(source_path)), data_source.name, year, PREPROCESSED_WEATHER_VERSION]
+    )
+    filename = "WeatherPreprocessed_" + hashlib.sha256(key.encode("utf-8")).hexdigest() + CacheFormat.NUMPY.value
+    cache_filepath = os.path.join(utils.HISIMPATH["cache_dir"], filename)
+    if os.path.isfile(cache_filepath):
+        utils.get_cache_manager().record_access(cache_filepath)
+    else:
+        os.makedirs(utils.HISIMPATH["cache_dir"], exist_ok=True)
+        weather_data = calculate_preprocessed_weather_data(source_path, data_source, year)
+        columns: Dict[str, Any] = {"index": weather_data.index.asi8}
+        columns.update({name: weather_data[name].to_numpy(dtype=np.float64) for name in weather_data.columns})
+        utils.save_cache(cache_filepath, columns, {"timezone": str(weather_data.index.tz)})
+    columns, metadata = cache_backend.get_cache_backend(cache_filepath).load(cache_filepath)
+    weather_index = pd.DatetimeIndex(pd.to_datetime(np.asarray(columns.pop("index")), utc=True)).tz_convert(
+        metadata["timezone"]
+    )
+    return weather_index, columns
+
+
+def calculate_preprocessed_weather_data(
+    source_path: str, data_source: WeatherDataSourceEnum, year: int
+) -> pd.DataFrame:
+    """Interpolates the weather file to one minute resolution and adds the solar position and extraterrestrial radiation."""
+    location_dict = get_coordinates(filepath=source_path, source_enum=data_source)
+    tmy_data = read_weather_file(os.path.join(source_path), data_source, year)[WEATHER_FILE_COLUMNS]
+    if data_source == WeatherDataSourceEnum.NSRDB_15min:
+        weather_data = tmy_data.resample("1T").asfreq().interpolate(method="linear")
+    else:
+        weather_data = interpolate_to_minutes(tmy_data, year)
+    # calculate extra terrestrial radiation- n eeded for perez array diffuse irradiance models
+    weather_data["DNIextra"] = pd.Series(pvlib.irradiance.get_extra_radiation(weather_data.index), index=weather_data.index)  # type: ignore
+    solpos = pvlib.solarposition.get_solarposition(weather_data.index, location_dict["latitude"], location_dict["longitude"])  # type: ignore
+    weather_data["altitude"] = solpos["elevation"]
+    weather_data["azimuth"] = solpos["azimuth"]
+    weather_data["apparent_zenith"] = solpos["apparent_zenith"]
+    return weather_data
+
+
+def interpolate_to_minutes(pd_database: pd.DataFrame, year: int) -> pd.DataFrame:
+    """Interpolates hourly time series to one minute resolution, starting with 0 and ending with the last value."""
+    firstday = pd.DataFrame(
+        0.0,
+        index=[
+            pd.to_datetime(
+                datetime.datetime(year - 1, 12, 31, 23, 0), utc=True
+            ).tz_convert(tz="Europe/Berlin")
+        ],
+        columns=pd_database.columns,
+    )
+    lastday = pd.DataFrame(
+        [pd_database.iloc[-1].to_numpy()],
+        index=[
+            pd.to_datetime(
+                datetime.datetime(year, 12, 31, 22, 59), utc=True
+            ).tz_convert(tz="Europe/Berlin")
+        ],
+        columns=pd_database.columns,
+    )
+    pd_database = pd.concat([pd_database, firstday, lastday])
+    pd_database = pd_database.sort_index()
+    return pd_database.resample("1T").asfreq().interpolate(method="linear")
+
+
 def read_test_reference_year_data(weatherconfig: WeatherConfig, year: int) -> Any:
     """Reads a test reference year file and gets the GHI, DHI and DNI from it.
 
@@ -970,11 +957,17 @@ def read_test_reference_year_data(weatherconfig: WeatherConfig, year: int) -> An
     """
     # get the correct file path
     filepath = os.path.join(weatherconfig.source_path)
-    if weatherconfig.data_source == WeatherDataSourceEnum.NSRDB:
+    return read_weather_file(filepath, weatherconfig.data_source, year)
+
+
+@lru_cache(maxsize=16)
+def read_weather_file(filepath: str, data_source: WeatherDataSourceEnum, year: int) -> Any:
+    """Reads a weather file once per process. The data frame is shared, so it must not be changed."""
+    if data_source == WeatherDataSourceEnum.NSRDB:
         data = read_nsrdb_data(filepath, year)
-    elif weatherconfig.data_source == WeatherDataSourceEnum.DWD:
+    elif data_source == WeatherDataSourceEnum.DWD:
         data = read_dwd_data(filepath, year)
-    elif weatherconfig.data_source == WeatherDataSourceEnum.NSRDB_15min:
+    elif data_source == WeatherDataSourceEnum.NSRDB_15min:
         data = read_nsrdb_15min_data(filepath, year)
 
     return data
@@ -112,7 +112,7 @@ class DynamicComponent(Component):
         num_inputs = len(self.inputs)
         label = f"Input{num_inputs}"
         vars(self)[label] = label
-        log.trace("Added component input and connect: " + source_component_class.component_name + " - " + source_component_output)
+        log.trace("Added component input and connect: %s - %s", source_component_class.component_name, source_component_output)
         # Define Input as Component Input and add it to inputs
         myinput = ComponentInput(self.component_name, label, source_load_type, source_unit, True)
         self.inputs.append(myinput)
@@ -165,7 +165,7 @@ class DynamicComponent(Component):
                     myinput.src_field_name = str(source_component_output)
                     setattr(self, label, myinput)
                     num_inputs += 1
-                    log.trace("Added component inputs and connect: " + myinput.src_object_name + " - " + myinput.src_field_name)
+                    log.trace("Added component inputs and connect: %s - %s", myinput.src_object_name, myinput.src_field_name)
                     self.connect_input(label,
                                        component.component_name,
                                        output_var.field_name)
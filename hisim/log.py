@@ -1,8 +1,24 @@
-""" Logging functionality for all of HiSim. """
+""" Logging functionality for all of HiSim.
+
+Messages up to the LOGGING_LEVEL get printed, messages up to the LOG_FILE_LEVEL get written to the log file, which by
+default are all messages. Messages above both levels get dropped before they are formatted, so messages can contain
+%-placeholders for additional arguments, for example log.debug("Registered output %s", output.full_name).
+The log files are opened once and written through a buffer.
+With start_async_logging, printing and writing happens in a background thread that is fed through a queue.
+"""
 # clean
+import atexit
+import os
+import queue
+import threading
 from enum import IntEnum
+from typing import Any, Dict, Optional, TextIO, Tuple
 
 LOGGING_LEVEL = 3
+#: Highest priority of the messages in the log file, see LogPrio, all messages by default.
+LOG_FILE_LEVEL = 6
+LOG_FILE_NAME = "hisim_simulation.log"
+PROFILE_FILE_NAME = "profiling_timeuse.log"
 
 
 class LogPrio(IntEnum):
@@ -17,62 +33,166 @@ class LogPrio(IntEnum):
     TRACE = 6
 
 
-def error(message: str) -> None:
+PRIO_STRINGS: Dict[int, str] = {
+    LogPrio.ERROR: "ERR",
+    LogPrio.WARNING: "WRN",
+    LogPrio.INFORMATION: "IFO",
+    LogPrio.DEBUG: "DBG",
+    LogPrio.PROFILE: "PRF",
+    LogPrio.TRACE: "TRC",
+}
+
+# prio string, message, if the message gets printed and if it gets written to the log file,
+# the prio string is None for entries of the profiling file
+LogEntry = Tuple[Optional[str], str, bool, bool]
+
+_log_files: Dict[str, TextIO] = {}
+_log_queue: "Optional[queue.SimpleQueue[Optional[LogEntry]]]" = None
+_log_thread: Optional[threading.Thread] = None
+
+
+def error(message: str, *args: Any) -> None:
     """ Log an error message. """
-    log(LogPrio.ERROR, message)
+    log(LogPrio.ERROR, message, *args)
 
 
-def warning(message: str) -> None:
+def warning(message: str, *args: Any) -> None:
     """ Log a warning message. """
-    log(LogPrio.WARNING, message)
+    log(LogPrio.WARNING, message, *args)
 
 
-def information(message: str) -> None:
+def information(message: str, *args: Any) -> None:
     """ Log a information message. """
-    log(LogPrio.INFORMATION, message)
+    log(LogPrio.INFORMATION, message, *args)
 
 
-def trace(message: str) -> None:
+def trace(message: str, *args: Any) -> None:
     """ Log a trace message. """
-    log(LogPrio.TRACE, message)
+    log(LogPrio.TRACE, message, *args)
 
 
-def debug(message: str) -> None:
+def debug(message: str, *args: Any) -> None:
     """ Log a debug message. """
-    log(LogPrio.DEBUG, message)
+    log(LogPrio.DEBUG, message, *args)
 
 
-def profile(message: str) -> None:
+def profile(message: str, *args: Any) -> None:
     """ Log a profile message. """
+    if args:
+        message = message % args
     log(LogPrio.PROFILE, message)
     log_profile_file(message)
 
 
-def log(prio: int, message: str) -> None:
+def is_enabled(prio: int) -> bool:
+    """ Checks if messages of a priority get printed or written, to skip expensive preparations of dropped messages. """
+    return prio <= LOGGING_LEVEL or prio <= LOG_FILE_LEVEL
+
+
+def log(prio: int, message: str, *args: Any) -> None:
     """ Write and print a log message. """
-    # if(prio < LogPrio.Debug):
-    prio_string: str
-    if prio == LogPrio.ERROR:
-        prio_string = "ERR"
-    elif prio == LogPrio.WARNING:
-        prio_string = "WRN"
-    elif prio == LogPrio.INFORMATION:
-        prio_string = "IFO"
-    elif prio == LogPrio.DEBUG:
-        prio_string = "DBG"
-    elif prio == LogPrio.PROFILE:
-        prio_string = "PRF"
-    elif prio == LogPrio.TRACE:
-        prio_string = "TRC"
-    else:
+    prio_string = PRIO_STRINGS.get(prio)
+    if prio_string is None:
         raise ValueError("Unknown log priority: " + str(prio))
-    if prio <= LOGGING_LEVEL:
-        print(str(prio_string) + ":" + message)
-    with open('hisim_simulation.log', 'a', encoding="utf-8") as filestream:
-        filestream.write(message + "\n")
+    printed = prio <= LOGGING_LEVEL
+    written = prio <= LOG_FILE_LEVEL
+    if not printed and not written:
+        return
+    if args:
+        message = message % args
+    log_entry = (prio_string, message, printed, written)
+    if _log_queue is not None:
+        _log_queue.put(log_entry)
+    else:
+        write_log_entry(log_entry)
 
 
 def log_profile_file(message: str) -> None:
     """ Write log message to logfile. """
-    with open('profiling_timeuse.log', 'a', encoding="utf-8") as filestream:
-        filestream.write(message + "\n")
+    if _log_queue is not None:
+        _log_queue.put((None, message, False, True))
+    else:
+        write_log_entry((None, message, False, True))
+
+
+def get_log_file(filename: str) -> TextIO:
+    """ Opens a log file on first use and keeps it open. """
+    log_file = _log_files.get(filename)
+    if log_file is None:
+        log_file = open(filename, "a", encoding="utf-8", buffering=1 << 16)  # pylint: disable=consider-using-with
+        _log_files[filename] = log_file
+    return log_file
+
+
+def write_log_entry(log_entry: LogEntry) -> None:
+    """ Prints the message and writes it into the log file, as set in the entry. Errors get written to the disk immediately. """
+    prio_string, message, printed, written = log_entry
+    if prio_string is None:
+        get_log_file(PROFILE_FILE_NAME).write(message + "\n")
+        return
+    if printed:
+        print(prio_string + ":" + message)
+    if not written:
+        return
+    log_file = get_log_file(LOG_FILE_NAME)
+    log_file.write(message + "\n")
+    if prio_string == PRIO_STRINGS[LogPrio.ERROR]:
+        log_file.flush()
+
+
+def flush() -> None:
+    """ Writes the buffered messages to the log files. """
+    for log_file in _log_files.values():
+        log_file.flush()
+
+
+def process_log_queue(log_queue: "queue.SimpleQueue[Optional[LogEntry]]") -> None:
+    """ Writes the queued messages until the end marker None arrives. """
+    while True:
+        log_entry = log_queue.get()
+        if log_entry is None:
+            break
+        write_log_entry(log_entry)
+    flush()
+
+
+def start_async_logging() -> None:
+    """ Moves printing and writing of the messages into a background thread. """
+    global _log_queue, _log_thread  # pylint: disable=global-statement
+    if _log_queue is not None:
+        return
+    _log_queue = queue.SimpleQueue()
+    _log_thread = threading.Thread(target=process_log_queue, args=(_log_queue,), name="hisim-log", daemon=True)
+    _log_thread.start()
+
+
+def stop_async_logging() -> None:
+    """ Writes all queued messages and goes back to logging in the calling thread. """
+    global _log_queue, _log_thread  # pylint: disable=global-statement
+    if _log_queue is None or _log_thread is None:
+        return
+    log_queue, log_thread = _log_queue, _log_thread
+    _log_queue, _log_thread = None, None
+    log_queue.put(None)
+    log_thread.join()
+
+
+def close() -> None:
+    """ Stops the background thread and closes the log files. """
+    stop_async_logging()
+    for log_file in _log_files.values():
+        log_file.close()
+    _log_files.clear()
+
+
+def reset_after_fork() -> None:
+    """ Forgets the thread and the file buffers of the parent process in a forked child, which opens its own files. """
+    global _log_queue, _log_thread  # pylint: disable=global-statement
+    _log_queue, _log_thread = None, None
+    _log_files.clear()
+
+
+atexit.register(close)
+if hasattr(os, "register_at_fork"):
+    # without flushing, the buffered messages of the parent would get written by both processes
+    os.register_at_fork(before=flush, after_in_child=reset_after_fork)
@@ -0,0 +1,190 @@
+""" Parses the result files of the Load Profile Generator once and serves them to all components of a household.
+
+Also converts the occupancy profiles of the Load Profile Generator to the time of the simulation. """
+# clean
+import datetime as dt
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hisim import log, utils
+
+#: Name of the flexibility events of the smart devices in the reports directory.
+FlexibilityEventsFilename = "FlexibilityEvents.HH1.json"
+
+#: Gains of the residents in W for high and low bodily activity, so while being awake and sleeping.
+GainPerPersonForBodilyActivity = [150, 100]
+
+
+def compute_residents_and_heating_by_residents(
+    bodily_activity_values: List[np.ndarray], number_of_minutes: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Combines the high and low bodily activity profiles to the number of residents and their heat gains in W."""
+    number_of_residents: Any = 0
+    heating_by_residents: Any = 0
+    for values, gain in zip(bodily_activity_values, GainPerPersonForBodilyActivity):
+        values = values[:number_of_minutes]
+        if len(values) < number_of_minutes:
+            raise IndexError("The bodily activity profile is shorter than the simulation.")
+        number_of_residents = number_of_residents + values
+        heating_by_residents = heating_by_residents + gain * values
+    return np.asarray(number_of_residents), np.asarray(heating_by_residents)
+
+
+def resample_to_timestep(values: Any, number_of_minutes: int, minutes_per_timestep: int, average: bool) -> np.ndarray:
+    """Sums up or averages a profile in minutes to the time steps of the simulation.
+
+    The profile gets cut or filled up with zeros to the number of minutes. The minutes of each time step get summed
+    up in their order, so the results equal a summation over the time series.
+    """
+    values = np.asarray(values)[:number_of_minutes]
+    if len(values) < number_of_minutes:
+        values = np.concatenate((values, np.zeros(number_of_minutes - len(values), dtype=values.dtype)))
+    minutes_of_timesteps = values.reshape(-1, minutes_per_timestep)
+    resampled: np.ndarray = minutes_of_timesteps[:, 0].copy()
+    for minute in range(1, minutes_per_timestep):
+        resampled += minutes_of_timesteps[:, minute]
+    if average:
+        resampled = resampled / minutes_per_timestep
+    return resampled
+
+
+def convert_occupancy_profiles_to_simulation_time(
+    profiles: Dict[str, Any], year: int, minutes_per_timestep: int, summed_profiles: Optional[List[str]] = None
+) -> Dict[str, np.ndarray]:
+    """Converts equally long occupancy profiles in minutes from local time to UTC and to the time steps of the simulation.
+
+    Profiles of powers and persons get averaged, the profiles in summed_profiles, like the water consumption in liters,
+    get summed up.
+    """
+    summed_profiles = summed_profiles or []
+    number_of_minutes = len(next(iter(profiles.values())))
+    data = pd.DataFrame(
+        {
+            "Time": pd.date_range(start=dt.datetime(year=year, month=1, day=1), periods=number_of_minutes, freq="min"),
+            **profiles,
+        }
+    )
+    data = utils.convert_lpg_data_to_utc(data=data, year=year, format_time=False)
+    converted_profiles: Dict[str, np.ndarray] = {}
+    for name in profiles:
+        converted_profiles[name] = data[name].to_numpy()
+        # average data, when time resolution of inputs is coarser than time resolution of simulation
+        if minutes_per_timestep > 1:
+            converted_profiles[name] = resample_to_timestep(
+                values=converted_profiles[name],
+                number_of_minutes=number_of_minutes,
+                minutes_per_timestep=minutes_per_timestep,
+                average=name not in summed_profiles,
+            )
+    return converted_profiles
+
+
+class LpgResultStore:
+
+    """ Holds the parsed result files of the Load Profile Generator of one household.
+
+    Every file gets parsed once and is served by reference to all components, so the components must not change
+    the returned objects. A file gets parsed again when its modification time or size changed, for example
+    when the UTSP connector wrote new results.
+    """
+
+    def __init__(self, reports_directory: str, results_directory: str) -> None:
+        """ Initializes the store for the reports and results directory of the household. """
+        self.reports_directory = reports_directory
+        self.results_directory = results_directory
+        self._parsed_files: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+    def _get_parsed_file(self, filepath: str, key: str, parse_function: Any) -> Any:
+        """ Returns the parsed content of a file and parses it only when it is new or changed. """
+        file_stat = os.stat(filepath)
+        file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+        cache_key = os.path.abspath(filepath) + "|" + key
+        cached = self._parsed_files.get(cache_key)
+        if cached is not None and cached[0] == file_version:
+            return cached[1]
+        parsed = parse_function()
+        self._parsed_files[cache_key] = (file_version, parsed)
+        return parsed
+
+    def load_json(self, filepath: str) -> Any:
+        """ Returns the content of a json file. """
+
+        def parse() -> Any:
+            log.debug("Parsing the LPG result file " + filepath)
+            with open(filepath, encoding="utf-8") as json_file:
+                return json.load(json_file)
+
+        return self._get_parsed_file(filepath, "json", parse)
+
+    def load_values(self, filepath: str) -> np.ndarray:
+        """ Returns the values of a json profile of the LPG as array. """
+
+        def parse() -> np.ndarray:
+            values = np.asarray(self.load_json(filepath)["Values"])
+            values.setflags(write=False)
+            return values
+
+        return self._get_parsed_file(filepath, "values", parse)  # type: ignore
+
+    def get_flexibility_events(self) -> List[Dict[str, Any]]:
+        """ Returns all flexibility events of the smart devices. """
+        return self.load_json(os.path.join(self.reports_directory, FlexibilityEventsFilename))  # type: ignore
+
+    def get_flexibility_events_by_device(self) -> Dict[str, List[Dict[str, Any]]]:
+        """ Returns the flexibility events grouped by the device names in the order of their first occurrence. """
+        filepath = os.path.join(self.reports_directory, FlexibilityEventsFilename)
+
+        def group() -> Dict[str, List[Dict[str, Any]]]:
+            events_by_device: Dict[str, List[Dict[str, Any]]] = {}
+            for event in self.get_flexibility_events():
+                events_by_device.setdefault(str(event["Device"]["Name"]), []).append(event)
+            return events_by_device
+
+        return self._get_parsed_file(filepath, "events_by_device", group)  # type: ignore
+
+    def get_result_filenames(self) -> List[str]:
+        """ Returns the names of all files in the results directory. """
+        return self._get_parsed_file(  # type: ignore
+            self.results_directory, "filenames", lambda: sorted(os.listdir(self.results_directory))
+        )
+
+    def get_result_filepath(self, tag: str) -> str:
+        """ Returns the path of the first result file that contains the tag in its name, e.g. CarLocation.Car1. """
+        for filename in self.get_result_filenames():
+            if tag in filename:
+                return os.path.join(self.results_directory, filename)
+        raise FileNotFoundError(f"No LPG result file for {tag} in {self.results_directory}")
+
+    def get_car_names(self) -> List[str]:
+        """ Returns the names of all cars, which have a car location file. """
+        return [
+            filename.partition(",")[0].partition(".")[2]
+            for filename in self.get_result_filenames()
+            if "CarLocation." in filename
+        ]
+
+
+_lpg_result_stores: Dict[Tuple[str, str], LpgResultStore] = {}
+
+
+def get_lpg_result_store(
+    reports_directory: Optional[str] = None, results_directory: Optional[str] = None
+) -> LpgResultStore:
+    """ Gets the store of a household, by default for the reports and results directories of the UTSP. """
+    if reports_directory is None:
+        reports_directory = utils.HISIMPATH["utsp_reports"]
+    if results_directory is None:
+        results_directory = utils.HISIMPATH["utsp_results"]
+    key = (os.path.abspath(reports_directory), os.path.abspath(results_directory))
+    if key not in _lpg_result_stores:
+        _lpg_result_stores[key] = LpgResultStore(reports_directory, results_directory)
+    return _lpg_result_stores[key]
+
+
+def reset_lpg_result_stores() -> None:
+    """ Forgets all stores and their parsed files, so the next simulation in this process parses its files again. """
+    _lpg_result_stores.clear()
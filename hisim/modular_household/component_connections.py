@@ -5,15 +5,13 @@
 The functions are all called in modular_household.
 """
 
-import json
-from os import listdir, path
 from typing import Any, List, Optional, Tuple
 
 import pandas as pd
 from utspclient.helpers.lpgpythonbindings import JsonReference
 
 import hisim.loadtypes as lt
-from hisim import utils
+from hisim import lpg_result_store, utils
 from hisim.component import Component
 from hisim.components import (advanced_battery_bslib,
                               advanced_ev_battery_bslib, building,
@@ -119,16 +117,8 @@ def configure_smart_devices(
         Integer tracking component hierachy for EMS.
 
     """
-    filepath = path.join(utils.HISIMPATH["utsp_reports"], "FlexibilityEvents.HH1.json")
-    device_collection = []
-    with open(filepath, mode="r", encoding="utf-8") as jsonfile:
-        strfile = json.load(jsonfile)
-
-    for elem in strfile:
-        if elem["Device"]["Name"] in device_collection:
-            pass
-        else:
-            device_collection.append(elem["Device"]["Name"])
+    # the flexibility events get parsed once and are shared with the smart devices
+    device_collection = list(lpg_result_store.get_lpg_result_store().get_flexibility_events_by_device())
 
     # create all smart devices
     my_smart_devices: List[generic_smart_device.SmartDevice] = []
@@ -170,9 +160,7 @@ def configure_cars(
 
     """
     # get names of all available cars
-    filepaths = listdir(utils.HISIMPATH["utsp_results"])
-    filepaths_location = [elem for elem in filepaths if "CarLocation." in elem]
-    names = [elem.partition(",")[0].partition(".")[2] for elem in filepaths_location]
+    names = lpg_result_store.get_lpg_result_store().get_car_names()
 
     # create all cars
     my_cars: List[generic_car.Car] = []
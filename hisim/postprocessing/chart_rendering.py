@@ -0,0 +1,217 @@
+""" Renders the line, carpet, single day and monthly bar charts of all outputs, optionally on a process pool.
+
+With more than one worker, the result matrix is shared with the worker processes as memory mapped .npy file:
+either the file of the memory mapped result store or a temporary copy in the result directory. Every worker
+renders the charts of a batch of outputs and the report image entries are collected in the order of the outputs,
+so the report looks the same for any number of workers.
+"""
+# clean
+import enum
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+
+from hisim import log
+from hisim.component import ComponentOutput
+from hisim.postprocessing import charts
+from hisim.postprocessing.chart_singleday import ChartSingleDay
+from hisim.postprocessing.postprocessing_datatransfer import PostProcessingDataTransfer
+from hisim.postprocessing.report_image_entries import ReportImageEntry
+from hisim.result_store import ResultStore
+from hisim.simulationparameters import ChartQuality, FigureFormat
+
+
+class ChartType(enum.Enum):
+
+    """ Chart types that get rendered for every output. """
+
+    LINE = "line"
+    CARPET = "carpet"
+    SINGLE_DAY = "single_day"
+    MONTHLY_BAR = "monthly_bar"
+
+
+@dataclass
+class ChartSettings:
+
+    """ Everything besides the data that the charts need. """
+
+    directory_path: str
+    time_correction_factor: float
+    figure_format: FigureFormat
+    number_of_days: int
+    chart_quality: ChartQuality = ChartQuality.PRINT
+    day: int = 0
+    month: int = 0
+
+
+def render_chart(
+    chart_type: ChartType, output: ComponentOutput, data: pd.Series, settings: ChartSettings
+) -> ReportImageEntry:
+    """ Renders a single chart of an output. """
+    if chart_type == ChartType.LINE:
+        if output.output_description is None:
+            raise ValueError("Output description was missing for " + output.full_name)
+        my_line = charts.Line(
+            output=output.full_name,
+            component_name=output.component_name,
+            units=output.unit,
+            directory_path=settings.directory_path,
+            time_correction_factor=settings.time_correction_factor,
+            output_description=output.output_description,
+            figure_format=settings.figure_format,
+            chart_quality=settings.chart_quality,
+        )
+        line_entry: ReportImageEntry = my_line.plot(data=data)
+        return line_entry
+    if chart_type == ChartType.CARPET:
+        my_carpet = charts.Carpet(
+            output=output.full_name,
+            component_name=output.component_name,
+            units=output.unit,
+            directory_path=settings.directory_path,
+            time_correction_factor=settings.time_correction_factor,
+            output_description=output.output_description,  # type: ignore
+            figure_format=settings.figure_format,
+            chart_quality=settings.chart_quality,
+        )
+        return my_carpet.plot(xdims=settings.number_of_days, data=data)
+    if chart_type == ChartType.SINGLE_DAY:
+        my_days = ChartSingleDay(
+            output=output.full_name,
+            component_name=output.component_name,
+            units=output.unit,
+            directory_path=settings.directory_path,
+            time_correction_factor=settings.time_correction_factor,
+            day=settings.day,
+            month=settings.month,
+            data=data,
+            output_description=output.output_description,  # type: ignore
+            figure_format=settings.figure_format,
+        )
+        return my_days.plot(close=True)
+    my_bar = charts.BarChart(
+        output=output.full_name,
+        component_name=output.component_name,
+        units=output.unit,
+        directory_path=settings.directory_path,
+        time_correction_factor=settings.time_correction_factor,
+        output_description=output.output_description,  # type: ignore
+        figure_format=settings.figure_format,
+    )
+    return my_bar.plot(data=data)
+
+
+# the shared data of a worker process, set once by initialize_worker
+_worker_data: Dict[str, Any] = {}
+
+
+def initialize_worker(matrix_filepath: str, index: pd.Index, columns: List[str], results_monthly: Any) -> None:
+    """ Opens the shared result matrix read only in a worker process. """
+    mpl.use("Agg")
+    _worker_data["results"] = pd.DataFrame(
+        np.load(matrix_filepath, mmap_mode="r"), index=index, columns=columns, copy=False
+    )
+    _worker_data["results_monthly"] = results_monthly
+
+
+def render_chart_batch(
+    chart_type: ChartType, settings: ChartSettings, batch: List[Tuple[int, ComponentOutput]]
+) -> List[ReportImageEntry]:
+    """ Renders the charts for a batch of outputs in a worker process. """
+    results_name = "results_monthly" if chart_type == ChartType.MONTHLY_BAR else "results"
+    results: pd.DataFrame = _worker_data[results_name]
+    return [render_chart(chart_type, output, results.iloc[:, index], settings) for index, output in batch]
+
+
+class ChartRenderer:
+
+    """ Renders the charts of all outputs, either one by one or on a process pool that is shared by all chart types. """
+
+    # batches per worker, more batches even out the different rendering times of the charts
+    BatchesPerWorker = 4
+
+    def __init__(self, ppdt: PostProcessingDataTransfer) -> None:
+        """ Initializes the renderer. The process pool gets started on the first use. """
+        self.ppdt = ppdt
+        number_of_workers = ppdt.simulation_parameters.chart_rendering_workers
+        if number_of_workers <= 0:
+            number_of_workers = os.cpu_count() or 1
+        self.number_of_workers: int = min(number_of_workers, max(len(ppdt.all_outputs), 1))
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        self.temporary_matrix_filepath: Optional[str] = None
+
+    def get_settings(self, day: int = 0, month: int = 0) -> ChartSettings:
+        """ Gets the chart settings from the simulation parameters. """
+        simulation_parameters = self.ppdt.simulation_parameters
+        return ChartSettings(
+            directory_path=simulation_parameters.result_directory,
+            time_correction_factor=self.ppdt.time_correction_factor,
+            figure_format=simulation_parameters.figure_format,
+            number_of_days=int((simulation_parameters.end_date - simulation_parameters.start_date).days),
+            chart_quality=simulation_parameters.chart_quality,
+            day=day,
+            month=month,
+        )
+
+    def get_matrix_filepath(self) -> str:
+        """ Gets the memory mapped result matrix or writes a temporary copy of the results for the workers. """
+        simulation_parameters = self.ppdt.simulation_parameters
+        matrix_filepath = os.path.join(simulation_parameters.result_directory, ResultStore.MatrixFilename)
+        if simulation_parameters.memory_map_results and os.path.isfile(matrix_filepath):
+            return matrix_filepath
+        self.temporary_matrix_filepath = os.path.join(
+            simulation_parameters.result_directory, "chart_rendering_" + ResultStore.MatrixFilename
+        )
+        np.save(self.temporary_matrix_filepath, self.ppdt.results.to_numpy(dtype=np.float64))
+        return self.temporary_matrix_filepath
+
+    def get_process_pool(self) -> ProcessPoolExecutor:
+        """ Starts the process pool on the first use. """
+        if self.process_pool is None:
+            log.information("Rendering the charts with " + str(self.number_of_workers) + " processes.")
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=self.number_of_workers,
+                initializer=initialize_worker,
+                initargs=(
+                    self.get_matrix_filepath(),
+                    self.ppdt.results.index,
+                    list(self.ppdt.results.columns),
+                    self.ppdt.results_monthly,
+                ),
+            )
+        return self.process_pool
+
+    def render(self, chart_type: ChartType, day: int = 0, month: int = 0) -> List[ReportImageEntry]:
+        """ Renders the charts of one type for all outputs and returns the entries in the order of the outputs. """
+        settings = self.get_settings(day=day, month=month)
+        if self.number_of_workers == 1:
+            results = self.ppdt.results_monthly if chart_type == ChartType.MONTHLY_BAR else self.ppdt.results
+            return [
+                render_chart(chart_type, output, results.iloc[:, index], settings)
+                for index, output in enumerate(self.ppdt.all_outputs)
+            ]
+        indexed_outputs = list(enumerate(self.ppdt.all_outputs))
+        number_of_batches = min(self.number_of_workers * self.BatchesPerWorker, len(indexed_outputs))
+        batches = [indexed_outputs[i::number_of_batches] for i in range(number_of_batches)]
+        rendered_batches = self.get_process_pool().map(partial(render_chart_batch, chart_type, settings), batches)
+        report_image_entries: List[ReportImageEntry] = [None] * len(indexed_outputs)  # type: ignore
+        for batch_number, entries in enumerate(rendered_batches):
+            report_image_entries[batch_number::number_of_batches] = entries
+        return report_image_entries
+
+    def close(self) -> None:
+        """ Shuts the process pool down and deletes the temporary copy of the results. """
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+            self.process_pool = None
+        if self.temporary_matrix_filepath is not None:
+            if os.path.isfile(self.temporary_matrix_filepath):
+                os.remove(self.temporary_matrix_filepath)
+            self.temporary_matrix_filepath = None
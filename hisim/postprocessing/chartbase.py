@@ -2,10 +2,12 @@
 # clean
 import os
 import re
-from typing import Any, Tuple
+from typing import Any, Dict, Tuple
 from dataclasses import dataclass
 import numpy as np
+import pandas as pd
 from hisim import result_path_provider
+from hisim.simulationparameters import ChartQuality
 
 
 class Chart:  # noqa: too-few-public-methods
@@ -153,3 +155,61 @@ class ChartFontsAndSize:
     fontsize_label = 12
     fontsize_legend = 12
     fontsize_ticks = 10
+
+
+@dataclass
+class ChartQualityProfile:
+
+    """Give the resolution of a chart quality and whether long results get downsampled to it."""
+
+    dpi: int
+    downsample: bool
+
+
+CHART_QUALITY_PROFILES: Dict[ChartQuality, ChartQualityProfile] = {
+    ChartQuality.PRINT: ChartQualityProfile(dpi=600, downsample=False),
+    ChartQuality.SCREEN: ChartQualityProfile(dpi=200, downsample=True),
+    ChartQuality.DRAFT: ChartQualityProfile(dpi=100, downsample=True),
+}
+
+
+def downsample_line(data: pd.Series, number_of_buckets: int) -> pd.Series:
+    """Keep the first, last, smallest and largest value of every bucket of consecutive timesteps.
+
+    With a bucket per pixel column, the line looks the same as with all values, but has at most four points per pixel.
+    Missing values are kept, so gaps in the line stay visible.
+    """
+    number_of_values = len(data)
+    if number_of_values <= 4 * number_of_buckets:
+        return data
+    bucket_size = -(-number_of_values // number_of_buckets)
+    values = data.to_numpy(dtype=np.float64)
+    number_of_padded_values = -(-number_of_values // bucket_size) * bucket_size
+    buckets = np.pad(
+        values, (0, number_of_padded_values - number_of_values), constant_values=np.nan
+    ).reshape(-1, bucket_size)
+    is_missing = np.isnan(buckets)
+    bucket_starts = np.arange(len(buckets)) * bucket_size
+    positions = np.concatenate(
+        [
+            bucket_starts,
+            bucket_starts + np.where(is_missing, np.inf, buckets).argmin(axis=1),
+            bucket_starts + np.where(is_missing, -np.inf, buckets).argmax(axis=1),
+            np.minimum(bucket_starts + bucket_size, number_of_values) - 1,
+        ]
+    )
+    positions = np.unique(positions[positions < number_of_values])
+    return data.iloc[positions]
+
+
+def get_carpet_downsampling_factor(steps_per_hour: int, steps_per_day: int, number_of_pixel_rows: int) -> int:
+    """Get how many timesteps of a day can be averaged into one row of a carpet plot without losing pixel rows.
+
+    The factor divides the timesteps per hour, so the hours stay aligned with the rows.
+    """
+    maximal_factor = steps_per_day // max(number_of_pixel_rows, 1)
+    factor = 1
+    for candidate in range(1, min(maximal_factor, steps_per_hour) + 1):
+        if steps_per_hour % candidate == 0:
+            factor = candidate
+    return factor
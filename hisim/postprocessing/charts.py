@@ -7,10 +7,16 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from hisim import log
-from hisim.postprocessing.chartbase import Chart, ChartFontsAndSize
+from hisim.postprocessing.chartbase import (
+    CHART_QUALITY_PROFILES,
+    Chart,
+    ChartFontsAndSize,
+    downsample_line,
+    get_carpet_downsampling_factor,
+)
 from hisim import utils
 from hisim.postprocessing.report_image_entries import ReportImageEntry
-from hisim.simulationparameters import FigureFormat
+from hisim.simulationparameters import ChartQuality, FigureFormat
 
 mpl.rcParams["agg.path.chunksize"] = 10000
 
@@ -28,6 +34,7 @@ class Carpet(Chart, ChartFontsAndSize):  # noqa: too-few-public-methods
         time_correction_factor: float,
         output_description: str,
         figure_format: FigureFormat,
+        chart_quality: ChartQuality = ChartQuality.PRINT,
     ) -> None:
         """Initalizes a carpot plot."""
         super().__init__(
@@ -40,6 +47,8 @@ class Carpet(Chart, ChartFontsAndSize):  # noqa: too-few-public-methods
             output_description=output_description,
             figure_format=figure_format,
         )
+        self.chart_quality_profile = CHART_QUALITY_PROFILES[chart_quality]
+        self.dpi = self.chart_quality_profile.dpi
 
     def plot(self, xdims: int, data: Any) -> ReportImageEntry:
         """Makes a carpet plot."""
@@ -52,6 +61,17 @@ class Carpet(Chart, ChartFontsAndSize):  # noqa: too-few-public-methods
         except ValueError:
             log.error("Carpet plot can only deal with data containing entire days")
 
+        if self.chart_quality_profile.downsample:
+            # average the timesteps of the day that would share a pixel row anyway
+            factor = get_carpet_downsampling_factor(
+                steps_per_hour=y_steps_per_hour,
+                steps_per_day=ydims,
+                number_of_pixel_rows=int(self.figsize[1] * self.dpi),
+            )
+            if factor > 1:
+                database = database.reshape(xdims, ydims // factor, factor).mean(axis=2)
+                y_steps_per_hour = y_steps_per_hour // factor
+
         if np.max(np.abs(data.values)) > 1.5e3:
             database = database * 1e-3
             self.units = f"k{self.units}"
@@ -86,7 +106,7 @@ class Carpet(Chart, ChartFontsAndSize):  # noqa: too-few-public-methods
         plt.xticks(fontsize=self.fontsize_ticks)
         plt.yticks(fontsize=self.fontsize_ticks)
         plt.tight_layout()
-        log.trace("finished carpet plot: " + self.filepath)
+        log.trace("finished carpet plot: %s", self.filepath)
         plt.savefig(self.filepath2)
         plt.close()
         return ReportImageEntry(
@@ -114,6 +134,7 @@ class Line(Chart, ChartFontsAndSize):  # noqa: too-few-public-methods
         time_correction_factor: float,
         output_description: str,
         figure_format: FigureFormat,
+        chart_quality: ChartQuality = ChartQuality.PRINT,
     ):
         """Initializes a line chart."""
         if output_description is None:
@@ -131,6 +152,8 @@ class Line(Chart, ChartFontsAndSize):  # noqa: too-few-public-methods
             output_description=output_description,
             figure_format=figure_format,
         )
+        self.chart_quality_profile = CHART_QUALITY_PROFILES[chart_quality]
+        self.dpi = self.chart_quality_profile.dpi
 
     @utils.measure_memory_leak
     def plot(self, data: Any) -> ReportImageEntry:
@@ -138,6 +161,10 @@ class Line(Chart, ChartFontsAndSize):  # noqa: too-few-public-methods
 
         mpl.use("Agg")
 
+        if self.chart_quality_profile.downsample:
+            # a bucket of timesteps per pixel column
+            data = downsample_line(data, number_of_buckets=int(self.figsize[0] * self.dpi))
+
         _fig, axis = plt.subplots(figsize=self.figsize, dpi=self.dpi)
         x_zero = data.index
         plt.xticks(fontsize=self.fontsize_ticks, rotation=20)
@@ -3,9 +3,11 @@
 """Postprocessing option computes overall consumption, production,self-consumption and injection as well as selfconsumption rate and autarky rate."""
 
 import os
-from typing import List, Tuple, Union, Any
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple, Union, Any
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from hisim.component import ComponentOutput
@@ -17,82 +19,355 @@ from hisim.component_wrapper import ComponentWrapper
 from hisim.components import generic_hot_water_storage_modular
 from hisim import log
 from hisim.postprocessing.investment_cost_co2 import compute_investment_cost
+from hisim.result_store import ResultStore
 from hisim.sim_repository_singleton import SingletonSimRepository, SingletonDictKeyEnum
 
 
-def building_temperature_control(
-    results: pd.DataFrame, seconds_per_timestep: int
-) -> Tuple[Any, Any, float, float, float, float]:
-    """Check the building indoor air temperature.
+@dataclass
+class KpiOutputIndices:
 
-    Check for all timesteps and count the
-    time when the temperature is outside of the building set temperatures
-    in order to verify if energy system provides enough heating and cooling.
+    """Column indices of the outputs which are needed for the KPIs.
+
+    The outputs are classified once, the KPIs are then computed with numpy on the columns of the result matrix.
     """
 
-    time_indices_of_building_being_below_heating_set_temperature = []
-    time_indices_of_building_being_above_cooling_set_temperature = []
-    for column in results.columns:
-
-        if "TemperatureIndoorAir" in column.split(sep=" "):
-
-            if SingletonSimRepository().exist_entry(
-                key=SingletonDictKeyEnum.SETHEATINGTEMPERATUREFORBUILDING
-            ) and SingletonSimRepository().exist_entry(
-                key=SingletonDictKeyEnum.SETCOOLINGTEMPERATUREFORBUILDING
-            ):
-                set_heating_temperature_in_celsius = SingletonSimRepository().get_entry(
-                    key=SingletonDictKeyEnum.SETHEATINGTEMPERATUREFORBUILDING
-                )
-                set_cooling_temperature_in_celsius = SingletonSimRepository().get_entry(
-                    key=SingletonDictKeyEnum.SETCOOLINGTEMPERATUREFORBUILDING
-                )
-
-            else:
-                # take set heating and cooling default temperatures from building component otherwise
-                set_heating_temperature_in_celsius = 19.0
-                set_cooling_temperature_in_celsius = 24.0
-
-            for temperature in results[column].values:
-
-                if temperature < set_heating_temperature_in_celsius:
-                    time_indices_of_building_being_below_heating_set_temperature.append(
-                        results[column].index
-                    )
-
-                elif temperature > set_cooling_temperature_in_celsius:
-                    time_indices_of_building_being_above_cooling_set_temperature.append(
-                        results[column].index
-                    )
-
-            length_time_list_below_heating_set_temperature = len(
-                time_indices_of_building_being_below_heating_set_temperature
-            )
-            length_time_list_above_cooling_set_temperature = len(
-                time_indices_of_building_being_above_cooling_set_temperature
+    consumption: List[int] = field(default_factory=list)
+    production: List[int] = field(default_factory=list)
+    battery_charge_discharge: List[int] = field(default_factory=list)
+    electricity_price_consumption: Optional[int] = None
+    electricity_price_injection: Optional[int] = None
+    fuel_consumption: Dict[LoadTypes, int] = field(default_factory=dict)
+    water_heating_charge: List[int] = field(default_factory=list)
+    heating_charge: List[int] = field(default_factory=list)
+    boiler_discharge: List[int] = field(default_factory=list)
+    buffer_discharge: List[int] = field(default_factory=list)
+    indoor_air_temperature: List[int] = field(default_factory=list)
+
+
+@dataclass
+class SimulationKpis:
+
+    """KPIs of the energy use of a simulation, which only depend on the results."""
+
+    consumption_sum: float
+    production_sum: float
+    self_consumption_sum: float
+    injection_sum: float
+    battery_losses: float
+    self_consumption_rate: float
+    autarky_rate: float
+    price: float
+    co2: float
+    set_heating_temperature_in_celsius: float
+    set_cooling_temperature_in_celsius: float
+    time_in_hours_of_building_being_below_heating_set_temperature: float
+    time_in_hours_of_building_being_above_cooling_set_temperature: float
+    min_temperature_reached_in_celsius: float
+    max_temperature_reached_in_celsius: float
+
+
+def get_kpi_output_indices(all_outputs: List[ComponentOutput]) -> KpiOutputIndices:
+    """Classifies the outputs by their postprocessing flags."""
+    output_indices = KpiOutputIndices()
+    for index, output in enumerate(all_outputs):
+        if "TemperatureIndoorAir" in output.get_pretty_name().split(sep=" "):
+            output_indices.indoor_air_temperature.append(index)
+        if output.postprocessing_flag is None:
+            continue
+
+        if InandOutputType.ELECTRICITY_PRODUCTION in output.postprocessing_flag:
+            output_indices.production.append(index)
+        elif (
+            InandOutputType.ELECTRICITY_CONSUMPTION_EMS_CONTROLLED
+            in output.postprocessing_flag
+            or InandOutputType.ELECTRICITY_CONSUMPTION_UNCONTROLLED
+            in output.postprocessing_flag
+        ):
+            output_indices.consumption.append(index)
+        elif InandOutputType.CHARGE_DISCHARGE in output.postprocessing_flag:
+            if ComponentType.BATTERY in output.postprocessing_flag:
+                output_indices.battery_charge_discharge.append(index)
+            elif ComponentType.CAR_BATTERY in output.postprocessing_flag:
+                output_indices.consumption.append(index)
+
+        # the last price signal and the last consumption of a fuel are used
+        if LoadTypes.PRICE in output.postprocessing_flag:
+            if InandOutputType.ELECTRICITY_CONSUMPTION in output.postprocessing_flag:
+                output_indices.electricity_price_consumption = index
+            elif InandOutputType.ELECTRICITY_INJECTION in output.postprocessing_flag:
+                output_indices.electricity_price_injection = index
+        if InandOutputType.FUEL_CONSUMPTION in output.postprocessing_flag:
+            for fuel in LoadTypes:
+                if fuel in output.postprocessing_flag:
+                    output_indices.fuel_consumption[fuel] = index
+
+        if InandOutputType.CHARGE in output.postprocessing_flag:
+            if InandOutputType.WATER_HEATING in output.postprocessing_flag:
+                output_indices.water_heating_charge.append(index)
+            elif InandOutputType.HEATING in output.postprocessing_flag:
+                output_indices.heating_charge.append(index)
+        elif InandOutputType.DISCHARGE in output.postprocessing_flag:
+            if ComponentType.BOILER in output.postprocessing_flag:
+                output_indices.boiler_discharge.append(index)
+            elif ComponentType.BUFFER in output.postprocessing_flag:
+                output_indices.buffer_discharge.append(index)
+    return output_indices
+
+
+def get_sum_of_columns(
+    values: np.ndarray,
+    column_indices: List[int],
+    lower: Optional[float] = None,
+    upper: Optional[float] = None,
+) -> np.ndarray:
+    """Sums the clipped columns for all timesteps, missing values count as zero."""
+    # a row major copy sums the columns in the same order as pandas
+    columns = np.ascontiguousarray(values[:, column_indices], dtype=np.float64)
+    if lower is not None or upper is not None:
+        columns = np.clip(columns, lower, upper)
+    sums: np.ndarray = np.nan_to_num(columns, nan=0.0).sum(axis=1)
+    return sums
+
+
+def get_energy_in_kilowatt_hour(power: np.ndarray, seconds_per_timestep: int) -> float:
+    """Computes the energy in kWh of a power timeseries in W, missing values count as zero."""
+    return float(np.nansum(power) * seconds_per_timestep / 3.6e6)
+
+
+def get_set_temperatures_of_building() -> Tuple[float, float]:
+    """Gets the set heating and cooling temperatures of the building from the sim repository."""
+    if SingletonSimRepository().exist_entry(
+        key=SingletonDictKeyEnum.SETHEATINGTEMPERATUREFORBUILDING
+    ) and SingletonSimRepository().exist_entry(
+        key=SingletonDictKeyEnum.SETCOOLINGTEMPERATUREFORBUILDING
+    ):
+        return (
+            SingletonSimRepository().get_entry(key=SingletonDictKeyEnum.SETHEATINGTEMPERATUREFORBUILDING),
+            SingletonSimRepository().get_entry(key=SingletonDictKeyEnum.SETCOOLINGTEMPERATUREFORBUILDING),
+        )
+    # take set heating and cooling default temperatures from building component otherwise
+    return 19.0, 24.0
+
+
+def compute_building_temperature_kpis(
+    values: np.ndarray,
+    output_indices: KpiOutputIndices,
+    seconds_per_timestep: int,
+    set_heating_temperature_in_celsius: float,
+    set_cooling_temperature_in_celsius: float,
+) -> Tuple[float, float, float, float]:
+    """Counts the time when the indoor air temperature is outside of the building set temperatures.
+
+    The times of all indoor air temperatures are added up, the minimum and maximum are taken from the last one.
+    """
+    number_of_timesteps_below_heating_set_temperature = 0
+    number_of_timesteps_above_cooling_set_temperature = 0
+    min_temperature_reached_in_celsius = float("nan")
+    max_temperature_reached_in_celsius = float("nan")
+    for column_index in output_indices.indoor_air_temperature:
+        temperature = values[:, column_index]
+        below_heating_set_temperature = temperature < set_heating_temperature_in_celsius
+        number_of_timesteps_below_heating_set_temperature += int(np.count_nonzero(below_heating_set_temperature))
+        number_of_timesteps_above_cooling_set_temperature += int(
+            np.count_nonzero((temperature > set_cooling_temperature_in_celsius) & ~below_heating_set_temperature)
+        )
+        min_temperature_reached_in_celsius = float(np.min(temperature))
+        max_temperature_reached_in_celsius = float(np.max(temperature))
+    return (
+        number_of_timesteps_below_heating_set_temperature * seconds_per_timestep / 3600,
+        number_of_timesteps_above_cooling_set_temperature * seconds_per_timestep / 3600,
+        min_temperature_reached_in_celsius,
+        max_temperature_reached_in_celsius,
+    )
+
+
+def compute_fuel_consumption(
+    values: np.ndarray, output_indices: KpiOutputIndices, seconds_per_timestep: int, fuel: LoadTypes
+) -> float:
+    """Computes the consumption of a fuel in kWh, or in liters for oil and diesel."""
+    column_index = output_indices.fuel_consumption.get(fuel)
+    if column_index is None:
+        return 0
+    if fuel in [LoadTypes.ELECTRICITY, LoadTypes.GAS, LoadTypes.DISTRICTHEATING]:
+        return get_energy_in_kilowatt_hour(values[:, column_index], seconds_per_timestep)
+    # stay with liters
+    return float(np.sum(values[:, column_index]))
+
+
+def compute_simulation_kpis(
+    values: np.ndarray,
+    output_indices: KpiOutputIndices,
+    seconds_per_timestep: int,
+    price_frame: pd.DataFrame,
+    set_heating_temperature_in_celsius: float = 19.0,
+    set_cooling_temperature_in_celsius: float = 24.0,
+) -> SimulationKpis:
+    """Computes the energy, cost, CO2 and building temperature KPIs from the result matrix of a simulation."""
+    consumption = get_sum_of_columns(values, output_indices.consumption, lower=0)
+    production = get_sum_of_columns(values, output_indices.production, lower=0)
+    battery_charge = get_sum_of_columns(values, output_indices.battery_charge_discharge, lower=0)
+    battery_discharge = get_sum_of_columns(values, output_indices.battery_charge_discharge, upper=0) * (-1)
+
+    # sum consumption and production over time
+    consumption_sum = get_energy_in_kilowatt_hour(consumption, seconds_per_timestep)
+    production_sum = get_energy_in_kilowatt_hour(production, seconds_per_timestep)
+
+    # computes injection and self consumption + autarky and self consumption rates
+    if production_sum > 0:
+        injection, self_consumption = compute_self_consumption_and_injection_of_arrays(
+            consumption=consumption,
+            production=production,
+            battery_charge=battery_charge,
+            battery_discharge=battery_discharge,
+        )
+        injection_sum = get_energy_in_kilowatt_hour(injection[injection > 0], seconds_per_timestep)
+        self_consumption_sum = get_energy_in_kilowatt_hour(self_consumption, seconds_per_timestep)
+        self_consumption_rate = 100 * (self_consumption_sum / production_sum)
+        autarky_rate = 100 * (self_consumption_sum / consumption_sum)
+        battery_losses = get_energy_in_kilowatt_hour(
+            battery_charge, seconds_per_timestep
+        ) - get_energy_in_kilowatt_hour(battery_discharge, seconds_per_timestep)
+    else:
+        self_consumption_sum = 0
+        injection_sum = 0
+        self_consumption_rate = 0
+        autarky_rate = 0
+        battery_losses = 0
+
+    # Electricity Price
+    electricity_price_constant, co2_price_constant = get_euro_and_co2(
+        fuel_costs=price_frame, fuel=LoadTypes.ELECTRICITY
+    )
+    electricity_inj_price_constant, _ = get_euro_and_co2(
+        fuel_costs=price_frame, fuel=LoadTypes.ELECTRICITY
+    )
+
+    price = 0.0
+    if production_sum > 0:
+        # evaluate electricity price
+        if output_indices.electricity_price_injection is not None:
+            electricity_price_injection = values[:, output_indices.electricity_price_injection]
+            price = price - get_energy_in_kilowatt_hour(
+                injection[injection > 0] * electricity_price_injection[injection > 0], seconds_per_timestep
             )
-            time_in_hours_of_building_being_below_heating_set_temperature = (
-                length_time_list_below_heating_set_temperature
-                * seconds_per_timestep
-                / 3600
+            price = price + get_energy_in_kilowatt_hour(
+                consumption - self_consumption, seconds_per_timestep
+            )  # Todo: is this correct? (maybe not so important, only used if generic_price_signal is used
+        else:
+            price = (
+                price
+                - injection_sum * electricity_inj_price_constant
+                + (consumption_sum - self_consumption_sum) * electricity_price_constant
             )
-            time_in_hours_of_building_being_above_cooling_set_temperature = (
-                length_time_list_above_cooling_set_temperature
-                * seconds_per_timestep
-                / 3600
+    else:
+        if output_indices.electricity_price_consumption is not None:
+            # substract self consumption from consumption for bill calculation
+            price = price + get_energy_in_kilowatt_hour(
+                consumption * values[:, output_indices.electricity_price_consumption], seconds_per_timestep
             )
+        else:
+            price = price + consumption_sum * electricity_price_constant
 
-            # get also max and min indoor air temperature
-            min_temperature_reached_in_celsius = float(min(results[column].values))
-            max_temperature_reached_in_celsius = float(max(results[column].values))
+    co2 = 0.0 + (consumption_sum - self_consumption_sum) * co2_price_constant
 
-    return (
-        set_heating_temperature_in_celsius,
-        set_cooling_temperature_in_celsius,
+    # compute cost and co2 for LoadTypes other than electricity
+    for fuel in [
+        LoadTypes.GAS,
+        LoadTypes.OIL,
+        LoadTypes.DISTRICTHEATING,
+        LoadTypes.DIESEL,
+    ]:
+        fuel_consumption_sum = compute_fuel_consumption(values, output_indices, seconds_per_timestep, fuel)
+        fuel_price, fuel_co2 = get_euro_and_co2(fuel_costs=price_frame, fuel=fuel)
+        co2 = co2 + fuel_consumption_sum * fuel_co2
+        price = price + fuel_consumption_sum * fuel_price
+
+    # building temp control
+    (
         time_in_hours_of_building_being_below_heating_set_temperature,
         time_in_hours_of_building_being_above_cooling_set_temperature,
         min_temperature_reached_in_celsius,
         max_temperature_reached_in_celsius,
+    ) = compute_building_temperature_kpis(
+        values=values,
+        output_indices=output_indices,
+        seconds_per_timestep=seconds_per_timestep,
+        set_heating_temperature_in_celsius=set_heating_temperature_in_celsius,
+        set_cooling_temperature_in_celsius=set_cooling_temperature_in_celsius,
+    )
+
+    return SimulationKpis(
+        consumption_sum=consumption_sum,
+        production_sum=production_sum,
+        self_consumption_sum=self_consumption_sum,
+        injection_sum=injection_sum,
+        battery_losses=battery_losses,
+        self_consumption_rate=self_consumption_rate,
+        autarky_rate=autarky_rate,
+        price=price,
+        co2=co2,
+        set_heating_temperature_in_celsius=set_heating_temperature_in_celsius,
+        set_cooling_temperature_in_celsius=set_cooling_temperature_in_celsius,
+        time_in_hours_of_building_being_below_heating_set_temperature=time_in_hours_of_building_being_below_heating_set_temperature,
+        time_in_hours_of_building_being_above_cooling_set_temperature=time_in_hours_of_building_being_above_cooling_set_temperature,
+        min_temperature_reached_in_celsius=min_temperature_reached_in_celsius,
+        max_temperature_reached_in_celsius=max_temperature_reached_in_celsius,
+    )
+
+
+def compute_kpis_of_result_stores(
+    result_directories: List[str],
+    set_heating_temperature_in_celsius: float = 19.0,
+    set_cooling_temperature_in_celsius: float = 24.0,
+) -> pd.DataFrame:
+    """Computes the KPIs of finished simulations from their memory mapped result stores, one row per directory.
+
+    The simulations must have been run with memory_map_results. The set temperatures of the building are not part of
+    the result store and have to be given.
+    """
+    price_frame = read_in_fuel_costs()
+    rows = []
+    for result_directory in result_directories:
+        result_store = ResultStore.load(result_directory)
+        if result_store.seconds_per_timestep is None:
+            raise ValueError("The result store in " + result_directory + " does not know its seconds per timestep.")
+        simulation_kpis = compute_simulation_kpis(
+            values=result_store.values,
+            output_indices=get_kpi_output_indices(result_store.all_outputs),
+            seconds_per_timestep=result_store.seconds_per_timestep,
+            price_frame=price_frame,
+            set_heating_temperature_in_celsius=set_heating_temperature_in_celsius,
+            set_cooling_temperature_in_celsius=set_cooling_temperature_in_celsius,
+        )
+        rows.append(asdict(simulation_kpis))
+    return pd.DataFrame(rows, index=pd.Index(result_directories, name="result_directory"))
+
+
+def building_temperature_control(
+    results: pd.DataFrame, seconds_per_timestep: int
+) -> Tuple[Any, Any, float, float, float, float]:
+    """Check the building indoor air temperature.
+
+    Check for all timesteps and count the
+    time when the temperature is outside of the building set temperatures
+    in order to verify if energy system provides enough heating and cooling.
+    """
+    output_indices = KpiOutputIndices(
+        indoor_air_temperature=[
+            index for index, column in enumerate(results.columns) if "TemperatureIndoorAir" in column.split(sep=" ")
+        ]
+    )
+    set_heating_temperature_in_celsius, set_cooling_temperature_in_celsius = get_set_temperatures_of_building()
+    return (
+        set_heating_temperature_in_celsius,
+        set_cooling_temperature_in_celsius,
+        *compute_building_temperature_kpis(
+            values=results.to_numpy(dtype=np.float64),
+            output_indices=output_indices,
+            seconds_per_timestep=seconds_per_timestep,
+            set_heating_temperature_in_celsius=set_heating_temperature_in_celsius,
+            set_cooling_temperature_in_celsius=set_cooling_temperature_in_celsius,
+        ),
     )
 
 
@@ -123,52 +398,17 @@ def compute_consumption_production(
     storage charge/discharge is flagged with InandOutputType.CHARGE_DISCHARGE. For batteries to be considered as wished, they additionally need the
     Component itself as postprocesessing flag: ComponentType.CAR_BATTERY or ComponentType.BATTERY
     """
-
-    # initialize columns consumption, production, battery_charge, battery_discharge, storage
-    consumption_ids = []
-    production_ids = []
-    battery_charge_discharge_ids = []
-
-    index: int
-    output: ComponentOutput
-
-    for index, output in enumerate(all_outputs):
-        if output.postprocessing_flag is not None:
-            if InandOutputType.ELECTRICITY_PRODUCTION in output.postprocessing_flag:
-                production_ids.append(index)
-
-            elif (
-                InandOutputType.ELECTRICITY_CONSUMPTION_EMS_CONTROLLED
-                in output.postprocessing_flag
-                or InandOutputType.ELECTRICITY_CONSUMPTION_UNCONTROLLED
-                in output.postprocessing_flag
-            ):
-                consumption_ids.append(index)
-            elif InandOutputType.CHARGE_DISCHARGE in output.postprocessing_flag:
-                if ComponentType.BATTERY in output.postprocessing_flag:
-                    battery_charge_discharge_ids.append(index)
-                elif ComponentType.CAR_BATTERY in output.postprocessing_flag:
-                    consumption_ids.append(index)
-        else:
-            continue
-
-    postprocessing_results = pd.DataFrame()
-    postprocessing_results["consumption"] = (
-        pd.DataFrame(results.iloc[:, consumption_ids]).clip(lower=0).sum(axis=1)
-    )
-    postprocessing_results["production"] = (
-        pd.DataFrame(results.iloc[:, production_ids]).clip(lower=0).sum(axis=1)
+    output_indices = get_kpi_output_indices(all_outputs)
+    values = results.to_numpy(dtype=np.float64)
+    postprocessing_results = pd.DataFrame(index=results.index)
+    postprocessing_results["consumption"] = get_sum_of_columns(values, output_indices.consumption, lower=0)
+    postprocessing_results["production"] = get_sum_of_columns(values, output_indices.production, lower=0)
+    postprocessing_results["battery_charge"] = get_sum_of_columns(
+        values, output_indices.battery_charge_discharge, lower=0
     )
-
-    postprocessing_results["battery_charge"] = (
-        pd.DataFrame(results.iloc[:, battery_charge_discharge_ids])
-        .clip(lower=0)
-        .sum(axis=1)
-    )
-    postprocessing_results["battery_discharge"] = pd.DataFrame(
-        results.iloc[:, battery_charge_discharge_ids]
-    ).clip(upper=0).sum(axis=1) * (-1)
-
+    postprocessing_results["battery_discharge"] = get_sum_of_columns(
+        values, output_indices.battery_charge_discharge, upper=0
+    ) * (-1)
     return postprocessing_results
 
 
@@ -179,12 +419,6 @@ def compute_hot_water_storage_losses_and_cycles(
     timeresolution: int,
 ) -> Tuple[float, float, float, float, float, float]:
     """Computes hot water storage losses and cycles."""
-
-    # initialize columns consumption, production, battery_charge, battery_discharge, storage
-    charge_sum_dhw = 0.0
-    charge_sum_buffer = 0.0
-    discharge_sum_dhw = 0.0
-    discharge_sum_buffer = 0.0
     cycle_buffer = None
     cycle_dhw = None
 
@@ -199,51 +433,37 @@ def compute_hot_water_storage_losses_and_cycles(
             elif use == ComponentType.BOILER:
                 cycle_dhw = elem.my_component.config.energy_full_cycle
 
-    for index, output in enumerate(all_outputs):
-        if output.postprocessing_flag is not None:
-            if InandOutputType.CHARGE in output.postprocessing_flag:
-                if InandOutputType.WATER_HEATING in output.postprocessing_flag:
-                    charge_sum_dhw = charge_sum_dhw + compute_energy_from_power(
-                        power_timeseries=results.iloc[:, index],
-                        timeresolution=timeresolution,
-                    )
-                elif InandOutputType.HEATING in output.postprocessing_flag:
-                    charge_sum_buffer = charge_sum_buffer + compute_energy_from_power(
-                        power_timeseries=results.iloc[:, index],
-                        timeresolution=timeresolution,
-                    )
-            elif InandOutputType.DISCHARGE in output.postprocessing_flag:
-                if ComponentType.BOILER in output.postprocessing_flag:
-                    discharge_sum_dhw = discharge_sum_dhw + compute_energy_from_power(
-                        power_timeseries=results.iloc[:, index],
-                        timeresolution=timeresolution,
-                    )
-                elif ComponentType.BUFFER in output.postprocessing_flag:
-                    discharge_sum_buffer = (
-                        discharge_sum_buffer
-                        + compute_energy_from_power(
-                            power_timeseries=results.iloc[:, index],
-                            timeresolution=timeresolution,
-                        )
-                    )
-        else:
-            continue
-        if cycle_dhw is not None:
-            cycles_dhw = charge_sum_dhw / cycle_dhw
-        else:
-            cycles_dhw = 0
-            log.error(
-                "Energy of full cycle must be defined in config of modular hot water storage to compute the number of cycles. "
-            )
-        storage_loss_dhw = charge_sum_dhw - discharge_sum_dhw
-        if cycle_buffer is not None:
-            cycles_buffer = charge_sum_buffer / cycle_buffer
-        else:
-            cycles_buffer = 0
-            log.error(
-                "Energy of full cycle must be defined in config of modular hot water storage to compute the number of cycles. "
-            )
-        storage_loss_buffer = charge_sum_buffer - discharge_sum_buffer
+    output_indices = get_kpi_output_indices(all_outputs)
+    values = results.to_numpy(dtype=np.float64)
+
+    def get_energy_of_columns(column_indices: List[int]) -> float:
+        """Adds up the energy of the columns one after another."""
+        energy_sum = 0.0
+        for column_index in column_indices:
+            energy_sum = energy_sum + get_energy_in_kilowatt_hour(values[:, column_index], timeresolution)
+        return energy_sum
+
+    charge_sum_dhw = get_energy_of_columns(output_indices.water_heating_charge)
+    charge_sum_buffer = get_energy_of_columns(output_indices.heating_charge)
+    discharge_sum_dhw = get_energy_of_columns(output_indices.boiler_discharge)
+    discharge_sum_buffer = get_energy_of_columns(output_indices.buffer_discharge)
+
+    if cycle_dhw is not None:
+        cycles_dhw = charge_sum_dhw / cycle_dhw
+    else:
+        cycles_dhw = 0
+        log.error(
+            "Energy of full cycle must be defined in config of modular hot water storage to compute the number of cycles. "
+        )
+    storage_loss_dhw = charge_sum_dhw - discharge_sum_dhw
+    if cycle_buffer is not None:
+        cycles_buffer = charge_sum_buffer / cycle_buffer
+    else:
+        cycles_buffer = 0
+        log.error(
+            "Energy of full cycle must be defined in config of modular hot water storage to compute the number of cycles. "
+        )
+    storage_loss_buffer = charge_sum_buffer - discharge_sum_buffer
     if cycle_buffer == 0:
         building_heating = charge_sum_buffer
     else:
@@ -259,68 +479,59 @@ def compute_hot_water_storage_losses_and_cycles(
     )
 
 
-def compute_self_consumption_and_injection(
-    postprocessing_results: pd.DataFrame,
-) -> Tuple[pd.Series, pd.Series]:
-    """Computes the self consumption and the grid injection."""
+def compute_self_consumption_and_injection_of_arrays(
+    consumption: np.ndarray,
+    production: np.ndarray,
+    battery_charge: np.ndarray,
+    battery_discharge: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the self consumption and the grid injection for all timesteps."""
     # account for battery
-    production_with_battery = (
-        postprocessing_results["production"]
-        + postprocessing_results["battery_discharge"]
-    )
-    consumption_with_battery = (
-        postprocessing_results["consumption"] + postprocessing_results["battery_charge"]
-    )
+    production_with_battery = production + battery_discharge
+    consumption_with_battery = consumption + battery_charge
 
-    # evaluate injection and sum over time
+    # evaluate injection
     injection = production_with_battery - consumption_with_battery
 
-    # evaluate self consumption and immidiately sum over time
+    # evaluate self consumption
     # battery is charged (counting to consumption) and discharged (counting to production)
     # -> only one direction can be counted, otherwise the self-consumption can be greater than 100.
     # Here the production side is counted (battery_discharge).
-    self_consumption = (
-        pd.concat(
-            (
-                production_with_battery[
-                    production_with_battery <= postprocessing_results["consumption"]
-                ],
-                postprocessing_results["consumption"][
-                    postprocessing_results["consumption"] < production_with_battery
-                ],
-            )
-        )
-        .groupby(level=0)
-        .sum()
-    )
-
+    self_consumption = np.where(production_with_battery <= consumption, production_with_battery, consumption)
     return injection, self_consumption
 
 
+def compute_self_consumption_and_injection(
+    postprocessing_results: pd.DataFrame,
+) -> Tuple[pd.Series, pd.Series]:
+    """Computes the self consumption and the grid injection."""
+    injection, self_consumption = compute_self_consumption_and_injection_of_arrays(
+        consumption=postprocessing_results["consumption"].to_numpy(),
+        production=postprocessing_results["production"].to_numpy(),
+        battery_charge=postprocessing_results["battery_charge"].to_numpy(),
+        battery_discharge=postprocessing_results["battery_discharge"].to_numpy(),
+    )
+    return (
+        pd.Series(injection, index=postprocessing_results.index),
+        pd.Series(self_consumption, index=postprocessing_results.index),
+    )
+
+
 def search_electricity_prices_in_results(
     all_outputs: List, results: pd.DataFrame
 ) -> Tuple["pd.Series[float]", "pd.Series[float]"]:
     """Extracts electricity price consumption and electricity price production from results."""
+    output_indices = get_kpi_output_indices(all_outputs)
     electricity_price_consumption = pd.Series(
         dtype=pd.Float64Dtype
     )  # type: pd.Series[float]
     electricity_price_injection = pd.Series(
         dtype=pd.Float64Dtype
     )  # type: pd.Series[float]
-    for index, output in enumerate(all_outputs):
-        if output.postprocessing_flag is not None:
-            if LoadTypes.PRICE in output.postprocessing_flag:
-                if (
-                    InandOutputType.ELECTRICITY_CONSUMPTION
-                    in output.postprocessing_flag
-                ):
-                    electricity_price_consumption = results.iloc[:, index]
-                elif (
-                    InandOutputType.ELECTRICITY_INJECTION in output.postprocessing_flag
-                ):
-                    electricity_price_injection = results.iloc[:, index]
-                else:
-                    continue
+    if output_indices.electricity_price_consumption is not None:
+        electricity_price_consumption = results.iloc[:, output_indices.electricity_price_consumption]
+    if output_indices.electricity_price_injection is not None:
+        electricity_price_injection = results.iloc[:, output_indices.electricity_price_injection]
     return electricity_price_consumption, electricity_price_injection
 
 
@@ -341,28 +552,12 @@ def compute_cost_of_fuel_type(
     fuel: LoadTypes,
 ) -> Tuple[float, float]:
     """Computes the cost of the fuel type."""
-    fuel_consumption = pd.Series(dtype=pd.Float64Dtype)  # type: pd.Series[float]
-    for index, output in enumerate(all_outputs):
-        if output.postprocessing_flag is not None:
-            if InandOutputType.FUEL_CONSUMPTION in output.postprocessing_flag:
-                if fuel in output.postprocessing_flag:
-                    fuel_consumption = results.iloc[:, index]
-                else:
-                    continue
-    if not fuel_consumption.empty:
-        if fuel in [LoadTypes.ELECTRICITY, LoadTypes.GAS, LoadTypes.DISTRICTHEATING]:
-            consumption_sum = compute_energy_from_power(
-                power_timeseries=fuel_consumption, timeresolution=timeresolution
-            )
-        # convert from Wh to kWh
-        elif fuel in [LoadTypes.GAS, LoadTypes.DISTRICTHEATING]:
-            consumption_sum = sum(fuel_consumption) * 1e-3
-        # stay with liters
-        else:
-            consumption_sum = sum(fuel_consumption)
-    else:
-        consumption_sum = 0
-
+    consumption_sum = compute_fuel_consumption(
+        values=results.to_numpy(dtype=np.float64),
+        output_indices=get_kpi_output_indices(all_outputs),
+        seconds_per_timestep=timeresolution,
+        fuel=fuel,
+    )
     price, co2 = get_euro_and_co2(fuel_costs=price_frame, fuel=fuel)
     return consumption_sum * price, consumption_sum * co2
 
@@ -372,7 +567,7 @@ def compute_kpis(
     results: pd.DataFrame,
     all_outputs: List[ComponentOutput],
     simulation_parameters: SimulationParameters,
-) -> List[str]:  # noqa: MC0001
+) -> List[List[Any]]:  # noqa: MC0001
     """Calculation of Kpi's: self consumption rate, autarky rate, injection, annual CO2 emissions and annual cost.
 
     :param components: List of configured components in the HiSIM example
@@ -383,128 +578,28 @@ def compute_kpis(
     :type all_outputs: List[ComponentOutput]
     :param simulation_parameters: Simulation parameters for HiSIM calculation
     :type simulation_parameters: SimulationParameters
-    :return: Description for the report.
-    :rtype: List[str]
+    :return: Rows of the KPI table for the report.
+    :rtype: List[List[Any]]
     """
-    # initialize prices
-    price = 0.0
-    co2 = 0.0
-
-    price_frame = read_in_fuel_costs()
-
-    # compute consumption and production and extract price signals
-    postprocessing_results = compute_consumption_production(
-        all_outputs=all_outputs, results=results
-    )
-    (
-        electricity_price_consumption,
-        electricity_price_injection,
-    ) = search_electricity_prices_in_results(all_outputs=all_outputs, results=results)
-
-    # sum consumption and production over time
-    consumption_sum = compute_energy_from_power(
-        power_timeseries=postprocessing_results["consumption"],
-        timeresolution=simulation_parameters.seconds_per_timestep,
-    )
-
-    production_sum = compute_energy_from_power(
-        power_timeseries=postprocessing_results["production"],
-        timeresolution=simulation_parameters.seconds_per_timestep,
+    # the outputs are classified once and all KPIs are computed on the result matrix
+    set_heating_temperature_in_celsius, set_cooling_temperature_in_celsius = get_set_temperatures_of_building()
+    simulation_kpis = compute_simulation_kpis(
+        values=results.to_numpy(dtype=np.float64),
+        output_indices=get_kpi_output_indices(all_outputs),
+        seconds_per_timestep=simulation_parameters.seconds_per_timestep,
+        price_frame=read_in_fuel_costs(),
+        set_heating_temperature_in_celsius=set_heating_temperature_in_celsius,
+        set_cooling_temperature_in_celsius=set_cooling_temperature_in_celsius,
     )
-
-    # computes injection and self consumption + autarky and self consumption rates
-    if production_sum > 0:
-        injection, self_consumption = compute_self_consumption_and_injection(
-            postprocessing_results=postprocessing_results
-        )
-        injection_sum = compute_energy_from_power(
-            power_timeseries=injection[injection > 0],
-            timeresolution=simulation_parameters.seconds_per_timestep,
-        )
-
-        self_consumption_sum = compute_energy_from_power(
-            power_timeseries=self_consumption,
-            timeresolution=simulation_parameters.seconds_per_timestep,
-        )
-
-        self_consumption_rate = 100 * (self_consumption_sum / production_sum)
-        autarky_rate = 100 * (self_consumption_sum / consumption_sum)
-
-        if not postprocessing_results["battery_charge"].empty:
-            battery_losses = compute_energy_from_power(
-                power_timeseries=postprocessing_results["battery_charge"],
-                timeresolution=simulation_parameters.seconds_per_timestep,
-            ) - compute_energy_from_power(
-                power_timeseries=postprocessing_results["battery_discharge"],
-                timeresolution=simulation_parameters.seconds_per_timestep,
-            )
-
-    else:
-        self_consumption_sum = 0
-        injection_sum = 0
-        self_consumption_rate = 0
-        autarky_rate = 0
-        battery_losses = 0
-        # battery_soc = 0
-    # h2_system_losses = 0  # explicitly compute that
-
-    # Electricity Price
-    electricity_price_constant, co2_price_constant = get_euro_and_co2(
-        fuel_costs=price_frame, fuel=LoadTypes.ELECTRICITY
-    )
-    electricity_inj_price_constant, _ = get_euro_and_co2(
-        fuel_costs=price_frame, fuel=LoadTypes.ELECTRICITY
-    )
-
-    if production_sum > 0:
-        # evaluate electricity price
-        if not electricity_price_injection.empty:
-            price = price - compute_energy_from_power(
-                power_timeseries=injection[injection > 0]
-                * electricity_price_injection[injection > 0],
-                timeresolution=simulation_parameters.seconds_per_timestep,
-            )
-            price = price + compute_energy_from_power(
-                power_timeseries=postprocessing_results["consumption"]
-                - self_consumption,
-                timeresolution=simulation_parameters.seconds_per_timestep,
-            )  # Todo: is this correct? (maybe not so important, only used if generic_price_signal is used
-        else:
-            price = (
-                price
-                - injection_sum * electricity_inj_price_constant
-                + (consumption_sum - self_consumption_sum) * electricity_price_constant
-            )
-
-    else:
-        if not electricity_price_consumption.empty:
-            # substract self consumption from consumption for bill calculation
-            price = price + compute_energy_from_power(
-                power_timeseries=postprocessing_results["consumption"]
-                * electricity_price_consumption,
-                timeresolution=simulation_parameters.seconds_per_timestep,
-            )
-        else:
-            price = price + consumption_sum * electricity_price_constant
-
-    co2 = co2 + (consumption_sum - self_consumption_sum) * co2_price_constant
-
-    # compute cost and co2 for LoadTypes other than electricity
-    for fuel in [
-        LoadTypes.GAS,
-        LoadTypes.OIL,
-        LoadTypes.DISTRICTHEATING,
-        LoadTypes.DIESEL,
-    ]:
-        fuel_price, fuel_co2 = compute_cost_of_fuel_type(
-            results=results,
-            all_outputs=all_outputs,
-            timeresolution=simulation_parameters.seconds_per_timestep,
-            price_frame=price_frame,
-            fuel=fuel,
-        )
-        co2 = co2 + fuel_co2
-        price = price + fuel_price
+    consumption_sum = simulation_kpis.consumption_sum
+    production_sum = simulation_kpis.production_sum
+    self_consumption_sum = simulation_kpis.self_consumption_sum
+    injection_sum = simulation_kpis.injection_sum
+    battery_losses = simulation_kpis.battery_losses
+    self_consumption_rate = simulation_kpis.self_consumption_rate
+    autarky_rate = simulation_kpis.autarky_rate
+    price = simulation_kpis.price
+    co2 = simulation_kpis.co2
 
     # (
     #     cycles_dhw,
@@ -558,17 +653,15 @@ def compute_kpis(
         total_investment_cost_per_simulated_period = 0
         total_device_co2_footprint_per_simulated_period = 0
 
-    # building temp control
-    (
-        set_heating_temperature_in_celsius,
-        set_cooling_temperature_in_celsius,
-        time_in_hours_of_building_being_below_heating_set_temperature,
-        time_in_hours_of_building_being_above_cooling_set_temperature,
-        min_temperature_reached_in_celsius,
-        max_temperature_reached_in_celsius,
-    ) = building_temperature_control(
-        results=results, seconds_per_timestep=simulation_parameters.seconds_per_timestep
+    time_in_hours_of_building_being_below_heating_set_temperature = (
+        simulation_kpis.time_in_hours_of_building_being_below_heating_set_temperature
+    )
+    time_in_hours_of_building_being_above_cooling_set_temperature = (
+        simulation_kpis.time_in_hours_of_building_being_above_cooling_set_temperature
     )
+    min_temperature_reached_in_celsius = simulation_kpis.min_temperature_reached_in_celsius
+    max_temperature_reached_in_celsius = simulation_kpis.max_temperature_reached_in_celsius
+
     table_headline: List[object] = ["KPI", "Value", "Unit"]
     # initialize table for report
     table: List = []
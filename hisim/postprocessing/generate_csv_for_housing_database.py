@@ -10,6 +10,7 @@ import numpy as np
 import pandas as pd
 
 from hisim import log, utils
+from hisim.component import ComponentOutput
 from hisim.components.loadprofilegenerator_connector import OccupancyConfig
 from hisim.loadtypes import ComponentType, HeatingSystems, InandOutputType, LoadTypes
 from hisim.simulationparameters import SimulationParameters
@@ -47,105 +48,112 @@ def get_factor_cooking(occupancy_config: OccupancyConfig) -> float:
     return float(scaling_factor_line["ratio cooking to total"])
 
 
-def compute_seasonal(
-    csv_frame_seasonal: pd.DataFrame,
-    index_in_seasonal_frame: Tuple[str, str],
-    factor: float,
-    output: pd.Series,
-    day: pd.Series,
-    night: pd.Series,
-) -> pd.DataFrame:
-    """Takes annual time series and computes average consumption during day/night in summer, winter and intermediate time.
+#: Columns of the seasonal csv file, the position of a column is its label in the seasonal label array.
+SEASONAL_COLUMNS = [
+    "Summer-Day",
+    "Summer-Night",
+    "Winter-Day",
+    "Winter-Night",
+    "Intermediate-Day",
+    "Intermediate-Night",
+]
 
-    Summer from daylight 21.06.2019 to daylight 23.09.2019 (total 94 days)
-    Winter from 01.01.2019 - daylight 23.03.2019 and daylight 21.12.2019 to 31.12.2019 (total 92 days)
-    Intermediate from daylight 23.03.2029 - daylight 21.06.2019 and daylight 23.09.2019 - daylight 21.12.2019 (total 179)
-    """
+#: Row of the remaining electricity consumption, which is split into cooking and remaining load afterwards.
+REMAINING_ELECTRICITY_ROW = ("RemainingLoad", "Electricity [kWh]")
 
-    output_day = output[day.index]
-    output_night = output[night.index]
-    csv_frame_seasonal.loc[index_in_seasonal_frame, "Summer-Day"] = (
-        output_day[
-            (
-                (output_day.index > dt.datetime(year=2019, month=6, day=21, hour=0))
-                & (output_day.index < dt.datetime(year=2019, month=9, day=23, hour=0))
-            )
-        ].sum()
-        * factor
-        / 94
-    )
-    csv_frame_seasonal.loc[index_in_seasonal_frame, "Summer-Night"] = (
-        output_night[
-            (
-                (output_night.index > dt.datetime(year=2019, month=6, day=21, hour=12))
-                & (
-                    output_night.index
-                    < dt.datetime(year=2019, month=9, day=23, hour=12)
-                )
-            )
-        ].sum()
-        * factor
-        / 94
-    )
-    csv_frame_seasonal.loc[index_in_seasonal_frame, "Winter-Day"] = (
-        output_day[
-            (
-                (output_day.index > dt.datetime(year=2019, month=12, day=21, hour=0))
-                | (output_day.index < dt.datetime(year=2019, month=3, day=23, hour=0))
-            )
-        ].sum()
-        * factor
-        / 92
-    )
-    csv_frame_seasonal.loc[index_in_seasonal_frame, "Winter-Night"] = (
-        output_night[
-            (
-                (output_night.index > dt.datetime(year=2019, month=12, day=21, hour=12))
-                | (
-                    output_night.index
-                    < dt.datetime(year=2019, month=3, day=23, hour=12)
-                )
-            )
-        ].sum()
-        * factor
-        / 92
-    )
-    csv_frame_seasonal.loc[index_in_seasonal_frame, "Intermediate-Day"] = (
-        output_day[
-            (
-                (output_day.index > dt.datetime(year=2019, month=3, day=23, hour=0))
-                & (output_day.index < dt.datetime(year=2019, month=6, day=21, hour=0))
-            )
-            | (
-                (output_day.index > dt.datetime(year=2019, month=9, day=23, hour=0))
-                & (output_day.index < dt.datetime(year=2019, month=12, day=21, hour=0))
-            )
-        ].sum()
-        * factor
-        / 179
+
+def get_timestamps_of_simulation(
+    simulation_parameters: SimulationParameters, number_of_timesteps: int
+) -> pd.DatetimeIndex:
+    """Returns the timestamps of the time steps from the start date and the time resolution of the simulation."""
+    return pd.date_range(
+        start=simulation_parameters.start_date,
+        periods=number_of_timesteps,
+        freq=f"{simulation_parameters.seconds_per_timestep}s",
     )
-    csv_frame_seasonal.loc[index_in_seasonal_frame, "Intermediate-Night"] = (
-        output_night[
-            (
-                (output_night.index > dt.datetime(year=2019, month=3, day=23, hour=12))
-                & (
-                    output_night.index
-                    < dt.datetime(year=2019, month=6, day=21, hour=12)
-                )
-            )
-            | (
-                (output_night.index > dt.datetime(year=2019, month=9, day=23, hour=12))
-                & (
-                    output_night.index
-                    < dt.datetime(year=2019, month=12, day=21, hour=12)
-                )
+
+
+def get_seasonal_labels(timestamps: pd.DatetimeIndex, is_day: np.ndarray) -> np.ndarray:
+    """Labels every time step with its season and day/night, time steps of no season get the label -1.
+
+    Summer from daylight 21.06. to daylight 23.09.
+    Winter from 01.01. - daylight 23.03. and daylight 21.12. to 31.12.
+    Intermediate from daylight 23.03. - daylight 21.06. and daylight 23.09. - daylight 21.12.
+    Days start at 0 o'clock and nights at 12 o'clock, the labels are the positions in SEASONAL_COLUMNS.
+    """
+    labels = np.full(len(timestamps), -1, dtype=np.int8)
+    years = np.asarray(timestamps.year)
+    for year in np.unique(years):
+        for is_daytime, hour, label_offset in ((True, 0, 0), (False, 12, 1)):
+
+            def get_date(month: int, day: int) -> pd.Timestamp:
+                return pd.Timestamp(year=year, month=month, day=day, hour=hour)  # pylint: disable=cell-var-from-loop
+
+            selected = (years == year) & (is_day == is_daytime)
+            summer = (timestamps > get_date(6, 21)) & (timestamps < get_date(9, 23))
+            winter = (timestamps > get_date(12, 21)) | (timestamps < get_date(3, 23))
+            intermediate = ((timestamps > get_date(3, 23)) & (timestamps < get_date(6, 21))) | (
+                (timestamps > get_date(9, 23)) & (timestamps < get_date(12, 21))
             )
-        ].sum()
-        * factor
-        / 179
-    )
+            for season_index, season in enumerate((summer, winter, intermediate)):
+                labels[selected & np.asarray(season)] = 2 * season_index + label_offset
+    return labels
+
+
+def get_number_of_days_of_seasons(year: int) -> np.ndarray:
+    """Returns the number of days of the seasons of the year in the order of SEASONAL_COLUMNS."""
+    summer = (dt.datetime(year, 9, 23) - dt.datetime(year, 6, 21)).days
+    winter = (dt.datetime(year, 3, 23) - dt.datetime(year, 1, 1)).days + (
+        dt.datetime(year + 1, 1, 1) - dt.datetime(year, 12, 21)
+    ).days
+    intermediate = (dt.datetime(year, 6, 21) - dt.datetime(year, 3, 23)).days + (
+        dt.datetime(year, 12, 21) - dt.datetime(year, 9, 23)
+    ).days
+    return np.repeat(np.array([summer, winter, intermediate], dtype=float), 2)
 
-    return csv_frame_seasonal
+
+def compute_seasonal_sums(values: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Sums up all columns of the values per seasonal label with one matrix product.
+
+    Returns an array with one row per column of SEASONAL_COLUMNS and one column per column of the values.
+    """
+    indicator = labels[np.newaxis, :] == np.arange(len(SEASONAL_COLUMNS))[:, np.newaxis]
+    seasonal_sums: np.ndarray = indicator.astype(float) @ np.nan_to_num(values)
+    return seasonal_sums
+
+
+def get_row_and_factor_of_output(output: ComponentOutput, seconds_per_timestep: int) -> Optional[Tuple[Tuple[str, str], float]]:
+    """Returns the row in the csv files and the factor to convert the output into the unit of the row.
+
+    Outputs, which are not relevant for the housing data base, return None.
+    """
+    flag = output.postprocessing_flag
+    if flag is None:
+        return None
+    power_to_energy_factor = seconds_per_timestep / 3.6e6
+    if InandOutputType.WATER_HEATING in flag or InandOutputType.HEATING in flag:
+        category = "WaterHeating" if InandOutputType.WATER_HEATING in flag else "SpaceHeating"
+        if LoadTypes.DISTRICTHEATING in flag:
+            return (category, "Distributed Stream [kWh]"), 1e-3
+        if LoadTypes.GAS in flag:
+            return (category, "Gas [kWh]"), 1e-3
+        if LoadTypes.OIL in flag:
+            return (category, "Oil [l]"), 1
+        if HeatingSystems.HEAT_PUMP in flag:
+            return (category, "Electricity - HeatPump [kWh]"), power_to_energy_factor
+        if HeatingSystems.ELECTRIC_HEATING in flag:
+            return (category, "Electricity [kWh]"), power_to_energy_factor
+        return None
+    if ComponentType.CAR in flag:
+        if LoadTypes.DIESEL in flag:
+            return ("Transport", "Diesel [l]"), 1
+        return ("Transport", "Electricity [kWh]"), power_to_energy_factor
+    if (
+        InandOutputType.ELECTRICITY_CONSUMPTION_UNCONTROLLED in flag
+        or InandOutputType.ELECTRICITY_CONSUMPTION_EMS_CONTROLLED in flag
+    ):
+        return REMAINING_ELECTRICITY_ROW, power_to_energy_factor
+    return None
 
 
 def generate_csv_for_database(
@@ -218,281 +226,67 @@ def generate_csv_for_database(
     tuples = list(zip(*[device_index, units]))
 
     csv_frame_annual = pd.Series(
-        [0] * len(device_index),
+        [0.0] * len(device_index),
         index=pd.MultiIndex.from_tuples(tuples, names=["Category", "Fuel"]),
     )
-    csv_frame_seasonal = pd.DataFrame(
-        {
-            "Summer-Day": [0] * (len(device_index) - 10),
-            "Summer-Night": [0] * (len(device_index) - 10),
-            "Winter-Day": [0] * (len(device_index) - 10),
-            "Winter-Night": [0] * (len(device_index) - 10),
-            "Intermediate-Day": [0] * (len(device_index) - 10),
-            "Intermediate-Night": [0] * (len(device_index) - 10),
-        },
-        index=pd.MultiIndex.from_tuples(tuples[:-10], names=["Category", "Fuel"]),
-    )
-
-    remaining_electricity_annual = 0.0
-    remaining_electricity_seasonal = np.array([0.0] * 6)
+    seasonal_index = pd.MultiIndex.from_tuples(tuples[:-10], names=["Category", "Fuel"])
+    seasonal_values = np.zeros((len(seasonal_index), len(SEASONAL_COLUMNS)))
 
-    # get indices for day and night:
+    # collect all relevant outputs to reduce them together
+    rows: List[Tuple[str, str]] = []
+    column_indices: List[int] = []
+    factors: List[float] = []
+    altitude_index: Optional[int] = None
     for index, output in enumerate(all_outputs):
         if output.component_name == "Weather" and output.field_name == "Altitude":
-            altitude_data = results.iloc[:, index]
-            day = altitude_data[altitude_data > 0]
-            night = altitude_data[altitude_data <= 0]
+            altitude_index = index
+        row_and_factor = get_row_and_factor_of_output(output, simulation_parameters.seconds_per_timestep)
+        if row_and_factor is not None:
+            rows.append(row_and_factor[0])
+            column_indices.append(index)
+            factors.append(row_and_factor[1])
 
-    for index, output in enumerate(all_outputs):
-        if output.postprocessing_flag is not None:
-            if InandOutputType.WATER_HEATING in output.postprocessing_flag:
-                if LoadTypes.DISTRICTHEATING in output.postprocessing_flag:
-                    csv_frame_annual[("WaterHeating", "Distributed Stream [kWh]")] = (
-                        sum(results.iloc[:, index]) * 1e-3
-                    )
-                    csv_frame_seasonal = compute_seasonal(
-                        csv_frame_seasonal=csv_frame_seasonal,
-                        index_in_seasonal_frame=(
-                            "WaterHeating",
-                            "Distributed Stream [kWh]",
-                        ),
-                        factor=1e-3,
-                        output=results.iloc[:, index],
-                        day=day,
-                        night=night,
-                    )
-                elif LoadTypes.GAS in output.postprocessing_flag:
-                    csv_frame_annual[("WaterHeating", "Gas [kWh]")] = (
-                        sum(results.iloc[:, index]) * 1e-3
-                    )
-                    csv_frame_seasonal = compute_seasonal(
-                        csv_frame_seasonal=csv_frame_seasonal,
-                        index_in_seasonal_frame=("WaterHeating", "Gas [kWh]"),
-                        output=results.iloc[:, index],
-                        factor=1e-3,
-                        day=day,
-                        night=night,
-                    )
-                elif LoadTypes.OIL in output.postprocessing_flag:
-                    csv_frame_annual[("WaterHeating", "Oil [l]")] = sum(
-                        results.iloc[:, index]
-                    )
-                    csv_frame_seasonal = compute_seasonal(
-                        csv_frame_seasonal=csv_frame_seasonal,
-                        index_in_seasonal_frame=("WaterHeating", "Oil [l]"),
-                        output=results.iloc[:, index],
-                        factor=1,
-                        day=day,
-                        night=night,
-                    )
-                else:
-                    if HeatingSystems.HEAT_PUMP in output.postprocessing_flag:
-                        csv_frame_annual[
-                            ("WaterHeating", "Electricity - HeatPump [kWh]")
-                        ] = compute_energy_from_power(
-                            power_timeseries=results.iloc[:, index],
-                            seconds_per_timestep=simulation_parameters.seconds_per_timestep,
-                        )
-                        csv_frame_seasonal = compute_seasonal(
-                            csv_frame_seasonal=csv_frame_seasonal,
-                            index_in_seasonal_frame=(
-                                "WaterHeating",
-                                "Electricity - HeatPump [kWh]",
-                            ),
-                            factor=simulation_parameters.seconds_per_timestep / 3.6e6,
-                            output=results.iloc[:, index],
-                            day=day,
-                            night=night,
-                        )
-                    elif HeatingSystems.ELECTRIC_HEATING in output.postprocessing_flag:
-                        csv_frame_annual[
-                            ("WaterHeating", "Electricity [kWh]")
-                        ] = compute_energy_from_power(
-                            power_timeseries=results.iloc[:, index],
-                            seconds_per_timestep=simulation_parameters.seconds_per_timestep,
-                        )
-                        csv_frame_seasonal = compute_seasonal(
-                            csv_frame_seasonal=csv_frame_seasonal,
-                            index_in_seasonal_frame=(
-                                "WaterHeating",
-                                "Electricity [kWh]",
-                            ),
-                            factor=simulation_parameters.seconds_per_timestep / 3.6e6,
-                            output=results.iloc[:, index],
-                            day=day,
-                            night=night,
-                        )
-            elif InandOutputType.HEATING in output.postprocessing_flag:
-                if LoadTypes.DISTRICTHEATING in output.postprocessing_flag:
-                    csv_frame_annual[("SpaceHeating", "Distributed Stream [kWh]")] = (
-                        sum(results.iloc[:, index]) * 1e-3
-                    )
-                    csv_frame_seasonal = compute_seasonal(
-                        csv_frame_seasonal=csv_frame_seasonal,
-                        index_in_seasonal_frame=(
-                            "SpaceHeating",
-                            "Distributed Stream [kWh]",
-                        ),
-                        factor=1e-3,
-                        output=results.iloc[:, index],
-                        day=day,
-                        night=night,
-                    )
-                elif LoadTypes.GAS in output.postprocessing_flag:
-                    csv_frame_annual[("SpaceHeating", "Gas [kWh]")] = (
-                        sum(results.iloc[:, index]) * 1e-3
-                    )
-                    csv_frame_seasonal = compute_seasonal(
-                        csv_frame_seasonal=csv_frame_seasonal,
-                        index_in_seasonal_frame=("SpaceHeating", "Gas [kWh]"),
-                        factor=1e-3,
-                        output=results.iloc[:, index],
-                        day=day,
-                        night=night,
-                    )
-                elif LoadTypes.OIL in output.postprocessing_flag:
-                    csv_frame_annual[("SpaceHeating", "Oil [l]")] = sum(
-                        results.iloc[:, index]
-                    )
-                    csv_frame_seasonal = compute_seasonal(
-                        csv_frame_seasonal=csv_frame_seasonal,
-                        index_in_seasonal_frame=("SpaceHeating", "Oil [l]"),
-                        factor=1,
-                        output=results.iloc[:, index],
-                        day=day,
-                        night=night,
-                    )
-                else:
-                    if HeatingSystems.HEAT_PUMP in output.postprocessing_flag:
-                        csv_frame_annual[
-                            ("SpaceHeating", "Electricity - HeatPump [kWh]")
-                        ] = compute_energy_from_power(
-                            power_timeseries=results.iloc[:, index],
-                            seconds_per_timestep=simulation_parameters.seconds_per_timestep,
-                        )
-                        csv_frame_seasonal = compute_seasonal(
-                            csv_frame_seasonal=csv_frame_seasonal,
-                            index_in_seasonal_frame=(
-                                "SpaceHeating",
-                                "Electricity - HeatPump [kWh]",
-                            ),
-                            factor=simulation_parameters.seconds_per_timestep / 3.6e6,
-                            output=results.iloc[:, index],
-                            day=day,
-                            night=night,
-                        )
-                    elif HeatingSystems.ELECTRIC_HEATING in output.postprocessing_flag:
-                        csv_frame_annual[
-                            ("SpaceHeating", "Electricity [kWh]")
-                        ] = compute_energy_from_power(
-                            power_timeseries=results.iloc[:, index],
-                            seconds_per_timestep=simulation_parameters.seconds_per_timestep,
-                        )
-                        csv_frame_seasonal = compute_seasonal(
-                            csv_frame_seasonal=csv_frame_seasonal,
-                            index_in_seasonal_frame=(
-                                "SpaceHeating",
-                                "Electricity [kWh]",
-                            ),
-                            factor=simulation_parameters.seconds_per_timestep / 3.6e6,
-                            output=results.iloc[:, index],
-                            day=day,
-                            night=night,
-                        )
-            elif ComponentType.CAR in output.postprocessing_flag:
-                if LoadTypes.DIESEL in output.postprocessing_flag:
-                    csv_frame_annual[("Transport", "Diesel [l]")] = sum(
-                        results.iloc[:, index]
-                    )
-                    csv_frame_seasonal = compute_seasonal(
-                        csv_frame_seasonal=csv_frame_seasonal,
-                        index_in_seasonal_frame=("Transport", "Diesel [l]"),
-                        factor=1,
-                        output=results.iloc[:, index],
-                        day=day,
-                        night=night,
-                    )
-                else:
-                    csv_frame_annual[
-                        ("Transport", "Electricity [kWh]")
-                    ] = compute_energy_from_power(
-                        power_timeseries=results.iloc[:, index],
-                        seconds_per_timestep=simulation_parameters.seconds_per_timestep,
-                    )
-                    csv_frame_seasonal = compute_seasonal(
-                        csv_frame_seasonal=csv_frame_seasonal,
-                        index_in_seasonal_frame=("Transport", "Electricity [kWh]"),
-                        factor=simulation_parameters.seconds_per_timestep / 3.6e6,
-                        output=results.iloc[:, index],
-                        day=day,
-                        night=night,
-                    )
-            elif (
-                InandOutputType.ELECTRICITY_CONSUMPTION_UNCONTROLLED
-                in output.postprocessing_flag
-            ):
-                remaining_electricity_annual = (
-                    remaining_electricity_annual
-                    + compute_energy_from_power(
-                        power_timeseries=results.iloc[:, index],
-                        seconds_per_timestep=simulation_parameters.seconds_per_timestep,
-                    )
-                )
-                remaining_electricity_seasonal_item = compute_seasonal(
-                    csv_frame_seasonal=csv_frame_seasonal,
-                    index_in_seasonal_frame=("RemainingLoad", "Electricity [kWh]"),
-                    factor=simulation_parameters.seconds_per_timestep / 3.6e6,
-                    output=results.iloc[:, index],
-                    day=day,
-                    night=night,
-                ).loc[("RemainingLoad", "Electricity [kWh]")]
-                remaining_electricity_seasonal = (
-                    remaining_electricity_seasonal
-                    + np.array(remaining_electricity_seasonal_item)
-                )
-            elif (
-                InandOutputType.ELECTRICITY_CONSUMPTION_EMS_CONTROLLED
-                in output.postprocessing_flag
-            ):
-                remaining_electricity_annual = (
-                    remaining_electricity_annual
-                    + compute_energy_from_power(
-                        power_timeseries=results.iloc[:, index],
-                        seconds_per_timestep=simulation_parameters.seconds_per_timestep,
-                    )
-                )
-                remaining_electricity_seasonal_item = compute_seasonal(
-                    csv_frame_seasonal=csv_frame_seasonal,
-                    index_in_seasonal_frame=("RemainingLoad", "Electricity [kWh]"),
-                    factor=simulation_parameters.seconds_per_timestep / 3.6e6,
-                    output=results.iloc[:, index],
-                    day=day,
-                    night=night,
-                ).loc[("RemainingLoad", "Electricity [kWh]")]
-                remaining_electricity_seasonal = (
-                    remaining_electricity_seasonal
-                    + np.array(remaining_electricity_seasonal_item)
-                )
-        else:
-            continue
+    remaining_electricity_annual = 0.0
+    remaining_electricity_seasonal = np.zeros(len(SEASONAL_COLUMNS))
+    if rows:
+        if altitude_index is None:
+            raise ValueError("The housing data base needs the altitude of the sun from the weather component.")
+        # the seasons and day/night get computed once for the actual dates of the simulation
+        altitude = results.iloc[:, altitude_index].to_numpy()
+        timestamps = get_timestamps_of_simulation(
+            simulation_parameters=simulation_parameters, number_of_timesteps=len(results)
+        )
+        labels = get_seasonal_labels(timestamps=timestamps, is_day=altitude > 0)
+        values = results.iloc[:, column_indices].to_numpy()
+        factor_array = np.array(factors)
+        annual_sums = np.nansum(values, axis=0) * factor_array
+        seasonal_sums = (
+            compute_seasonal_sums(values=values, labels=labels)
+            * factor_array
+            / get_number_of_days_of_seasons(simulation_parameters.year)[:, np.newaxis]
+        )
+        for position, row in enumerate(rows):
+            if row == REMAINING_ELECTRICITY_ROW:
+                remaining_electricity_annual += annual_sums[position]
+                remaining_electricity_seasonal += seasonal_sums[:, position]
+            else:
+                csv_frame_annual[row] = annual_sums[position]
+                seasonal_values[seasonal_index.get_loc(row)] = seasonal_sums[:, position]
 
     if occupancy_config is None:
         factor_cooking = 0.0
     else:
         factor_cooking = get_factor_cooking(occupancy_config)
 
-    csv_frame_annual[
-        ("RemainingLoad", "Electricity [kWh]")
-    ] = remaining_electricity_annual * (1 - factor_cooking)
-    csv_frame_annual[("Cooking", "Electricity [kWh]")] = (
-        remaining_electricity_annual * factor_cooking
+    csv_frame_annual[REMAINING_ELECTRICITY_ROW] = remaining_electricity_annual * (1 - factor_cooking)
+    csv_frame_annual[("Cooking", "Electricity [kWh]")] = remaining_electricity_annual * factor_cooking
+    seasonal_values[seasonal_index.get_loc(REMAINING_ELECTRICITY_ROW)] = remaining_electricity_seasonal * (
+        1 - factor_cooking
     )
-    csv_frame_seasonal.loc[
-        ("RemainingLoad", "Electricity [kWh]")
-    ] = remaining_electricity_seasonal * (1 - factor_cooking)
-    csv_frame_seasonal.loc[("Cooking", "Electricity [kWh]")] = (
+    seasonal_values[seasonal_index.get_loc(("Cooking", "Electricity [kWh]"))] = (
         remaining_electricity_seasonal * factor_cooking
     )
+    csv_frame_seasonal = pd.DataFrame(seasonal_values, index=seasonal_index, columns=SEASONAL_COLUMNS)
 
     # extract infos from used climate data to compare to climate information used for tabula evaluation
     building_code = building_data["Code_BuildingVariant"].to_list()[0]
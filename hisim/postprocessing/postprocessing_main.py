@@ -2,20 +2,20 @@
 # clean
 import os
 import sys
-import copy
 from typing import Any, Optional, List, Dict
 from timeit import default_timer as timer
 import string
+import numpy as np
 import pandas as pd
 
 from hisim.components import building
 from hisim.components import loadprofilegenerator_connector
 from hisim.postprocessing import reportgenerator
-from hisim.postprocessing import charts
 from hisim import log
 from hisim import utils
 from hisim.postprocessingoptions import PostProcessingOptions
 from hisim.postprocessing.chart_singleday import ChartSingleDay
+from hisim.postprocessing.chart_rendering import ChartRenderer, ChartType
 from hisim.postprocessing.compute_kpis import compute_kpis
 from hisim.postprocessing.generate_csv_for_housing_database import (
     generate_csv_for_database,
@@ -36,6 +36,9 @@ class PostProcessor:
 
     """Core Post processor class."""
 
+    # rows of the pyam tables that get built and written at once
+    PyamRowsPerBatch = 1000000
+
     @utils.measure_execution_time
     def __init__(self):
         """Initializes the post processing."""
@@ -86,45 +89,62 @@ class PostProcessor:
         )
         days = {"month": 0, "day": 0}
         system_chart_entries: List[SystemChartEntry] = []
-        # Make plots
-        if PostProcessingOptions.PLOT_LINE in ppdt.post_processing_options:
-            log.information("Making line plots.")
-            start = timer()
-            self.make_line_plots(ppdt, report_image_entries=report_image_entries)
-            end = timer()
-            duration = end - start
-            log.information("Making line plots took " + f"{duration:1.2f}s.")
-        if PostProcessingOptions.PLOT_CARPET in ppdt.post_processing_options:
-            log.information("Making carpet plots.")
-            start = timer()
-            self.make_carpet_plots(ppdt, report_image_entries=report_image_entries)
-            end = timer()
-            duration = end - start
-            log.information("Making carpet plots took " + f"{duration:1.2f}s.")
-        if PostProcessingOptions.PLOT_SINGLE_DAYS in ppdt.post_processing_options:
-            log.information("Making single day plots.")
-            start = timer()
-            self.make_single_day_plots(
-                days, ppdt, report_image_entries=report_image_entries
-            )
-            end = timer()
-            duration = end - start
-            log.information("Making single day plots took " + f"{duration:1.2f}s.")
+        # Make plots, all chart types share the process pool of the chart renderer
+        chart_renderer = ChartRenderer(ppdt)
+        try:
+            if PostProcessingOptions.PLOT_LINE in ppdt.post_processing_options:
+                log.information("Making line plots.")
+                start = timer()
+                self.make_line_plots(
+                    ppdt,
+                    report_image_entries=report_image_entries,
+                    chart_renderer=chart_renderer,
+                )
+                end = timer()
+                duration = end - start
+                log.information("Making line plots took " + f"{duration:1.2f}s.")
+            if PostProcessingOptions.PLOT_CARPET in ppdt.post_processing_options:
+                log.information("Making carpet plots.")
+                start = timer()
+                self.make_carpet_plots(
+                    ppdt,
+                    report_image_entries=report_image_entries,
+                    chart_renderer=chart_renderer,
+                )
+                end = timer()
+                duration = end - start
+                log.information("Making carpet plots took " + f"{duration:1.2f}s.")
+            if PostProcessingOptions.PLOT_SINGLE_DAYS in ppdt.post_processing_options:
+                log.information("Making single day plots.")
+                start = timer()
+                self.make_single_day_plots(
+                    days,
+                    ppdt,
+                    report_image_entries=report_image_entries,
+                    chart_renderer=chart_renderer,
+                )
+                end = timer()
+                duration = end - start
+                log.information("Making single day plots took " + f"{duration:1.2f}s.")
 
-        # make monthly bar plots only if simulation duration approximately a year
-        if (
-            PostProcessingOptions.PLOT_MONTHLY_BAR_CHARTS
-            in ppdt.post_processing_options
-            and ppdt.simulation_parameters.duration.days >= 360
-        ):
-            log.information("Making monthly bar charts.")
-            start = timer()
-            self.make_monthly_bar_charts(
-                ppdt, report_image_entries=report_image_entries
-            )
-            end = timer()
-            duration = end - start
-            log.information("Making monthly bar plots took " + f"{duration:1.2f}s.")
+            # make monthly bar plots only if simulation duration approximately a year
+            if (
+                PostProcessingOptions.PLOT_MONTHLY_BAR_CHARTS
+                in ppdt.post_processing_options
+                and ppdt.simulation_parameters.duration.days >= 360
+            ):
+                log.information("Making monthly bar charts.")
+                start = timer()
+                self.make_monthly_bar_charts(
+                    ppdt,
+                    report_image_entries=report_image_entries,
+                    chart_renderer=chart_renderer,
+                )
+                end = timer()
+                duration = end - start
+                log.information("Making monthly bar plots took " + f"{duration:1.2f}s.")
+        finally:
+            chart_renderer.close()
 
         # Export all results to CSV
         if PostProcessingOptions.EXPORT_TO_CSV in ppdt.post_processing_options:
@@ -350,99 +370,65 @@ class PostProcessor:
         self,
         ppdt: PostProcessingDataTransfer,
         report_image_entries: List[ReportImageEntry],
+        chart_renderer: Optional[ChartRenderer] = None,
     ) -> None:
         """Make bar charts."""
-        for index, output in enumerate(ppdt.all_outputs):
-            my_bar = charts.BarChart(
-                output=output.full_name,
-                component_name=output.component_name,
-                units=output.unit,
-                directory_path=os.path.join(
-                    ppdt.simulation_parameters.result_directory
-                ),
-                time_correction_factor=ppdt.time_correction_factor,
-                output_description=output.output_description,
-                figure_format=ppdt.simulation_parameters.figure_format,
-            )
-            my_entry = my_bar.plot(data=ppdt.results_monthly.iloc[:, index])
-            report_image_entries.append(my_entry)
+        self.render_charts(ppdt, report_image_entries, chart_renderer, ChartType.MONTHLY_BAR)
 
     def make_single_day_plots(
         self,
         days: Dict[str, int],
         ppdt: PostProcessingDataTransfer,
         report_image_entries: List[ReportImageEntry],
+        chart_renderer: Optional[ChartRenderer] = None,
     ) -> None:
         """Makes plots for selected days."""
-        for index, output in enumerate(ppdt.all_outputs):
-            my_days = ChartSingleDay(
-                output=output.full_name,
-                component_name=output.component_name,
-                units=output.unit,
-                directory_path=ppdt.simulation_parameters.result_directory,
-                time_correction_factor=ppdt.time_correction_factor,
-                day=days["day"],
-                month=days["month"],
-                data=ppdt.results.iloc[:, index],
-                output_description=output.output_description,
-                figure_format=ppdt.simulation_parameters.figure_format,
-            )
-            my_entry = my_days.plot(close=True)
-            report_image_entries.append(my_entry)
+        self.render_charts(
+            ppdt,
+            report_image_entries,
+            chart_renderer,
+            ChartType.SINGLE_DAY,
+            day=days["day"],
+            month=days["month"],
+        )
 
     def make_carpet_plots(
         self,
         ppdt: PostProcessingDataTransfer,
         report_image_entries: List[ReportImageEntry],
+        chart_renderer: Optional[ChartRenderer] = None,
     ) -> None:
         """Make carpet plots."""
-        for index, output in enumerate(ppdt.all_outputs):
-            log.trace("Making carpet plots")
-            my_carpet = charts.Carpet(
-                output=output.full_name,
-                component_name=output.component_name,
-                units=output.unit,
-                directory_path=ppdt.simulation_parameters.result_directory,
-                time_correction_factor=ppdt.time_correction_factor,
-                output_description=output.output_description,
-                figure_format=ppdt.simulation_parameters.figure_format,
-            )
-
-            my_entry = my_carpet.plot(
-                xdims=int(
-                    (
-                        ppdt.simulation_parameters.end_date
-                        - ppdt.simulation_parameters.start_date
-                    ).days
-                ),
-                data=ppdt.results.iloc[:, index],
-            )
-            report_image_entries.append(my_entry)
+        self.render_charts(ppdt, report_image_entries, chart_renderer, ChartType.CARPET)
 
     @utils.measure_memory_leak
     def make_line_plots(
         self,
         ppdt: PostProcessingDataTransfer,
         report_image_entries: List[ReportImageEntry],
+        chart_renderer: Optional[ChartRenderer] = None,
     ) -> None:
         """Makes the line plots."""
-        for index, output in enumerate(ppdt.all_outputs):
-            if output.output_description is None:
-                raise ValueError(
-                    "Output description was missing for " + output.full_name
-                )
-            my_line = charts.Line(
-                output=output.full_name,
-                component_name=output.component_name,
-                units=output.unit,
-                directory_path=ppdt.simulation_parameters.result_directory,
-                time_correction_factor=ppdt.time_correction_factor,
-                output_description=output.output_description,
-                figure_format=ppdt.simulation_parameters.figure_format,
-            )
-            my_entry = my_line.plot(data=ppdt.results.iloc[:, index])
-            report_image_entries.append(my_entry)
-            del my_line
+        self.render_charts(ppdt, report_image_entries, chart_renderer, ChartType.LINE)
+
+    def render_charts(
+        self,
+        ppdt: PostProcessingDataTransfer,
+        report_image_entries: List[ReportImageEntry],
+        chart_renderer: Optional[ChartRenderer],
+        chart_type: ChartType,
+        day: int = 0,
+        month: int = 0,
+    ) -> None:
+        """Renders one chart type for all outputs, with a renderer of its own if none is shared."""
+        if chart_renderer is not None:
+            report_image_entries.extend(chart_renderer.render(chart_type, day=day, month=month))
+            return
+        own_chart_renderer = ChartRenderer(ppdt)
+        try:
+            report_image_entries.extend(own_chart_renderer.render(chart_type, day=day, month=month))
+        finally:
+            own_chart_renderer.close()
 
     @utils.measure_execution_time
     def export_results_to_csv(self, ppdt: PostProcessingDataTransfer) -> None:
@@ -745,19 +731,7 @@ class PostProcessor:
             )
 
         # --------------------------------------------------------------------------------------------------------------------------------------------------------------
-        # make dictionaries with pyam data structure for hourly and yearly data
-        simple_dict_hourly_data: Dict = {
-            "model": [],
-            "scenario": [],
-            "region": [],
-            "variable": [],
-            "unit": [],
-            "time": [],
-            "value": [],
-        }
-        simple_dict_daily_data: Dict = copy.deepcopy(simple_dict_hourly_data)
-        simple_dict_monthly_data: Dict = copy.deepcopy(simple_dict_hourly_data)
-
+        # make dictionary with pyam data structure for yearly data
         simple_dict_cumulative_data: Dict = {
             "model": [],
             "scenario": [],
@@ -788,12 +762,8 @@ class PostProcessor:
         else:
             self.region = ""
 
-        # set pyam year or timeseries
+        # set pyam year
         self.year = ppdt.simulation_parameters.year
-        timeseries_hourly = ppdt.results_hourly.index
-        log.information(str(timeseries_hourly))
-        timeseries_daily = ppdt.results_daily.index
-        timeseries_monthly = ppdt.results_monthly.index
 
         if (
             PostProcessingOptions.COMPUTE_AND_WRITE_KPIS_TO_REPORT
@@ -803,52 +773,23 @@ class PostProcessor:
                 ppdt=ppdt, simple_dict_cumulative_data=simple_dict_cumulative_data
             )
 
-        # got through all components and read output values, variables and units
-        # for hourly data
-        dataframe_hourly_data = self.iterate_over_results_and_add_values_to_dict(
-            results_df=ppdt.results_hourly,
-            dict_to_check=simple_dict_hourly_data,
-            timeseries=timeseries_hourly,
-        )
-        self.write_filename_and_save_to_csv(
-            dataframe=dataframe_hourly_data,
-            folder=self.pyam_data_folder,
-            module_filename=ppdt.module_filename,
-            simulation_duration=ppdt.simulation_parameters.duration.days,
-            simulation_year=ppdt.simulation_parameters.year,
-            region=self.region,
-            time_resolution_of_data="hourly",
-        )
-        # for daily data
-        dataframe_daily_data = self.iterate_over_results_and_add_values_to_dict(
-            results_df=ppdt.results_daily,
-            dict_to_check=simple_dict_daily_data,
-            timeseries=timeseries_daily,
-        )
-        self.write_filename_and_save_to_csv(
-            dataframe=dataframe_daily_data,
-            folder=self.pyam_data_folder,
-            module_filename=ppdt.module_filename,
-            simulation_duration=ppdt.simulation_parameters.duration.days,
-            simulation_year=ppdt.simulation_parameters.year,
-            region=self.region,
-            time_resolution_of_data="daily",
-        )
-        # for monthly data
-        dataframe_monthly_data = self.iterate_over_results_and_add_values_to_dict(
-            results_df=ppdt.results_monthly,
-            dict_to_check=simple_dict_monthly_data,
-            timeseries=timeseries_monthly,
-        )
-        self.write_filename_and_save_to_csv(
-            dataframe=dataframe_monthly_data,
-            folder=self.pyam_data_folder,
-            module_filename=ppdt.module_filename,
-            simulation_duration=ppdt.simulation_parameters.duration.days,
-            simulation_year=ppdt.simulation_parameters.year,
-            region=self.region,
-            time_resolution_of_data="monthly",
-        )
+        # write the hourly, daily and monthly values of all outputs
+        for time_resolution_of_data, results_df in [
+            ("hourly", ppdt.results_hourly),
+            ("daily", ppdt.results_daily),
+            ("monthly", ppdt.results_monthly),
+        ]:
+            self.write_results_to_pyam_csv(
+                results_df=results_df,
+                filename=self.get_pyam_csv_filename(
+                    folder=self.pyam_data_folder,
+                    module_filename=ppdt.module_filename,
+                    time_resolution_of_data=time_resolution_of_data,
+                    simulation_duration=ppdt.simulation_parameters.duration.days,
+                    simulation_year=ppdt.simulation_parameters.year,
+                    region=self.region,
+                ),
+            )
 
         # got through all components and read output values, variables and units for simple_dict_cumulative_data
         for column in ppdt.results_cumulative:
@@ -966,35 +907,62 @@ class PostProcessor:
 
         return variable_name, unit
 
-    def iterate_over_results_and_add_values_to_dict(
-        self, results_df: pd.DataFrame, dict_to_check: Dict[str, Any], timeseries: Any
-    ) -> pd.DataFrame:
-        """Iterate over results and add values to dict, write to dataframe and save as csv."""
-
-        for column in results_df:
-
-            for index, timestep in enumerate(timeseries):
-                # values = ppdt.results_hourly[column].values
-                values = results_df[column].values
-
-                (
-                    variable_name,
-                    unit,
-                ) = self.get_variable_name_and_unit_from_ppdt_results_column(
-                    column=str(column)
-                )
-
-                dict_to_check["model"].append(self.model)
-                dict_to_check["scenario"].append(self.scenario)
-                dict_to_check["region"].append(self.region)
-                dict_to_check["variable"].append(variable_name)
-                dict_to_check["unit"].append(unit)
-                dict_to_check["time"].append(timestep)
-                dict_to_check["value"].append(values[index])
-
-        dataframe_from_dict = pd.DataFrame(dict_to_check)
+    def get_pyam_data_of_results(self, results_df: pd.DataFrame) -> pd.DataFrame:
+        """Get the values of all columns and timesteps as pyam table, with one row per column and timestep."""
+        variable_names_and_units = [
+            self.get_variable_name_and_unit_from_ppdt_results_column(column=str(column))
+            for column in results_df.columns
+        ]
+        number_of_timesteps = len(results_df.index)
+        return pd.DataFrame(
+            {
+                "model": self.model,
+                "scenario": self.scenario,
+                "region": self.region,
+                "variable": np.repeat(
+                    [variable_name for variable_name, _ in variable_names_and_units],
+                    number_of_timesteps,
+                ),
+                "unit": np.repeat(
+                    [unit for _, unit in variable_names_and_units], number_of_timesteps
+                ),
+                "time": results_df.index[
+                    np.tile(np.arange(number_of_timesteps), len(results_df.columns))
+                ],
+                # column by column, like the rows of the table
+                "value": results_df.to_numpy().ravel(order="F"),
+            }
+        )
 
-        return dataframe_from_dict
+    def write_results_to_pyam_csv(
+        self, results_df: pd.DataFrame, filename: str
+    ) -> None:
+        """Write the pyam table of the results to csv, in batches of columns so the whole table is never in memory."""
+        columns_per_batch = max(
+            1, self.PyamRowsPerBatch // max(len(results_df.index), 1)
+        )
+        with open(filename, "w", encoding="utf-8", newline="") as file:
+            for start_column in range(0, max(len(results_df.columns), 1), columns_per_batch):
+                self.get_pyam_data_of_results(
+                    results_df=results_df.iloc[
+                        :, start_column : start_column + columns_per_batch
+                    ]
+                ).to_csv(path_or_buf=file, index=None, header=start_column == 0)  # type: ignore
+
+    def get_pyam_csv_filename(
+        self,
+        folder: str,
+        module_filename: str,
+        time_resolution_of_data: str,
+        simulation_duration: int,
+        simulation_year: int,
+        region: str,
+    ) -> str:
+        """Get the path of a pyam csv file."""
+        return os.path.join(
+            folder,
+            f"{module_filename}_{time_resolution_of_data}_results_for_{simulation_duration}_days_in_year_{simulation_year}_in_{region}.csv",
+        )
 
     def write_filename_and_save_to_csv(
         self,
@@ -1008,9 +976,13 @@ class PostProcessor:
     ) -> None:
         """Write file to csv."""
 
-        filename = os.path.join(
-            folder,
-            f"{module_filename}_{time_resolution_of_data}_results_for_{simulation_duration}_days_in_year_{simulation_year}_in_{region}.csv",
+        filename = self.get_pyam_csv_filename(
+            folder=folder,
+            module_filename=module_filename,
+            time_resolution_of_data=time_resolution_of_data,
+            simulation_duration=simulation_duration,
+            simulation_year=simulation_year,
+            region=region,
         )
 
         dataframe.to_csv(
@@ -1,6 +1,14 @@
-"""Data Collection for Scenario Comparison with Pyam."""
+"""Data Collection for Scenario Comparison with Pyam.
+
+The collector works incrementally. A manifest in the pyam data folder remembers the module config and the pyam data
+information of every result folder that was collected before, and the csv files of these folders are kept as binary
+partitions, one per csv file, together with their formatted csv rows. A new run only reads the json and csv files of
+new or changed result folders and only formats the rows of new scenarios, the collected csv file is put together from
+the stored rows.
+"""
 # clean
 import glob
+import hashlib
 import os
 from typing import Dict, Any, Optional, List
 import json
@@ -8,16 +16,23 @@ import enum
 from collections import defaultdict
 import shutil
 import re
+import numpy as np
 import pandas as pd
 
 
 from hisim import log
+from hisim.cache_backend import NumpyCacheBackend
+from hisim.cache_manager import write_file_atomically
 
 
 class PyamDataCollector:
 
     """PyamDataCollector class which collects and concatenate the pyam data from the examples/results."""
 
+    ManifestFilename = "collected_pyam_data_manifest.json"
+    PartitionFolderName = "collected_pyam_data_partitions"
+    ManifestVersion = 1
+
     def __init__(
         self,
         data_processing_mode: Any,
@@ -37,6 +52,10 @@ class PyamDataCollector:
         # in each examples/results folder should be one example that was executed with the default config
         self.path_of_pyam_results_executed_with_default_config: str = ""
 
+        # result folders and csv files that were collected before
+        self.partition_backend = NumpyCacheBackend()
+        self.manifest = self.load_manifest()
+
         log.information(f"Checking results from folder: {result_folder}")
 
         self.clean_result_directory_from_unfinished_results(result_path=result_folder)
@@ -139,9 +158,186 @@ class PyamDataCollector:
             parameter_key=parameter_key,
             list_with_parameter_key_values=list_with_parameter_key_values,
         )
+        self.save_manifest()
 
         print("\n")
 
+    def get_manifest_filepath(self) -> str:
+        """Get the path of the manifest of the collected result folders."""
+        return os.path.join(self.pyam_data_folder, self.ManifestFilename)
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Load the manifest and forget the result folders that do not exist anymore."""
+        manifest: Dict[str, Any] = {"version": self.ManifestVersion, "folders": {}}
+        manifest_filepath = self.get_manifest_filepath()
+        if os.path.isfile(manifest_filepath):
+            with open(manifest_filepath, "r", encoding="utf-8") as openfile:
+                loaded_manifest = json.load(openfile)
+            if loaded_manifest.get("version") == self.ManifestVersion:
+                manifest = loaded_manifest
+            else:
+                log.information("The manifest of the collected pyam data is outdated and gets rebuilt.")
+        for folder in list(manifest["folders"]):
+            if not os.path.isdir(folder):
+                log.information(f"The result folder {folder} does not exist anymore and is removed from the manifest.")
+                self.remove_folder_from_manifest(manifest, folder)
+        return manifest
+
+    def save_manifest(self) -> None:
+        """Save the manifest atomically, so an interrupted run leaves the previous manifest."""
+        os.makedirs(self.pyam_data_folder, exist_ok=True)
+        write_file_atomically(
+            self.get_manifest_filepath(), "w", lambda file: json.dump(self.manifest, file), encoding="utf-8"
+        )
+
+    def get_pyam_data_information(self, pyam_data_folder: str) -> Dict[str, Any]:
+        """Get the module config and the pyam data information of a result folder, from the manifest if possible."""
+        folder_key = os.path.abspath(pyam_data_folder)
+        json_files = sorted(file for file in os.listdir(pyam_data_folder) if ".json" in file)
+        json_modification_times = [
+            os.stat(os.path.join(pyam_data_folder, file)).st_mtime_ns for file in json_files
+        ]
+        folder_entry: Optional[Dict[str, Any]] = self.manifest["folders"].get(folder_key)
+        if folder_entry is None or folder_entry["json_modification_times"] != json_modification_times:
+            config_dict: Dict[str, Any] = {}
+            for file in json_files:
+                with open(os.path.join(pyam_data_folder, file), "r", encoding="utf-8") as openfile:
+                    config_dict = json.load(openfile)
+            # the partitions of the csv files are checked on their own
+            partitions = {} if folder_entry is None else folder_entry["partitions"]
+            folder_entry = {
+                "myModuleConfig": config_dict.get("myModuleConfig"),
+                "pyamDataInformation": config_dict.get("pyamDataInformation"),
+                "json_modification_times": json_modification_times,
+                "partitions": partitions,
+            }
+            self.manifest["folders"][folder_key] = folder_entry
+        return folder_entry
+
+    def remove_folder_from_manifest(self, manifest: Dict[str, Any], folder: str) -> None:
+        """Remove a result folder and the partitions of its csv files from the manifest."""
+        folder_entry = manifest["folders"].pop(os.path.abspath(folder), None)
+        if folder_entry is not None:
+            for partition_entry in folder_entry["partitions"].values():
+                self.remove_partition(partition_entry)
+
+    def get_partition_filepath(self, partition_name: str) -> str:
+        """Get the path of a partition or of one of its csv chunks."""
+        return os.path.join(self.pyam_data_folder, self.PartitionFolderName, partition_name)
+
+    def remove_partition(self, partition_entry: Dict[str, Any]) -> None:
+        """Delete a partition, its metadata and its csv chunks."""
+        partition_filepath = self.get_partition_filepath(partition_entry["partition"])
+        filepaths = [partition_filepath, self.partition_backend.get_metadata_filepath(partition_filepath)]
+        filepaths += [self.get_partition_filepath(chunk) for chunk in partition_entry["chunks"]]
+        for filepath in filepaths:
+            if os.path.isfile(filepath):
+                os.remove(filepath)
+
+    def get_partition_entry(self, csv_file: str) -> Dict[str, Any]:
+        """Get the partition of a csv file, the csv file is only read if it is new or changed."""
+        csv_file_stat = os.stat(csv_file)
+        folder_entry = self.get_pyam_data_information(os.path.dirname(csv_file))
+        partition_entry: Optional[Dict[str, Any]] = folder_entry["partitions"].get(os.path.basename(csv_file))
+        if partition_entry is not None:
+            if (
+                partition_entry["size"] == csv_file_stat.st_size
+                and partition_entry["modification_time"] == csv_file_stat.st_mtime_ns
+                and os.path.isfile(self.get_partition_filepath(partition_entry["partition"]))
+            ):
+                return partition_entry
+            self.remove_partition(partition_entry)
+
+        dataframe = pd.read_csv(csv_file)
+
+        # add hash colum to dataframe so hash does not get lost when scenario is renamed
+        # TODO: make this optional in case hash does not exist in scenario name
+        hash_number = re.findall(r"\-?\d+", dataframe["scenario"][0])[-1]
+        dataframe["hash"] = [hash_number] * len(dataframe["scenario"])
+
+        # text columns are saved as strings, missing texts are written as empty strings to the csv anyway
+        partition_columns = {
+            str(name): dataframe[name].fillna("").astype(str).to_numpy(dtype=str)
+            if dataframe[name].dtype == object
+            else dataframe[name].to_numpy()
+            for name in dataframe.columns
+        }
+        partition_name = hashlib.sha256(os.path.abspath(csv_file).encode("utf-8")).hexdigest()
+        os.makedirs(os.path.dirname(self.get_partition_filepath(partition_name)), exist_ok=True)
+        self.partition_backend.save(self.get_partition_filepath(partition_name + ".npy"), partition_columns)
+        partition_entry = {
+            "partition": partition_name + ".npy",
+            "size": csv_file_stat.st_size,
+            "modification_time": csv_file_stat.st_mtime_ns,
+            "columns": list(partition_columns),
+            "dtypes": [str(dataframe[name].dtype) for name in dataframe.columns],
+            "chunks": [],
+        }
+        folder_entry["partitions"][os.path.basename(csv_file)] = partition_entry
+        return partition_entry
+
+    def load_partition(self, partition_entry: Dict[str, Any]) -> pd.DataFrame:
+        """Load the pyam data of a csv file with the hash column from its partition."""
+        columns, _metadata = self.partition_backend.load(self.get_partition_filepath(partition_entry["partition"]))
+        return pd.DataFrame({name: np.asarray(values) for name, values in columns.items()})
+
+    def rename_scenario_of_dataframe(
+        self,
+        dataframe: pd.DataFrame,
+        index: int,
+        parameter_key: Optional[str] = None,
+        list_with_parameter_key_values: Optional[List[Any]] = None,
+    ) -> None:
+        """Rename the scenario with the parameter key and value or with the index."""
+        if parameter_key is not None and list_with_parameter_key_values is not None:
+            # rename scenario adding paramter key, value pair
+            dataframe[
+                "scenario"
+            ] = self.rename_scenario_name_of_dataframe_with_parameter_key_and_value(
+                dataframe=dataframe,
+                parameter_key=parameter_key,
+                list_with_parameter_values=list_with_parameter_key_values,
+                index=index,
+            )
+        else:
+            # rename scenario adding an index
+            dataframe[
+                "scenario"
+            ] = self.rename_scenario_name_of_dataframe_with_index(
+                dataframe=dataframe, index=index
+            )
+
+    def get_csv_chunk_filepath(
+        self,
+        partition_entry: Dict[str, Any],
+        scenario_key: str,
+        index: int,
+        rename_scenario: bool,
+        parameter_key: Optional[str],
+        list_with_parameter_key_values: Optional[List[Any]],
+    ) -> str:
+        """Get the rows of a partition in the collected csv file, they are only formatted if the scenario name is new."""
+        chunk_name = (
+            partition_entry["partition"].replace(".npy", "")
+            + "_"
+            + hashlib.sha256(scenario_key.encode("utf-8")).hexdigest()[:16]
+            + ".csv"
+        )
+        chunk_filepath = self.get_partition_filepath(chunk_name)
+        if chunk_name in partition_entry["chunks"] and os.path.isfile(chunk_filepath):
+            return chunk_filepath
+        dataframe = self.load_partition(partition_entry)
+        if rename_scenario is True:
+            self.rename_scenario_of_dataframe(
+                dataframe=dataframe,
+                index=index,
+                parameter_key=parameter_key,
+                list_with_parameter_key_values=list_with_parameter_key_values,
+            )
+        write_file_atomically(chunk_filepath, "wb", lambda file: dataframe.to_csv(file, header=False))
+        partition_entry["chunks"].append(chunk_name)
+        return chunk_filepath
+
     def clean_result_directory_from_unfinished_results(
         self, result_path: str
     ) -> None:  # TODO: add functionality
@@ -204,23 +400,15 @@ class PyamDataCollector:
 
         dict_of_csv_data[f"{simulation_duration_to_check}"] = []
 
-        # open file config and check if they have wanted simulation duration
+        # check in the file config if they have wanted simulation duration
         for file in all_csv_files:
 
             parent_folder = os.path.abspath(os.path.join(file, os.pardir))  # type: ignore
-            for file1 in os.listdir(parent_folder):
-                if ".json" in file1:
-                    with open(
-                        os.path.join(parent_folder, file1), "r", encoding="utf-8"
-                    ) as openfile:
-                        json_file = json.load(openfile)
-                        simulation_duration = json_file["pyamDataInformation"].get(
-                            "duration in days"
-                        )
-                        if int(simulation_duration_to_check) == int(
-                            simulation_duration
-                        ):
-                            dict_of_csv_data[f"{simulation_duration}"].append(file)
+            pyam_data_information = self.get_pyam_data_information(parent_folder)["pyamDataInformation"]
+            if pyam_data_information is not None:
+                simulation_duration = pyam_data_information.get("duration in days")
+                if int(simulation_duration_to_check) == int(simulation_duration):
+                    dict_of_csv_data[f"{simulation_duration}"].append(file)
 
         # raise error if dict is empty
         if bool(dict_of_csv_data) is False:
@@ -264,57 +452,74 @@ class PyamDataCollector:
             f"Read csv files and generate pyam dataframes for {time_resolution_of_data_set}."
         )
 
-        appended_dataframe = pd.DataFrame()
-        index = 0
         simulation_duration_key = list(dict_of_csv_to_read.keys())[0]
         csv_data_list = dict_of_csv_to_read[simulation_duration_key]
 
-        for csv_file in csv_data_list:
-
-            dataframe = pd.read_csv(csv_file)
+        # only new or changed csv files get parsed, the others come from their partitions
+        partition_entries = [self.get_partition_entry(csv_file) for csv_file in csv_data_list]
 
-            # add hash colum to dataframe so hash does not get lost when scenario is renamed
-            # TODO: make this optional in case hash does not exist in scenario name
-            hash_number = re.findall(r"\-?\d+", dataframe["scenario"][0])[-1]
-            dataframe["hash"] = [hash_number] * len(dataframe["scenario"])
+        filename = self.store_pyam_data_with_the_right_name_and_in_the_right_path(
+            pyam_data_folder=self.pyam_data_folder,
+            simulation_duration_key=simulation_duration_key,
+            time_resolution_of_data_set=time_resolution_of_data_set,
+            parameter_key=parameter_key,
+        )
 
-            if rename_scenario is True:
-                if (
-                    parameter_key is not None
-                    and list_with_parameter_key_values is not None
-                ):
-                    # rename scenario adding paramter key, value pair
-                    dataframe[
-                        "scenario"
-                    ] = self.rename_scenario_name_of_dataframe_with_parameter_key_and_value(
-                        dataframe=dataframe,
-                        parameter_key=parameter_key,
-                        list_with_parameter_values=list_with_parameter_key_values,
-                        index=index,
-                    )
+        # when all csv files have the same columns, the collected csv file is the header and the rows of each
+        # partition, so only the rows of new scenarios or scenarios with a new name get formatted
+        if partition_entries and all(
+            partition_entry["columns"] == partition_entries[0]["columns"]
+            and partition_entry["dtypes"] == partition_entries[0]["dtypes"]
+            for partition_entry in partition_entries
+        ):
+            chunk_filepaths = []
+            for index, partition_entry in enumerate(partition_entries):
+                if rename_scenario is not True:
+                    scenario_key = ""
+                elif parameter_key is not None and list_with_parameter_key_values is not None:
+                    scenario_key = f"{parameter_key}_{list_with_parameter_key_values[index]}"
                 else:
-                    # rename scenario adding an index
-                    dataframe[
-                        "scenario"
-                    ] = self.rename_scenario_name_of_dataframe_with_index(
-                        dataframe=dataframe, index=index
+                    scenario_key = f"index_{index}"
+                chunk_filepaths.append(
+                    self.get_csv_chunk_filepath(
+                        partition_entry=partition_entry,
+                        scenario_key=scenario_key,
+                        index=index,
+                        rename_scenario=rename_scenario,
+                        parameter_key=parameter_key,
+                        list_with_parameter_key_values=list_with_parameter_key_values,
                     )
+                )
 
-            appended_dataframe = pd.concat([appended_dataframe, dataframe])
+            def write_collected_csv_file(file: Any) -> None:
+                """Write the header and copy the rows of all partitions."""
+                pd.DataFrame(columns=partition_entries[0]["columns"]).to_csv(file)
+                for chunk_filepath in chunk_filepaths:
+                    with open(chunk_filepath, "rb") as chunk_file:
+                        shutil.copyfileobj(chunk_file, file)
 
-            index = index + 1
+            write_file_atomically(filename, "wb", write_collected_csv_file)
+            return
+
+        # otherwise pandas has to align the columns, the dataframes are concatenated once
+        dataframes: List[pd.DataFrame] = []
+        for index, partition_entry in enumerate(partition_entries):
+            dataframe = self.load_partition(partition_entry)
+            if rename_scenario is True:
+                self.rename_scenario_of_dataframe(
+                    dataframe=dataframe,
+                    index=index,
+                    parameter_key=parameter_key,
+                    list_with_parameter_key_values=list_with_parameter_key_values,
+                )
+            dataframes.append(dataframe)
 
             # convert unit "Watt" to "Watthour" because it makes plots more readable later, conversion factor is 1/3600s
             # df_pyam_for_one_simulation_duration = df_pyam_for_one_simulation_duration.convert_unit(
             #     current="W", to="Wh", factor=1 / 3600, inplace=False
             # )
 
-        filename = self.store_pyam_data_with_the_right_name_and_in_the_right_path(
-            pyam_data_folder=self.pyam_data_folder,
-            simulation_duration_key=simulation_duration_key,
-            time_resolution_of_data_set=time_resolution_of_data_set,
-            parameter_key=parameter_key,
-        )
+        appended_dataframe = pd.concat(dataframes) if dataframes else pd.DataFrame()
         appended_dataframe.to_csv(filename)
 
     def store_pyam_data_with_the_right_name_and_in_the_right_path(
@@ -383,12 +588,7 @@ class PyamDataCollector:
     ) -> tuple[Dict, Dict]:
         """Read json config in pyam_data folder and compare with default config."""
 
-        for file in os.listdir(path_to_pyam_data_folder):
-
-            if ".json" in file:
-                with open(os.path.join(path_to_pyam_data_folder, file), "r", encoding="utf-8") as openfile:  # type: ignore
-                    config_dict = json.load(openfile)
-                    my_module_config_dict = config_dict["myModuleConfig"]
+        my_module_config_dict = self.get_pyam_data_information(path_to_pyam_data_folder)["myModuleConfig"]
 
         # check if module config and default config have any keys in common
         if len(set(default_config_dict).intersection(my_module_config_dict)) == 0:
@@ -472,31 +672,32 @@ class PyamDataCollector:
     ) -> List[Any]:
         """Go through all pyam folders and remove the examples that are duplicated."""
 
-        list_of_all_module_configs = []
+        # the configs are compared as sorted json strings, so the check stays fast for thousands of folders
+        set_of_all_module_configs = set()
         list_of_pyam_folders_which_have_only_unique_configs = []
         for folder in list_of_pyam_folder_paths_to_check:
-            for file in os.listdir(folder):
-                if ".json" in file:
-                    with open(os.path.join(folder, file), "r", encoding="utf-8") as openfile:  # type: ignore
-                        config_dict = json.load(openfile)
-                        my_module_config_dict = config_dict["myModuleConfig"]
-                        my_module_config_dict.update(
-                            {
-                                "duration in days": config_dict[
-                                    "pyamDataInformation"
-                                ].get("duration in days")
-                            }
-                        )
-
-                        # prevent to add modules with same module config and same simulation duration twice
-                        if my_module_config_dict not in list_of_all_module_configs:
-                            list_of_all_module_configs.append(my_module_config_dict)
-                            list_of_pyam_folders_which_have_only_unique_configs.append(
-                                os.path.join(folder)
-                            )
+            pyam_data_information = self.get_pyam_data_information(folder)
+            if pyam_data_information["myModuleConfig"] is not None and pyam_data_information["pyamDataInformation"] is not None:
+                my_module_config_dict = dict(pyam_data_information["myModuleConfig"])
+                my_module_config_dict.update(
+                    {
+                        "duration in days": pyam_data_information[
+                            "pyamDataInformation"
+                        ].get("duration in days")
+                    }
+                )
+                my_module_config_string = json.dumps(my_module_config_dict, sort_keys=True)
+
+                # prevent to add modules with same module config and same simulation duration twice
+                if my_module_config_string not in set_of_all_module_configs:
+                    set_of_all_module_configs.add(my_module_config_string)
+                    list_of_pyam_folders_which_have_only_unique_configs.append(
+                        os.path.join(folder)
+                    )
 
             # delete folders which have doubled results from examples/results directory
             if folder not in list_of_pyam_folders_which_have_only_unique_configs:
+                self.remove_folder_from_manifest(self.manifest, folder)
                 # remove whole result folder from result directory
                 whole_parent_folder = os.path.abspath(os.path.join(folder, os.pardir))
                 log.information(
@@ -0,0 +1,140 @@
+""" Preallocated columnar storage for the results of all time steps of a simulation. """
+# clean
+import enum
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from hisim import log
+from hisim import loadtypes as lt
+from hisim.component import ComponentOutput, SingleTimeStepValues
+
+
+def get_flag_name(flag: Any) -> str:
+    """ Gets the name of a postprocessing flag, for example InandOutputType.CHARGE. """
+    if isinstance(flag, enum.Enum):
+        return type(flag).__name__ + "." + flag.name
+    return str(flag)
+
+
+def get_flag_from_name(flag_name: str) -> Any:
+    """ Gets the postprocessing flag of a name. Names that are no member of an enum in the loadtypes stay strings. """
+    enum_name, _, member_name = flag_name.partition(".")
+    enum_class = getattr(lt, enum_name, None)
+    if isinstance(enum_class, type) and issubclass(enum_class, enum.Enum) and member_name in enum_class.__members__:
+        return enum_class[member_name]
+    return flag_name
+
+
+class ResultStore:
+
+    """ Holds the results of a simulation in one preallocated (timesteps, outputs) float64 matrix.
+
+    Every time step gets written into its row in place, so no python lists of boxed floats are needed.
+    Optionally the matrix is memory mapped to a .npy file in the result directory, which keeps the
+    results out of the RAM and allows other processes to read them.
+    """
+
+    MatrixFilename = "all_results_matrix.npy"
+    OutputsFilename = "all_results_outputs.json"
+
+    def __init__(
+        self,
+        number_of_timesteps: int,
+        all_outputs: List[ComponentOutput],
+        memory_map_directory: Optional[str] = None,
+        seconds_per_timestep: Optional[int] = None,
+    ) -> None:
+        """ Allocates the result matrix, either in memory or as memory map in the given directory.
+
+        A memory mapped matrix gets a description of the outputs next to it, so it can be loaded without the simulation.
+        """
+        self.all_outputs: List[ComponentOutput] = all_outputs
+        self.number_of_written_timesteps: int = 0
+        self.matrix_file_path: Optional[str] = None
+        self.seconds_per_timestep: Optional[int] = seconds_per_timestep
+        shape = (number_of_timesteps, len(all_outputs))
+        if memory_map_directory is None:
+            self.values: np.ndarray = np.zeros(shape, dtype=np.float64)
+        else:
+            self.matrix_file_path = os.path.join(memory_map_directory, self.MatrixFilename)
+            log.information("Memory mapping the simulation results to " + self.matrix_file_path)
+            self.values = np.lib.format.open_memmap(
+                self.matrix_file_path, mode="w+", dtype=np.float64, shape=shape
+            )
+            self.save_outputs(memory_map_directory)
+
+    @classmethod
+    def load(cls, directory: str) -> "ResultStore":
+        """ Opens the memory mapped matrix of a finished simulation read only, together with its outputs. """
+        with open(os.path.join(directory, cls.OutputsFilename), "r", encoding="utf-8") as openfile:
+            description: Dict[str, Any] = json.load(openfile)
+        all_outputs: List[ComponentOutput] = []
+        for index, output_description in enumerate(description["outputs"]):
+            output = ComponentOutput(
+                object_name=output_description["component_name"],
+                field_name=output_description["field_name"],
+                load_type=lt.LoadTypes(output_description["load_type"]),
+                unit=lt.Units(output_description["unit"]),
+                postprocessing_flag=None
+                if output_description["postprocessing_flag"] is None
+                else [get_flag_from_name(flag_name) for flag_name in output_description["postprocessing_flag"]],
+                output_description=output_description["output_description"],
+            )
+            output.display_name = output_description["display_name"]
+            output.global_index = index
+            all_outputs.append(output)
+        result_store = cls(
+            number_of_timesteps=0, all_outputs=all_outputs, seconds_per_timestep=description["seconds_per_timestep"]
+        )
+        result_store.matrix_file_path = os.path.join(directory, cls.MatrixFilename)
+        result_store.values = np.load(result_store.matrix_file_path, mmap_mode="r")
+        result_store.number_of_written_timesteps = len(result_store.values)
+        return result_store
+
+    def save_outputs(self, directory: str) -> None:
+        """ Writes the description of the outputs, in the order of the columns of the matrix. """
+        description = {
+            "seconds_per_timestep": self.seconds_per_timestep,
+            "outputs": [
+                {
+                    "component_name": output.component_name,
+                    "field_name": output.field_name,
+                    "display_name": output.display_name,
+                    "load_type": lt.LoadTypes(output.load_type).value,
+                    "unit": lt.Units(output.unit).value,
+                    "postprocessing_flag": None
+                    if output.postprocessing_flag is None
+                    else [get_flag_name(flag) for flag in output.postprocessing_flag],
+                    "output_description": output.output_description,
+                }
+                for output in self.all_outputs
+            ],
+        }
+        with open(os.path.join(directory, self.OutputsFilename), "w", encoding="utf-8") as openfile:
+            json.dump(description, openfile, indent=4)
+
+    def write_timestep(self, timestep: int, stsv: SingleTimeStepValues) -> None:
+        """ Copies the converged values of a single time step into the row of the matrix. """
+        self.values[timestep] = stsv.values
+        self.number_of_written_timesteps += 1
+
+    def write_column(self, output: ComponentOutput, series: np.ndarray) -> None:
+        """ Copies the values of all time steps for a single output into its column in one go. """
+        self.values[:, output.global_index] = series
+
+    def get_column_names(self) -> List[str]:
+        """ Gets the pretty names of all outputs as column names. """
+        return [output.get_pretty_name() for output in self.all_outputs]
+
+    def get_data_frame(self, index: pd.DatetimeIndex) -> pd.DataFrame:
+        """ Gets a dataframe as zero copy view on the result matrix. """
+        return pd.DataFrame(data=self.values, index=index, columns=self.get_column_names(), copy=False)
+
+    def flush(self) -> None:
+        """ Writes a memory mapped matrix to the disk. Does nothing for in-memory matrices. """
+        if isinstance(self.values, np.memmap):
+            self.values.flush()
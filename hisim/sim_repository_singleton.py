@@ -36,6 +36,12 @@ class SingletonMeta(type):
                 cls._instances[cls] = instance
         return cls._instances[cls]
 
+    @staticmethod
+    def reset_instances() -> None:
+        """Forgets all singleton instances, so the next simulation in this process starts with new ones."""
+        with SingletonMeta._lock:
+            SingletonMeta._instances.clear()
+
 
 class SingletonSimRepository(metaclass=SingletonMeta):
 
@@ -27,6 +27,9 @@ class SimulationParameters(JSONWizard):
     surplus_control: bool
     predictive_control: bool
     prediction_horizon: Optional[int]
+    memory_map_results: bool = False
+    dependency_ordered_scheduling: bool = False
+    chart_rendering_workers: int = 1
 
     def __init__(
         self,
@@ -40,6 +43,9 @@ class SimulationParameters(JSONWizard):
         surplus_control: bool = True,
         predictive_control: bool = False,
         prediction_horizon: Optional[int] = 0,
+        memory_map_results: bool = False,
+        dependency_ordered_scheduling: bool = False,
+        chart_rendering_workers: int = 1,
     ):
         """Initializes the class."""
         self.start_date: datetime.datetime = start_date
@@ -58,8 +64,21 @@ class SimulationParameters(JSONWizard):
         self.surplus_control = surplus_control
         self.predictive_control = predictive_control
         self.prediction_horizon = prediction_horizon
+        # write the result matrix as memory mapped .npy file into the result directory instead of keeping it in RAM
+        self.memory_map_results = memory_map_results
+        # only iterate circularly connected components and calculate everything else once per timestep in the order
+        # of the connections. Components exchanging values through the repositories in i_simulate are not seen by this.
+        self.dependency_ordered_scheduling = dependency_ordered_scheduling
+        # number of processes that render the line, carpet, single day and monthly bar charts, 0 uses all cores
+        self.chart_rendering_workers = chart_rendering_workers
 
         self.figure_format = FigureFormat.PNG
+        # resolution of the line and carpet charts, the lower qualities downsample long results for faster plotting
+        self.chart_quality = ChartQuality.PRINT
+        self.cache_format = CacheFormat.NUMPY
+        # aggregations of the results that get calculated for the post processing, levels that no enabled
+        # post processing option uses can be left out
+        self.result_aggregation_levels: List[AggregationLevel] = list(AggregationLevel)
 
     @classmethod
     def full_year(cls, year: int, seconds_per_timestep: int) -> SimulationParameters:
@@ -267,3 +286,30 @@ class FigureFormat(str, enum.Enum):
 
     PNG = ".png"
     JPG = ".jpg"
+
+
+class ChartQuality(str, enum.Enum):
+
+    """Set the Resolution of the Line and Carpet Charts."""
+
+    PRINT = "print"
+    SCREEN = "screen"
+    DRAFT = "draft"
+
+
+class CacheFormat(str, enum.Enum):
+
+    """Set Cache File Formats."""
+
+    NUMPY = ".npy"
+    CSV = ".cache"
+
+
+class AggregationLevel(str, enum.Enum):
+
+    """Set Aggregation Levels of the Results."""
+
+    CUMULATIVE = "cumulative"
+    MONTHLY = "monthly"
+    DAILY = "daily"
+    HOURLY = "hourly"
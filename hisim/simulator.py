@@ -7,19 +7,22 @@ import os
 import datetime
 from typing import List, Tuple, Optional, Dict, Any
 import time
+import numpy as np
 import pandas as pd
 
 from hisim.postprocessing.postprocessing_datatransfer import PostProcessingDataTransfer
 from hisim.component_wrapper import ComponentWrapper
+from hisim.component_scheduler import ComponentScheduler
 from hisim import sim_repository
 from hisim.postprocessing import postprocessing_main as pp
 import hisim.component as cp
 from hisim import log
-from hisim.simulationparameters import SimulationParameters
+from hisim.simulationparameters import AggregationLevel, SimulationParameters
 from hisim import utils
 from hisim import postprocessingoptions
 from hisim.loadtypes import Units
 from hisim.result_path_provider import ResultPathProviderSingleton, SortingOptionEnum
+from hisim.result_store import ResultStore
 
 
 __authors__ = "Noah Pflugradt, Vitor Hugo Bellotto Zago, Maximillian Hillen"
@@ -34,6 +37,20 @@ class Simulator:
 
     """Core class of HiSim: Runs the main loop."""
 
+    # outputs with these units get averaged in the aggregated results, all others get summed up
+    MeanUnits = (
+        Units.CELSIUS,
+        Units.KELVIN,
+        Units.ANY,
+        Units.METER_PER_SECOND,
+        Units.DEGREES,
+        Units.WATT,
+        Units.KILOWATT,
+        Units.WATT_PER_SQUARE_METER,
+        Units.KG_PER_SEC,
+        Units.PERCENT,
+    )
+
     @utils.measure_execution_time
     def __init__(
         self,
@@ -59,6 +76,13 @@ class Simulator:
         self.my_module_config_path = my_module_config_path
         self.simulation_repository = sim_repository.SimRepository()
         self.results_data_frame: pd.DataFrame
+        # preallocated buffers for the iterations within a timestep, sized in run_all_timesteps
+        self.working_stsv: cp.SingleTimeStepValues = cp.SingleTimeStepValues(0)
+        self.previous_iteration_stsv: cp.SingleTimeStepValues = cp.SingleTimeStepValues(0)
+        self.component_scheduler: Optional[ComponentScheduler] = None
+        # components with precomputed timeseries are left out of the timestep loop, see run_all_timesteps
+        self.simulated_components: List[ComponentWrapper] = []
+        self.exogenous_output_indices: np.ndarray = np.zeros(0, dtype=np.int64)
         self.iteration_logging_path: str = ""
         self.config_dictionary: Dict[str, Any] = {}
 
@@ -110,30 +134,65 @@ class Simulator:
         Following up, all components have their states restored and simulated respectively.
         Convergence is dependent on the i_restore and i_simulate of the components and how they
         are connected to each other.
+
+        With the dependency ordered scheduling, the components are calculated in the order of their
+        dependencies instead. Only the components in a circle get iterated, all others get calculated once.
         """
 
         # Save states of all components
         # Executes save state in the component
-        for wrapped_component in self.wrapped_components:
+        for wrapped_component in self.simulated_components:
             wrapped_component.save_state()
 
-        continue_calculation = True
-
         # Verifies data existence
         if (len(self.all_outputs)) == 0:
             raise ValueError("Not a single column was defined.")
 
-        # Creates List with values
-        stsv = previous_stsv.clone()
-        # Creates a buffer List with values
-        previous_values = previous_stsv.clone()
+        # Fills the preallocated working buffer with the start values
+        stsv = self.working_stsv
+        stsv.copy_values_from_other(previous_stsv)
+
+        if self.component_scheduler is None:
+            iterative_tries, force_convergence = self.iterate_until_convergence(
+                timestep, self.simulated_components, stsv
+            )
+        else:
+            iterative_tries = 1
+            force_convergence = False
+            for component_group in self.component_scheduler.component_groups:
+                if component_group.is_cyclic:
+                    group_tries, group_force_convergence = self.iterate_until_convergence(
+                        timestep, component_group.wrapped_components, stsv
+                    )
+                    iterative_tries = max(iterative_tries, group_tries)
+                    force_convergence = force_convergence or group_force_convergence
+                else:
+                    wrapped_component = component_group.wrapped_components[0]
+                    wrapped_component.restore_state()
+                    wrapped_component.calculate_component(timestep, stsv, False)
+
+        for wrapped_component in self.simulated_components:
+            wrapped_component.doublecheck(timestep, stsv)
+        return (stsv, iterative_tries, force_convergence)
+
+    def iterate_until_convergence(
+        self,
+        timestep: int,
+        wrapped_components: List[ComponentWrapper],
+        stsv: cp.SingleTimeStepValues,
+    ) -> Tuple[int, bool]:
+        """Restores and simulates the given components until the values stop changing."""
+        continue_calculation = True
+        # Fills the preallocated buffer for comparing with the previous iteration
+        previous_values = self.previous_iteration_stsv
+        previous_values.copy_values_from_other(stsv)
         iterative_tries = 0
         force_convergence = False
 
         # Starts loop
         while continue_calculation:
             # Loops through components
-            for wrapped_component in self.wrapped_components:
+            for wrapped_component in wrapped_components:
                 # Executes restore state for each component
                 wrapped_component.restore_state()
                 # Executes i_simulate for component
@@ -167,13 +226,10 @@ class Simulator:
                     + "\n"
                     + list_of_changed_values
                 )
-            # Copies actual values to previous variable
+            # Copies actual values into the previous buffer without allocating a new one
             previous_values.copy_values_from_other(stsv)
             iterative_tries += 1
-
-        for wrapped_component in self.wrapped_components:
-            wrapped_component.doublecheck(timestep, stsv)
-        return (stsv, iterative_tries, force_convergence)
+        return iterative_tries, force_convergence
 
     def prepare_simulation_directory(self):
         """Prepares the simulation directory. Determines the filename if nothing is set."""
@@ -252,7 +308,19 @@ class Simulator:
             + str(len(self.all_outputs))
             + " outputs."
         )
-        all_result_lines = []
+        # Preallocates the result matrix that gets filled row by row
+        memory_map_directory: Optional[str] = None
+        if self._simulation_parameters.memory_map_results:
+            memory_map_directory = self._simulation_parameters.result_directory
+        result_store = ResultStore(
+            number_of_timesteps=self._simulation_parameters.timesteps,
+            all_outputs=self.all_outputs,
+            memory_map_directory=memory_map_directory,
+            seconds_per_timestep=self._simulation_parameters.seconds_per_timestep,
+        )
+        self.write_exogenous_timeseries(result_store)
+        if self._simulation_parameters.dependency_ordered_scheduling:
+            self.component_scheduler = ComponentScheduler(self.simulated_components)
         log.information(
             "Starting simulation for "
             + str(self._simulation_parameters.timesteps)
@@ -263,9 +331,11 @@ class Simulator:
         starttime = datetime.datetime.now()
         total_iteration_tries_since_last_msg = 0
 
-        # Creates empty list with values to get started
+        # Creates the empty start values and the buffers that are reused in every timestep
         number_of_outputs = len(self.all_outputs)
         stsv = cp.SingleTimeStepValues(number_of_outputs)
+        self.working_stsv = cp.SingleTimeStepValues(number_of_outputs)
+        self.previous_iteration_stsv = cp.SingleTimeStepValues(number_of_outputs)
 
         for step in range(self._simulation_parameters.timesteps):
             if self._simulation_parameters.timesteps % 500 == 0:
@@ -275,13 +345,12 @@ class Simulator:
                 resulting_stsv,
                 iteration_tries,
                 force_convergence,
-            ) = self.process_one_timestep(step, stsv)
-            stsv = cp.SingleTimeStepValues(number_of_outputs)
+            ) = self.process_one_timestep(step, self.get_start_values(step, stsv, result_store))
             # Accumulates iteration counter
             total_iteration_tries_since_last_msg += iteration_tries
 
-            # Appends
-            all_result_lines.append(resulting_stsv.values)
+            # Copies the results into the row of the preallocated result matrix
+            result_store.write_timestep(step, resulting_stsv)
             del resulting_stsv
             # Calculates time execution
             elapsed = datetime.datetime.now() - lastmessage
@@ -297,8 +366,9 @@ class Simulator:
                 )
                 last_step = step
                 total_iteration_tries_since_last_msg = 0
+        result_store.flush()
         postprocessing_datatransfer = self.prepare_post_processing(
-            all_result_lines, start_counter
+            result_store, start_counter
         )
         log.information("Starting postprocessing")
         if postprocessing_datatransfer is None:
@@ -308,7 +378,7 @@ class Simulator:
         my_post_processor.run(ppdt=postprocessing_datatransfer)
         for wrapped_component in self.wrapped_components:
             wrapped_component.clear()
-        del all_result_lines
+        del result_store
         del postprocessing_datatransfer
         del my_post_processor
         self.simulation_repository.clear()
@@ -317,28 +387,46 @@ class Simulator:
             filestream.write("finished")
 
     @utils.measure_execution_time
-    def prepare_post_processing(self, all_result_lines, start_counter):
+    def write_exogenous_timeseries(self, result_store: ResultStore) -> None:
+        """Copies the precomputed timeseries into the result store and leaves their components out of the loop."""
+        self.simulated_components = []
+        exogenous_output_indices: List[int] = []
+        for wrapped_component in self.wrapped_components:
+            exogenous_timeseries = wrapped_component.get_exogenous_timeseries(
+                self._simulation_parameters.timesteps
+            )
+            if exogenous_timeseries is None:
+                self.simulated_components.append(wrapped_component)
+                continue
+            for output, series in exogenous_timeseries.items():
+                result_store.write_column(output, series)
+                exogenous_output_indices.append(output.global_index)
+        self.exogenous_output_indices = np.array(exogenous_output_indices, dtype=np.int64)
+
+    def get_start_values(
+        self, timestep: int, stsv: cp.SingleTimeStepValues, result_store: ResultStore
+    ) -> cp.SingleTimeStepValues:
+        """Injects the precomputed values of the timestep into the start values with a single copy."""
+        if len(self.exogenous_output_indices) > 0:
+            stsv.values[self.exogenous_output_indices] = result_store.values[
+                timestep, self.exogenous_output_indices
+            ]
+        return stsv
+
+    def prepare_post_processing(self, result_store: ResultStore, start_counter: float) -> PostProcessingDataTransfer:
         """Prepares the post processing."""
         log.information("Preparing post processing")
         # Prepares the results from the simulation for the post processing.
-        if len(all_result_lines) != self._simulation_parameters.timesteps:
+        if result_store.number_of_written_timesteps != self._simulation_parameters.timesteps:
             raise ValueError("not all lines were generated")
-        colum_names = []
         if self.setup_function is None:
             raise ValueError("No setup function was set")
-        entry: cp.ComponentOutput
-        for _index, entry in enumerate(self.all_outputs):
-            column_name = entry.get_pretty_name()
-            colum_names.append(column_name)
-            log.debug("Output column: " + column_name)
-        self.results_data_frame = pd.DataFrame(
-            data=all_result_lines, columns=colum_names
-        )
         # todo: fix this constant
         df_index = pd.date_range(
-            "2021-01-01 00:00:00", periods=len(self.results_data_frame), freq="T"
+            "2021-01-01 00:00:00", periods=self._simulation_parameters.timesteps, freq="T"
         )
-        self.results_data_frame.index = df_index
+        # the dataframe is only a view on the result matrix, the values do not get copied
+        self.results_data_frame = result_store.get_data_frame(index=df_index)
         end_counter = time.perf_counter()
         execution_time = end_counter - start_counter
         log.information(f"Simulation took {execution_time:1.2f}s.")
@@ -407,85 +495,63 @@ class Simulator:
     def get_std_results(
         self, results_data_frame: pd.DataFrame
     ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        """Converts results into a pretty dataframe for post processing."""
+        """Converts results into a pretty dataframe for post processing.
+
+        Outputs with units of states or flows get averaged, all other outputs get summed up. Each of the two groups
+        gets aggregated with one resample over all its columns per level. Levels that are not in the result
+        aggregation levels of the simulation parameters are returned as empty dataframes.
+        """
         pd_timeline = pd.date_range(
             start=self._simulation_parameters.start_date,
             end=self._simulation_parameters.end_date,
             freq=f"{self._simulation_parameters.seconds_per_timestep}S",
         )[:-1]
-        n_columns = results_data_frame.shape[1]
-
         results_data_frame.index = pd_timeline
+        aggregation_levels = self._simulation_parameters.result_aggregation_levels
+        is_mean_column = np.array(
+            [output.unit in self.MeanUnits for output in self.all_outputs], dtype=bool
+        )
+        mean_columns = np.flatnonzero(is_mean_column)
+        sum_columns = np.flatnonzero(~is_mean_column)
+        mean_data_frame = results_data_frame.iloc[:, mean_columns]
+        sum_data_frame = results_data_frame.iloc[:, sum_columns]
+
+        def merge_column_groups(means: Any, sums: Any, index: Any) -> pd.DataFrame:
+            """Puts the averaged and the summed up columns back into the original column order."""
+            merged_values = np.empty((len(index), len(results_data_frame.columns)))
+            merged_values[:, mean_columns] = np.asarray(means).reshape(len(index), -1)
+            merged_values[:, sum_columns] = np.asarray(sums).reshape(len(index), -1)
+            return pd.DataFrame(merged_values, index=index, columns=results_data_frame.columns)
+
+        def resample_column_groups(rule: str) -> pd.DataFrame:
+            """Resamples both column groups with the same rule."""
+            means = mean_data_frame.resample(rule).mean()
+            sums = sum_data_frame.resample(rule).sum()
+            return merge_column_groups(means, sums, means.index)
+
+        results_merged_cumulative = pd.DataFrame()
         results_merged_monthly = pd.DataFrame()
         results_merged_daily = pd.DataFrame()
         results_merged_hourly = pd.DataFrame()
-        results_merged_cumulative = pd.DataFrame()
-        for i_column in range(n_columns):
-            temp_df = pd.DataFrame(
-                results_data_frame.values[:, i_column],
-                index=pd_timeline,
-                columns=[results_data_frame.columns[i_column]],
+        if AggregationLevel.CUMULATIVE in aggregation_levels:
+            # reducing column major copies keeps the rounding of the former column by column aggregation
+            results_merged_cumulative = merge_column_groups(
+                pd.DataFrame(np.asfortranarray(mean_data_frame.to_numpy())).mean(),
+                pd.DataFrame(np.asfortranarray(sum_data_frame.to_numpy())).sum(),
+                pd.RangeIndex(1),
             )
-
-            if self.all_outputs[i_column].unit in (
-                Units.CELSIUS,
-                Units.KELVIN,
-                Units.ANY,
-                Units.METER_PER_SECOND,
-                Units.DEGREES,
-                Units.WATT,
-                Units.KILOWATT,
-                Units.WATT_PER_SQUARE_METER,
-                Units.KG_PER_SEC,
-                Units.PERCENT,
-            ):
-                temp_df_monthly = temp_df.resample("M").mean()
-                temp_df_daily = temp_df.resample("D").mean()
-                temp_df_cumulative = temp_df.mean()
-            else:
-                temp_df_monthly = temp_df.resample("M").sum()
-                temp_df_daily = temp_df.resample("D").sum()
-                temp_df_cumulative = temp_df.sum()
-
-            # monthly results
-            results_merged_monthly[temp_df_monthly.columns[0]] = temp_df_monthly.values[
-                :, 0
-            ]
-            results_merged_monthly.index = temp_df_monthly.index
-            # daily results
-            results_merged_daily[temp_df_daily.columns[0]] = temp_df_daily.values[:, 0]
-            results_merged_daily.index = temp_df_daily.index
-
-            # cumulative results
-            results_merged_cumulative[
-                temp_df_monthly.columns[0]
-            ] = temp_df_cumulative.values
-
+        if AggregationLevel.MONTHLY in aggregation_levels:
+            results_merged_monthly = resample_column_groups("M")
+        if AggregationLevel.DAILY in aggregation_levels:
+            results_merged_daily = resample_column_groups("D")
+        if AggregationLevel.HOURLY in aggregation_levels:
             if self._simulation_parameters.seconds_per_timestep != 3600:
-                if self.all_outputs[i_column].unit in (
-                    Units.CELSIUS,
-                    Units.KELVIN,
-                    Units.ANY,
-                    Units.METER_PER_SECOND,
-                    Units.DEGREES,
-                    Units.WATT,
-                    Units.KILOWATT,
-                    Units.WATT_PER_SQUARE_METER,
-                    Units.KG_PER_SEC,
-                    Units.PERCENT,
-                ):
-                    temp_df_hourly = temp_df.resample(
-                        "60T"
-                    ).mean()  # .interpolate(method="linear")
-                else:
-                    temp_df_hourly = temp_df.resample("60T").sum()
-
-                results_merged_hourly[
-                    temp_df_hourly.columns[0]
-                ] = temp_df_hourly.values[:, 0]
-                results_merged_hourly.index = temp_df_hourly.index
+                results_merged_hourly = resample_column_groups("60T")
             else:
-                results_merged_hourly[temp_df.columns[0]] = temp_df.values[:, 0]
+                results_merged_hourly = pd.DataFrame(
+                    results_data_frame.to_numpy(copy=True),
+                    columns=results_data_frame.columns,
+                )
 
         return (
             results_merged_cumulative,
@@ -8,14 +8,16 @@ import json
 import os
 from functools import wraps
 from timeit import default_timer as timer
-from typing import Any, Dict, Tuple, List
+from typing import Any, Dict, Tuple, List, Optional
 
 import pandas as pd
 import psutil
 import pytz
 
+from hisim import cache_backend
 from hisim import log
-from hisim.simulationparameters import SimulationParameters
+from hisim.cache_manager import CacheManager
+from hisim.simulationparameters import CacheFormat, SimulationParameters
 
 __authors__ = "Noah Pflugradt, Vitor Hugo Bellotto Zago"
 __copyright__ = "Copyright 2021-2022, FZJ-IEK-3 "
@@ -218,8 +220,11 @@ def convert_lpg_timestep_to_utc(data: List[int], year: int, seconds_per_timestep
     return data
 
 
-def convert_lpg_data_to_utc(data: pd.DataFrame, year: int) -> pd.DataFrame:
-    """Transform LPG data from local time (not having explicit time shifts) to UTC. """
+def convert_lpg_data_to_utc(data: pd.DataFrame, year: int, format_time: bool = True) -> pd.DataFrame:
+    """Transform LPG data from local time (not having explicit time shifts) to UTC.
+
+    Formatting the new time stamps as strings takes seconds for a year in minutes, so it can be switched off.
+    """
     # convert Time information to pandas datetime and make it to index
     data.index = pd.DatetimeIndex(pd.to_datetime(data["Time"]))
     lastdate = data.index[-1]
@@ -262,7 +267,8 @@ def convert_lpg_data_to_utc(data: pd.DataFrame, year: int) -> pd.DataFrame:
         end=dt.datetime(year=year, month=lastdate.month, day=lastdate.day, hour=23, minute=59),
         freq="T", tz="UTC",
     )
-    data["Time"] = data["Time"].dt.strftime("%m/%d/%Y %H:%M")
+    if format_time:
+        data["Time"] = data["Time"].dt.strftime("%m/%d/%Y %H:%M")
     return data
 
 
@@ -276,6 +282,7 @@ def get_cache_file(
     This will generate a file path based on any dataclass_json.
     It works by turning the class into a json string, hashing the string and then using that as filename.
     The idea is to have a unique file path for every possible configuration.
+    The file extension depends on the cache format in the simulation parameters.
     """
     json_str = parameter_class.to_json()
     if my_simulation_parameters is None:
@@ -288,16 +295,46 @@ def get_cache_file(
     # Johanna Ganglbauer: python told me "TypeError: openssl_sha256() takes at most 1 argument (2 given)",
     # I removed the second input argument "usedforsecurity=False" and it works - maybe I need to update the hashlib package?
     sha_key = hashlib.sha256(json_str_encoded).hexdigest()
-    filename = component_key + "_" + sha_key + ".cache"
+    filename = component_key + "_" + sha_key
     cache_dir_path = os.path.join(hisim_abs_path, "inputs", "cache")
-    cache_absolute_filepath = os.path.join(hisim_abs_path, "inputs", "cache", filename)
+    cache_absolute_filepath = os.path.join(cache_dir_path, filename + my_simulation_parameters.cache_format.value)
     if not os.path.isdir(cache_dir_path):
         os.mkdir(cache_dir_path)
     if os.path.isfile(cache_absolute_filepath):
+        get_cache_manager().record_access(cache_absolute_filepath)
         return True, cache_absolute_filepath
+    # cache files in the old csv format get converted on first use
+    legacy_absolute_filepath = os.path.join(cache_dir_path, filename + CacheFormat.CSV.value)
+    if legacy_absolute_filepath != cache_absolute_filepath and os.path.isfile(legacy_absolute_filepath):
+        if cache_backend.migrate_cache_file(legacy_absolute_filepath, cache_absolute_filepath):
+            get_cache_manager().record_write(cache_absolute_filepath)
+            return True, cache_absolute_filepath
     return False, cache_absolute_filepath
 
 
+def get_cache_manager() -> CacheManager:
+    """Gets the manager for the index of the cache directory."""
+    return CacheManager(HISIMPATH["cache_dir"], HISIMPATH["cache_indices"])
+
+
+def load_cache(cache_filepath: str) -> Dict[str, Any]:
+    """Loads the columns of a cache file from get_cache_file as arrays."""
+    columns, _metadata = cache_backend.get_cache_backend(cache_filepath).load(cache_filepath)
+    return columns
+
+
+def load_cache_metadata(cache_filepath: str) -> Dict[str, Any]:
+    """Loads the metadata that was saved together with the columns of a cache file."""
+    _columns, metadata = cache_backend.get_cache_backend(cache_filepath).load(cache_filepath)
+    return metadata
+
+
+def save_cache(cache_filepath: str, columns: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Saves equally long columns and optionally some json serializable metadata in a cache file from get_cache_file."""
+    cache_backend.get_cache_backend(cache_filepath).save(cache_filepath, columns, metadata)
+    get_cache_manager().record_write(cache_filepath)
+
+
 def load_export_load_profile_generator(target):  # noqa
     """Returns the paths for the SQL exported files from the Load Profile Generator."""
     targetpath = os.path.join(
@@ -344,21 +381,15 @@ def measure_memory_leak(my_function):  # noqa
     @wraps(my_function)
     def function_wrapper_for_measuring_memory_leak(*args, **kwargs):
         """Inner function for the time measuring utility decorator."""
+        if not log.is_enabled(log.LogPrio.TRACE):
+            return my_function(*args, **kwargs)
         process = psutil.Process(os.getpid())
         rss_by_psutil_start = process.memory_info().rss / (1024 * 1024)
         result = my_function(*args, **kwargs)
         rss_by_psutil_end = process.memory_info().rss / (1024 * 1024)
         gc.collect()
         diff = rss_by_psutil_end - rss_by_psutil_start
-        log.trace(
-            "Executing "
-            + my_function.__module__
-            + "."
-            + my_function.__name__
-            + " leaked "
-            + f"{diff:1.2f}"
-            + " MB"
-        )
+        log.trace("Executing %s.%s leaked %1.2f MB", my_function.__module__, my_function.__name__, diff)
         return result
 
     return function_wrapper_for_measuring_memory_leak
@@ -1,8 +1,10 @@
+from hplib import hplib as hpl
 from hisim import component as cp
 from hisim.components.advanced_heat_pump_hplib import (
     HeatPumpHplib,
     HeatPumpHplibConfig,
     HeatPumpState,
+    HplibEvaluator,
 )
 from hisim import loadtypes as lt
 from hisim.simulationparameters import SimulationParameters
@@ -93,3 +95,19 @@ def test_heat_pump_hplib():
     assert 0.47619047619047616 == stsv.values[heatpump.m_dot.global_index]
     assert 60 == stsv.values[heatpump.time_on.global_index]
     assert 0 == stsv.values[heatpump.time_off.global_index]
+
+
+@pytest.mark.base
+def test_hplib_evaluator():
+    """Tests that the fast evaluation gives the same results as hpl.simulate."""
+    parameters = hpl.get_parameters("Generic", 1, -7, 52, 10000)
+    evaluator = HplibEvaluator(parameters)
+    for mode in [1, 2]:
+        for t_in_primary, t_in_secondary in [(-7.0, 47.0), (3.5, 30.2), (12.0, 50.0), (31.0, 18.0)]:
+            reference = hpl.simulate(t_in_primary, t_in_secondary, parameters, t_in_primary, mode=mode)
+            expected = tuple(reference[column].values[0] for column in ["P_th", "P_el", "COP", "EER", "T_out", "m_dot"])
+            assert evaluator.simulate(t_in_primary, t_in_secondary, t_in_primary, mode) == expected
+    # the second call of the same inputs comes from the memo
+    evaluator.simulate(-7.0, 47.0, -7.0, 1)
+    assert evaluator.memoized_calculate.cache_info().hits == 1
+    evaluator.check_against_hplib(1e-9)
@@ -0,0 +1,49 @@
+"""Test for the slices of the advanced stratified water storage."""
+
+# clean
+
+import numpy as np
+import pytest
+
+from hisim.components import advanced_stratified_water_storage
+from hisim.components.configuration import WarmWaterStorageConfig
+
+
+@pytest.mark.base
+def test_warm_water_storage_simulation(monkeypatch):
+    """Tests that the tank keeps its mass and that restoring a saved state repeats the timestep exactly."""
+    # the simulation reads these values from the config class
+    for name, value in [
+        ("temperature_difference", 0.01),
+        ("tank_u_value", 0.35),
+        ("slice_height_minimum", 0.0005),
+        ("tank_height", 2.0),
+    ]:
+        monkeypatch.setattr(WarmWaterStorageConfig, name, value, raising=False)
+    my_config = WarmWaterStorageConfig.get_default_config()
+    my_config.tank_height = 2.0
+    my_config.tank_start_temperature = 40.0
+    my_storage = advanced_stratified_water_storage.WarmWaterStorageSimulation(my_config)
+    initial_mass = my_storage.calculate_tanks_mass()
+
+    # hotter and hotter water comes in on top, so every timestep adds a new slice
+    for timestep in range(200):
+        saved_state = my_storage.begin_new_timestep()
+        results = []
+        for _ in range(2):
+            my_storage.reset_to_last_timestep(saved_state)
+            output_top, output_bottom, heat_losses = my_storage.simulate_one_timestep(
+                60, 45.0 + timestep * 0.2, 5.0, True, 20.0, 2.0, False
+            )
+            my_storage.check_slice_temperature_order()
+            results.append(
+                (output_top.temperature, output_bottom.temperature, heat_losses, my_storage.get_slices().copy())
+            )
+        assert results[0][:3] == results[1][:3]
+        assert np.array_equal(results[0][3], results[1][3])
+
+    # the tank has grown beyond its initial capacity and is still layered from hot to cold
+    temperatures = my_storage.get_slices()[my_storage.Temperature]
+    assert my_storage.number_of_slices > my_storage.InitialCapacity
+    assert np.all(np.diff(temperatures) < 0)
+    assert my_storage.calculate_tanks_mass() == pytest.approx(initial_mass)
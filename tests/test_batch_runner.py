@@ -0,0 +1,51 @@
+"""Test for the batch runner."""
+
+# clean
+
+from typing import List
+
+import pytest
+
+from hisim import batch_runner
+from hisim.sim_repository_singleton import SingletonSimRepository
+
+
+@pytest.mark.base
+def test_batch_runner(monkeypatch):
+    """Tests that every attempt starts with new singletons and that failures get retried and reported."""
+    leaked_entries: List[str] = []
+    attempts: List[str] = []
+
+    def fake_main(path_to_module, function_in_module, my_module_config_path=None):
+        """Stands in for a simulation that uses the sim repository."""
+        if SingletonSimRepository().exist_entry("task"):
+            leaked_entries.append(SingletonSimRepository().get_entry("task"))
+        SingletonSimRepository().set_entry("task", function_in_module)
+        attempts.append(function_in_module)
+        if function_in_module == "failing" or (function_in_module == "flaky" and attempts.count("flaky") == 1):
+            raise ValueError("Simulation of " + function_in_module + " failed.")
+
+    monkeypatch.setattr(batch_runner.hisim_main, "main", fake_main)
+    tasks = [batch_runner.BatchTask.from_string("setup.py:" + name) for name in ["working", "flaky", "failing"]]
+    results = batch_runner.run_batch(tasks, number_of_workers=1, retries=1)
+
+    assert not leaked_entries
+    assert attempts == ["working", "flaky", "flaky", "failing", "failing"]
+    assert [(result.succeeded, result.attempts) for result in results] == [(True, 1), (True, 2), (False, 2)]
+    assert results[2].error == "ValueError: Simulation of failing failed."
+    assert batch_runner.get_summary_lines(results)[-1] == "2 of 3 tasks succeeded."
+
+
+@pytest.mark.base
+def test_batch_task_from_string():
+    """Tests that windows paths with drive letters get parsed into module, function and module config."""
+    task = batch_runner.BatchTask.from_string("C:\\hisim\\examples\\household.py:setup_function:D:\\configs\\config.json")
+    assert task.path_to_module == "C:\\hisim\\examples\\household.py"
+    assert task.function_in_module == "setup_function"
+    assert task.module_config_path == "D:\\configs\\config.json"
+    task = batch_runner.BatchTask.from_string("C:\\hisim\\examples\\household.py:setup_function")
+    assert task.path_to_module == "C:\\hisim\\examples\\household.py"
+    assert task.module_config_path is None
+    assert batch_runner.BatchTask.from_string("C:\\hisim\\system.json").json_filepath == "C:\\hisim\\system.json"
+    with pytest.raises(ValueError):
+        batch_runner.BatchTask.from_string("C:\\hisim\\examples\\household.py")
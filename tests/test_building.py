@@ -166,3 +166,55 @@ def test_building():
     starttime = datetime.datetime.now()
     d_four = starttime.strftime("%d-%b-%Y %H:%M:%S")
     log.profile("Finished @ " + d_four)
+
+
+@pytest.mark.base
+def test_solar_heat_gain_through_windows_for_all_timesteps():
+    """Tests that the precalculated solar gains equal the solar gains calculated in every timestep."""
+    my_simulation_parameters = SimulationParameters.full_year(
+        year=2021, seconds_per_timestep=3600
+    )
+    repo = component.SimRepository()
+    my_weather = weather.Weather(
+        config=weather.WeatherConfig.get_default(weather.LocationEnum.Aachen),
+        my_simulation_parameters=my_simulation_parameters,
+    )
+    my_weather.set_sim_repo(repo)
+    my_weather.i_prepare_simulation()
+    my_residence = building.Building(
+        config=building.BuildingConfig.get_default_german_single_family_home(),
+        my_simulation_parameters=my_simulation_parameters,
+    )
+    my_residence.set_sim_repo(repo)
+    # gains of another weather get replaced by the gains of the current weather
+    my_residence.solar_heat_gain_through_windows = [-1.0] * my_simulation_parameters.timesteps
+    my_residence.i_prepare_simulation()
+
+    assert my_residence.solar_heat_gain_through_windows is not None
+    assert len(my_residence.solar_heat_gain_through_windows) == my_simulation_parameters.timesteps
+    for timestep in range(0, my_simulation_parameters.timesteps, 11):
+        assert my_residence.solar_heat_gain_through_windows[
+            timestep
+        ] == my_residence.get_solar_heat_gain_through_windows(
+            azimuth=my_weather.azimuth_list[timestep],
+            direct_normal_irradiance=my_weather.DNI_list[timestep],
+            direct_horizontal_irradiance=my_weather.DHI_list[timestep],
+            global_horizontal_irradiance=my_weather.GHI_list[timestep],
+            direct_normal_irradiance_extra=my_weather.DNIextra_list[timestep],
+            apparent_zenith=my_weather.apparent_zenith_list[timestep],
+        )
+    assert max(my_residence.solar_heat_gain_through_windows) > 0
+
+
+@pytest.mark.base
+def test_tabula_building_data():
+    """Tests that the indexed lookup gives the same rows as searching the TABULA data."""
+    tabula_data = building.get_tabula_data()
+    for building_code in [
+        building.BuildingConfig.get_default_german_single_family_home().building_code,
+        tabula_data["Code_BuildingVariant"].dropna().iloc[-1],
+        "unknown building code",
+    ]:
+        expected = tabula_data.loc[tabula_data["Code_BuildingVariant"] == building_code]
+        assert building.get_tabula_building_data(building_code).equals(expected)
+    assert building.get_tabula_data.cache_info().misses == 1
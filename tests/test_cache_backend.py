@@ -0,0 +1,54 @@
+"""Test for the cache file formats."""
+
+# clean
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import cache_backend
+from hisim.simulationparameters import CacheFormat
+
+
+@pytest.mark.base
+def test_cache_backends(tmp_path):
+    """Tests that both formats give back the same columns and metadata."""
+    columns = {"output": [0.1, 0.2, 1 / 3], "car_location": [0, 1, 2]}
+    for cache_format in CacheFormat:
+        filepath = os.path.join(str(tmp_path), "Test_key" + cache_format.value)
+        backend = cache_backend.get_cache_backend(filepath)
+        backend.save(filepath, columns, metadata={"saved_files": ["a.json"]})
+        loaded_columns, metadata = backend.load(filepath)
+
+        assert list(loaded_columns) == ["output", "car_location"]
+        assert loaded_columns["output"].tolist() == columns["output"]
+        assert loaded_columns["car_location"].tolist() == columns["car_location"]
+        assert metadata == {"saved_files": ["a.json"]}
+
+
+@pytest.mark.base
+def test_migrate_cache_file(tmp_path):
+    """Tests that old csv caches with index column and old json caches of the UTSP connector get converted."""
+    legacy_filepath = os.path.join(str(tmp_path), "Weather_key.cache")
+    pd.DataFrame({"DNI": [1.5, 2.5], "t_out": [3.0, 4.0]}).to_csv(legacy_filepath)
+    filepath = os.path.join(str(tmp_path), "Weather_key.npy")
+
+    assert cache_backend.migrate_cache_file(legacy_filepath, filepath)
+    assert not os.path.isfile(legacy_filepath)
+    columns, metadata = cache_backend.get_cache_backend(filepath).load(filepath)
+    assert list(columns) == ["DNI", "t_out"]
+    assert np.array_equal(columns["DNI"], [1.5, 2.5])
+    assert metadata == {}
+
+    legacy_filepath = os.path.join(str(tmp_path), "UTSP_key.cache")
+    with open(legacy_filepath, "w", encoding="utf-8") as file:
+        json.dump({"saved_files": [], "data": pd.DataFrame({"water_consumption": [0.0, 7.0]}).to_csv()}, file)
+    filepath = os.path.join(str(tmp_path), "UTSP_key.npy")
+
+    assert cache_backend.migrate_cache_file(legacy_filepath, filepath)
+    columns, metadata = cache_backend.get_cache_backend(filepath).load(filepath)
+    assert columns["water_consumption"].tolist() == [0.0, 7.0]
+    assert metadata == {"saved_files": []}
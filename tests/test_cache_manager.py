@@ -0,0 +1,37 @@
+"""Test for the index and the size limit of the cache directory."""
+
+# clean
+
+import os
+
+import pytest
+
+from hisim import cache_backend
+from hisim.cache_manager import CacheManager
+
+
+@pytest.mark.base
+def test_cache_manager(tmp_path):
+    """Tests that the least recently used files get evicted and that pruning by component works."""
+    cache_directory = str(tmp_path)
+    my_cache_manager = CacheManager(cache_directory, os.path.join(cache_directory, "cache_indices.json"))
+    filepaths = [os.path.join(cache_directory, name) for name in ["Weather_a.npy", "PVSystem_b.npy", "PVSystem_c.npy"]]
+    for filepath in filepaths:
+        cache_backend.get_cache_backend(filepath).save(filepath, {"output": [0.0] * 1000})
+        my_cache_manager.record_write(filepath)
+    entry_size = my_cache_manager.load_index()["entries"]["Weather_a.npy"]["size_in_bytes"]
+
+    # the weather file gets used again, so the first PV file is the least recently used one
+    my_cache_manager.record_access(filepaths[0])
+    my_cache_manager.set_size_limit(2 * entry_size)
+
+    assert sorted(os.listdir(cache_directory)) == ["PVSystem_c.npy", "Weather_a.npy", "cache_indices.json"]
+    assert my_cache_manager.get_report_lines()[-1].startswith("2 cache files")
+
+    # a new file pushes out the least recently used one, but never itself
+    cache_backend.get_cache_backend(filepaths[1]).save(filepaths[1], {"output": [0.0] * 1000})
+    my_cache_manager.record_write(filepaths[1])
+    assert sorted(my_cache_manager.load_index()["entries"]) == ["PVSystem_b.npy", "Weather_a.npy"]
+
+    assert my_cache_manager.prune(component="PVSystem") == ["PVSystem_b.npy"]
+    assert sorted(os.listdir(cache_directory)) == ["Weather_a.npy", "cache_indices.json"]
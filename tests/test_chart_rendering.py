@@ -0,0 +1,93 @@
+"""Test for the chart rendering on a process pool."""
+
+# clean
+
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim.postprocessing import chartbase
+from hisim.postprocessing.chart_rendering import ChartRenderer, ChartType
+from hisim.postprocessing.postprocessing_datatransfer import PostProcessingDataTransfer
+from hisim.simulationparameters import SimulationParameters
+
+
+@pytest.mark.base
+def test_chart_rendering(tmp_path):
+    """Tests that the workers render the same charts in the same order as the sequential rendering."""
+    all_outputs = [
+        cp.ComponentOutput("FakeSource", "Power", lt.LoadTypes.ELECTRICITY, lt.Units.WATT, output_description="a"),
+        cp.ComponentOutput("FakeSource", "Heat", lt.LoadTypes.HEATING, lt.Units.WATT, output_description="b"),
+        cp.ComponentOutput("OtherSource", "Temperature", lt.LoadTypes.TEMPERATURE, lt.Units.CELSIUS, output_description="c"),
+    ]
+    file_paths = []
+    for number_of_workers in [1, 2]:
+        result_directory = os.path.join(str(tmp_path), str(number_of_workers))
+        os.makedirs(result_directory)
+        my_simulation_parameters = SimulationParameters(
+            datetime.datetime(2021, 1, 1),
+            datetime.datetime(2021, 1, 2),
+            seconds_per_timestep=60,
+            result_directory=result_directory,
+            chart_rendering_workers=number_of_workers,
+        )
+        index = pd.date_range("2021-01-01", periods=my_simulation_parameters.timesteps, freq="T")
+        results = pd.DataFrame(
+            np.arange(len(index) * len(all_outputs), dtype=float).reshape(len(index), len(all_outputs)),
+            index=index,
+            columns=[output.get_pretty_name() for output in all_outputs],
+        )
+        ppdt = PostProcessingDataTransfer(
+            results=results,
+            all_outputs=all_outputs,
+            simulation_parameters=my_simulation_parameters,
+            wrapped_components=[],
+            mode=1,
+            setup_function="",
+            module_filename="",
+            my_module_config_path=None,
+            execution_time=0,
+            results_monthly=None,
+            results_hourly=None,
+            results_cumulative=None,
+            results_daily=None,
+        )
+        my_chart_renderer = ChartRenderer(ppdt)
+        try:
+            report_image_entries = my_chart_renderer.render(ChartType.LINE)
+            report_image_entries += my_chart_renderer.render(ChartType.CARPET)
+        finally:
+            my_chart_renderer.close()
+
+        assert all(os.path.isfile(entry.file_path) for entry in report_image_entries)
+        assert sorted(os.listdir(result_directory)) == ["FakeSource", "OtherSource"]
+        file_paths.append([os.path.relpath(entry.file_path, result_directory) for entry in report_image_entries])
+
+    assert file_paths[0] == file_paths[1]
+    assert [entry.split(os.sep)[1] for entry in file_paths[0][:3]] == ["Power", "Heat", "Temperature"]
+
+
+@pytest.mark.base
+def test_downsampling():
+    """Tests that the downsampled line keeps the ends, the extremes and the gaps of every bucket."""
+    number_of_values = 10000
+    values = np.sin(np.arange(number_of_values) / 50.0) + np.random.default_rng(1).normal(scale=0.1, size=number_of_values)
+    values[5000:5100] = np.nan
+    data = pd.Series(values, index=pd.date_range("2021-01-01", periods=number_of_values, freq="T"))
+
+    downsampled = chartbase.downsample_line(data, number_of_buckets=300)
+    assert len(downsampled) <= 4 * 300
+    assert downsampled.index.is_monotonic_increasing
+    assert downsampled.index[0] == data.index[0] and downsampled.index[-1] == data.index[-1]
+    assert np.nanmin(downsampled) == np.nanmin(data) and np.nanmax(downsampled) == np.nanmax(data)
+    assert downsampled.isna().any()
+    assert chartbase.downsample_line(data, number_of_buckets=5000) is data
+
+    # one minute timesteps on 400 pixel rows: 3 timesteps per row, 20 rows per hour
+    assert chartbase.get_carpet_downsampling_factor(steps_per_hour=60, steps_per_day=1440, number_of_pixel_rows=400) == 3
+    assert chartbase.get_carpet_downsampling_factor(steps_per_hour=4, steps_per_day=96, number_of_pixel_rows=400) == 1
@@ -0,0 +1,68 @@
+"""Test for the dependency ordered component scheduling."""
+
+# clean
+
+from typing import List
+
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim.component_scheduler import ComponentScheduler
+from hisim.component_wrapper import ComponentWrapper
+from hisim.components.example_transformer import ExampleTransformer, ExampleTransformerConfig
+from hisim.components.random_numbers import RandomNumbers, RandomNumbersConfig
+from hisim.components.sumbuilder import SumBuilderConfig, SumBuilderForTwoInputs
+from hisim.simulationparameters import SimulationParameters
+
+
+@pytest.mark.base
+def test_component_scheduler():
+    """Tests that sources come first, circles get grouped and everything else follows its inputs."""
+    mysim: SimulationParameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=60)
+
+    my_random_numbers = RandomNumbers(
+        config=RandomNumbersConfig(name="Random numbers", timesteps=mysim.timesteps, minimum=0, maximum=1),
+        my_simulation_parameters=mysim,
+    )
+    my_transformer_1 = ExampleTransformer(
+        config=ExampleTransformerConfig(name="Transformer 1", loadtype=lt.LoadTypes.ANY, unit=lt.Units.ANY),
+        my_simulation_parameters=mysim,
+    )
+    my_transformer_2 = ExampleTransformer(
+        config=ExampleTransformerConfig(name="Transformer 2", loadtype=lt.LoadTypes.ANY, unit=lt.Units.ANY),
+        my_simulation_parameters=mysim,
+    )
+    my_sum = SumBuilderForTwoInputs(
+        config=SumBuilderConfig.get_sumbuilder_default_config(), my_simulation_parameters=mysim
+    )
+
+    # the two transformers feed each other, the sum depends on the circle and the random numbers
+    my_transformer_1.connect_input(
+        ExampleTransformer.TransformerInput, my_transformer_2.component_name, ExampleTransformer.TransformerOutput
+    )
+    my_transformer_2.connect_input(
+        ExampleTransformer.TransformerInput, my_transformer_1.component_name, ExampleTransformer.TransformerOutput
+    )
+    my_sum.connect_input(my_sum.SumInput1, my_random_numbers.component_name, my_random_numbers.RandomOutput)
+    my_sum.connect_input(my_sum.SumInput2, my_transformer_1.component_name, ExampleTransformer.TransformerOutput)
+
+    # add them in an order that does not fit the dependencies
+    all_outputs: List[cp.ComponentOutput] = []
+    wrapped_components: List[ComponentWrapper] = []
+    for component in [my_sum, my_transformer_1, my_transformer_2, my_random_numbers]:
+        wrapped_component = ComponentWrapper(component, False)
+        wrapped_component.register_component_outputs(all_outputs)
+        wrapped_components.append(wrapped_component)
+    for wrapped_component in wrapped_components:
+        wrapped_component.connect_inputs(all_outputs)
+
+    my_scheduler = ComponentScheduler(wrapped_components)
+    groups = my_scheduler.component_groups
+
+    assert [group.get_component_names() for group in groups] == [
+        ["Transformer 1", "Transformer 2"],
+        ["Random numbers"],
+        ["Sum"],
+    ]
+    assert [group.is_cyclic for group in groups] == [True, False, False]
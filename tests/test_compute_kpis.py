@@ -0,0 +1,77 @@
+"""Test for the KPIs computed on the result matrix."""
+
+# clean
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim import log
+from hisim.postprocessing import compute_kpis
+from hisim.result_store import ResultStore
+from hisim.sim_repository_singleton import SingletonMeta
+from hisim.simulationparameters import SimulationParameters
+
+
+@pytest.mark.base
+def test_compute_kpis_of_result_stores(tmp_path, monkeypatch):
+    """Tests that the KPIs of a saved result store are the KPIs of the simulation and add up as expected."""
+    # compute_kpis logs warnings, independent of the logging level other tests left behind
+    monkeypatch.setattr(log, "LOGGING_LEVEL", log.LogPrio.INFORMATION)
+    SingletonMeta.reset_instances()
+    all_outputs = [
+        cp.ComponentOutput(
+            "PV", "ElectricityOutput", lt.LoadTypes.ELECTRICITY, lt.Units.WATT,
+            postprocessing_flag=[lt.InandOutputType.ELECTRICITY_PRODUCTION],
+        ),
+        cp.ComponentOutput(
+            "Occupancy", "ElectricityOutput", lt.LoadTypes.ELECTRICITY, lt.Units.WATT,
+            postprocessing_flag=[lt.InandOutputType.ELECTRICITY_CONSUMPTION_UNCONTROLLED],
+        ),
+        cp.ComponentOutput(
+            "GasHeater", "GasDemand", lt.LoadTypes.GAS, lt.Units.WATT,
+            postprocessing_flag=[lt.InandOutputType.FUEL_CONSUMPTION, lt.LoadTypes.GAS],
+        ),
+        cp.ComponentOutput("Building", "TemperatureIndoorAir", lt.LoadTypes.TEMPERATURE, lt.Units.CELSIUS),
+    ]
+    my_simulation_parameters = SimulationParameters(
+        datetime.datetime(2021, 1, 1), datetime.datetime(2021, 1, 2), seconds_per_timestep=3600,
+        result_directory=str(tmp_path),
+    )
+    my_result_store = ResultStore(
+        number_of_timesteps=24, all_outputs=all_outputs, memory_map_directory=str(tmp_path),
+        seconds_per_timestep=3600,
+    )
+    # 2 kW production in the first 12 hours, 1 kW consumption and 1 kW gas all day, 18 °C in the first 6 hours
+    my_result_store.values[:12, 0] = 2000.0
+    my_result_store.values[:, 1] = 1000.0
+    my_result_store.values[:, 2] = 1000.0
+    my_result_store.values[:, 3] = np.where(np.arange(24) < 6, 18.0, 21.0)
+    my_result_store.flush()
+
+    kpi_table = compute_kpis.compute_kpis(
+        components=[],
+        results=my_result_store.get_data_frame(index=pd.date_range("2021-01-01", periods=24, freq="h")),
+        all_outputs=all_outputs,
+        simulation_parameters=my_simulation_parameters,
+    )
+    kpis = compute_kpis.compute_kpis_of_result_stores([str(tmp_path)]).iloc[0]
+
+    assert kpis["consumption_sum"] == 24 and kpis["production_sum"] == 24
+    assert kpis["self_consumption_sum"] == 12 and kpis["injection_sum"] == 12
+    assert kpis["autarky_rate"] == 50 and kpis["self_consumption_rate"] == 50
+    assert kpis["time_in_hours_of_building_being_below_heating_set_temperature"] == 6
+    assert kpis["min_temperature_reached_in_celsius"] == 18
+    price_frame = compute_kpis.read_in_fuel_costs()
+    electricity_price, electricity_co2 = compute_kpis.get_euro_and_co2(price_frame, lt.LoadTypes.ELECTRICITY)
+    gas_price, gas_co2 = compute_kpis.get_euro_and_co2(price_frame, lt.LoadTypes.GAS)
+    # the injection is paid with the electricity price as well
+    assert electricity_price > 0
+    assert kpis["price"] == pytest.approx(24 * gas_price)
+    assert kpis["co2"] == pytest.approx(12 * electricity_co2 + 24 * gas_co2)
+    assert kpi_table[1] == ["Consumption:", "  24", "kWh"]
+    assert kpi_table[10] == ["CO2 emitted due energy use:", f"{kpis['co2']:3.0f}", "kg"]
@@ -0,0 +1,46 @@
+"""Test for the seasonal aggregation of the csv for the housing data base."""
+
+# clean
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim.postprocessing import generate_csv_for_housing_database
+from hisim.simulationparameters import SimulationParameters
+
+
+@pytest.mark.base
+def test_seasonal_sums():
+    """Tests that the seasons follow the simulation year and that all columns get summed up per season."""
+    timestamps = pd.DatetimeIndex(
+        ["2021-01-01 06:00", "2021-03-23 00:00", "2021-07-01 06:00", "2021-07-01 18:00", "2021-10-01 18:00"]
+    )
+    is_day = np.array([True, True, True, False, False])
+    labels = generate_csv_for_housing_database.get_seasonal_labels(timestamps=timestamps, is_day=is_day)
+    # winter day, no season at the border of winter and intermediate, summer day, summer night, intermediate night
+    assert labels.tolist() == [2, -1, 0, 1, 5]
+
+    values = np.arange(10, dtype=float).reshape(5, 2)
+    values[2, 1] = np.nan
+    seasonal_sums = generate_csv_for_housing_database.compute_seasonal_sums(values=values, labels=labels)
+    assert seasonal_sums.shape == (6, 2)
+    assert seasonal_sums[:, 0].tolist() == [4.0, 6.0, 0.0, 0.0, 0.0, 8.0]
+    assert seasonal_sums[:, 1].tolist() == [0.0, 7.0, 1.0, 0.0, 0.0, 9.0]
+
+    assert generate_csv_for_housing_database.get_number_of_days_of_seasons(2019).tolist() == [94, 94, 92, 92, 179, 179]
+    assert generate_csv_for_housing_database.get_number_of_days_of_seasons(2020)[2] == 93
+
+
+@pytest.mark.base
+def test_seasonal_labels_of_simulation_timestamps():
+    """Tests that the timestamps of a full year at 15 minutes cover all seasons at day and night."""
+    simulation_parameters = SimulationParameters.full_year(year=2021, seconds_per_timestep=900)
+    timestamps = generate_csv_for_housing_database.get_timestamps_of_simulation(
+        simulation_parameters=simulation_parameters, number_of_timesteps=simulation_parameters.timesteps
+    )
+    assert timestamps[0] == pd.Timestamp("2021-01-01 00:00")
+    assert timestamps[-1] == pd.Timestamp("2021-12-31 23:45")
+    is_day = (timestamps.hour >= 6) & (timestamps.hour < 18)
+    labels = generate_csv_for_housing_database.get_seasonal_labels(timestamps=timestamps, is_day=np.asarray(is_day))
+    assert set(labels.tolist()) == {0, 1, 2, 3, 4, 5}
@@ -0,0 +1,50 @@
+"""Test for reading the electric vehicle data of the Load Profile Generator."""
+
+# clean
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from hisim.components.generic_ev_charger import read_ev_data_of_load_profile_generator
+
+
+@pytest.mark.base
+def test_read_ev_data_of_load_profile_generator(tmp_path):
+    """Tests that only the states from the first year on are read and the discharge is computed from the range."""
+    database_filepath = os.path.join(str(tmp_path), "Results.HH1.sqlite")
+    with closing(sqlite3.connect(database_filepath)) as connection:
+        connection.execute("CREATE TABLE TransportationDevices (Name TEXT, Json TEXT)")
+        connection.executemany(
+            "INSERT INTO TransportationDevices VALUES (?, ?)",
+            [
+                ("Car with Charging", json.dumps({"FullRangeInMeters": 1000, "EnergyToDistanceFactor": 0.5})),
+                ("Bicycle", json.dumps({"FullRangeInMeters": 10, "EnergyToDistanceFactor": 2})),
+            ],
+        )
+        connection.execute(
+            "CREATE TABLE TransportationDeviceStates (DateTime TEXT, DeviceState TEXT, CurrentRange REAL)"
+        )
+        connection.executemany(
+            "INSERT INTO TransportationDeviceStates VALUES (?, ?, ?)",
+            [
+                ("31/12/2018 23:59", "Driving", 100.0),
+                ("01/01/2019 00:00", "ParkingAndCharging", 3600.0),
+                ("1/1/2019 0:01", "Driving", 1800.0),
+                ("01/01/2019 00:02", "ParkingAndFullyCharged", 1800.0),
+                ("02/01/2019 00:00", "Parking", 0.0),
+            ],
+        )
+        connection.commit()
+
+    car_in_charging_station, discharge = read_ev_data_of_load_profile_generator(database_filepath)
+    assert car_in_charging_station.tolist() == [True, False, True, False]
+    # with an energy to distance factor of 0.5, a range of 1800 m equals 1 Wh
+    assert discharge.tolist() == [0.0, -1.0, 0.0, -1.0]
+
+    car_in_charging_station, discharge = read_ev_data_of_load_profile_generator(database_filepath, first_year=2018)
+    assert car_in_charging_station.tolist() == [False, True, False, True, False]
+    assert discharge.tolist() == [0.0, 0.0, -1.0, 0.0, -1.0]
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from hisim import sim_repository
 from hisim import component
@@ -62,3 +63,29 @@ def test_photovoltaic():
         abs(0.4532226665022684 - stsv.values[my_pvs.electricity_outputC.global_index])
         < 0.05
     )
+
+    # the output calculated for all timesteps at once needs to match the single timestep calculation
+    weather_values = {
+        "dni_extra": my_weather.DNIextra_list,
+        "DNI": my_weather.DNI_list,
+        "DHI": my_weather.DHI_list,
+        "GHI": my_weather.GHI_list,
+        "azimuth": my_weather.azimuth_list,
+        "apparent_zenith": my_weather.apparent_zenith_list,
+        "temperature": my_weather.temperature_list,
+        "wind_speed": my_weather.wind_speed_list,
+    }
+    all_timesteps = generic_pv_system.simPhotovoltaicFastForAllTimesteps(
+        temperature_model=my_pvs.temp_model,
+        surface_azimuth=my_pvs_config.azimuth,
+        surface_tilt=my_pvs_config.tilt,
+        **{name: np.array(values) for name, values in weather_values.items()}
+    )
+    for timestep in [0, 655, 300000]:
+        single_timestep = generic_pv_system.simPhotovoltaicFast(
+            temperature_model=my_pvs.temp_model,
+            surface_azimuth=my_pvs_config.azimuth,
+            surface_tilt=my_pvs_config.tilt,
+            **{name: values[timestep] for name, values in weather_values.items()}
+        )
+        assert all_timesteps[timestep] == single_timestep
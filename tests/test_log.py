@@ -0,0 +1,67 @@
+"""Test for the buffered and asynchronous logging."""
+
+# clean
+
+import os
+
+import pytest
+
+from hisim import log
+
+
+@pytest.mark.base
+def test_log(tmp_path, monkeypatch, capsys):
+    """Tests that messages above the logging level only go to the log file and that queued messages all arrive."""
+    log_filepath = os.path.join(str(tmp_path), "test.log")
+    monkeypatch.setattr(log, "LOG_FILE_NAME", log_filepath)
+    monkeypatch.setattr(log, "LOGGING_LEVEL", log.LogPrio.INFORMATION)
+    monkeypatch.setattr(log, "LOG_FILE_LEVEL", log.LogPrio.TRACE)
+
+    log.debug("Not printed: %s", "debug")
+    log.information("Synchronous %s", 1)
+    log.start_async_logging()
+    for number in range(100):
+        log.information("Asynchronous %d", number)
+    log.stop_async_logging()
+    log.flush()
+
+    with open(log_filepath, "r", encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert lines == ["Not printed: debug", "Synchronous 1"] + ["Asynchronous " + str(number) for number in range(100)]
+    printed = capsys.readouterr().out
+    assert "IFO:Synchronous 1" in printed
+    assert "Not printed" not in printed
+
+
+class FormattingCounter:
+
+    """Counts how often it gets formatted into a message."""
+
+    def __init__(self):
+        """Initializes the counter."""
+        self.count = 0
+
+    def __str__(self):
+        """Counts the formatting."""
+        self.count += 1
+        return "counted"
+
+
+@pytest.mark.base
+def test_log_file_level(tmp_path, monkeypatch):
+    """Tests that messages above the logging level and the log file level get dropped before they are formatted."""
+    log_filepath = os.path.join(str(tmp_path), "test.log")
+    monkeypatch.setattr(log, "LOG_FILE_NAME", log_filepath)
+    monkeypatch.setattr(log, "LOGGING_LEVEL", log.LogPrio.INFORMATION)
+    monkeypatch.setattr(log, "LOG_FILE_LEVEL", log.LogPrio.DEBUG)
+    counter = FormattingCounter()
+
+    log.trace("Dropped: %s", counter)
+    log.debug("Written: %s", counter)
+    log.flush()
+
+    assert counter.count == 1
+    assert not log.is_enabled(log.LogPrio.TRACE)
+    assert log.is_enabled(log.LogPrio.DEBUG)
+    with open(log_filepath, "r", encoding="utf-8") as file:
+        assert file.read().splitlines() == ["Written: counted"]
@@ -0,0 +1,86 @@
+"""Test for the store of the parsed result files of the Load Profile Generator."""
+
+# clean
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from hisim import log, lpg_result_store
+
+
+@pytest.mark.base
+def test_lpg_result_store(tmp_path, monkeypatch):
+    """Tests that the result files get parsed once and again after they changed."""
+    # the store logs the parsed files, independent of the logging level other tests left behind
+    monkeypatch.setattr(log, "LOGGING_LEVEL", log.LogPrio.INFORMATION)
+    reports_directory = os.path.join(str(tmp_path), "Reports")
+    results_directory = os.path.join(str(tmp_path), "Results")
+    os.makedirs(reports_directory)
+    os.makedirs(results_directory)
+    events = [{"Device": {"Name": name}, "TotalDuration": duration} for name, duration in [("B", 1), ("A", 2), ("B", 3)]]
+    flexibility_filepath = os.path.join(reports_directory, lpg_result_store.FlexibilityEventsFilename)
+    with open(flexibility_filepath, "w", encoding="utf-8") as openfile:
+        json.dump(events, openfile)
+    with open(os.path.join(results_directory, "DrivingDistance.Car1, 1.json"), "w", encoding="utf-8") as openfile:
+        json.dump({"Values": [1, 2, 3]}, openfile)
+    with open(os.path.join(results_directory, "CarLocation.Car1, 1.json"), "w", encoding="utf-8") as openfile:
+        json.dump({"Values": ["Home", None, "Workplace"]}, openfile)
+
+    loaded_files = []
+    original_load = json.load
+
+    def counting_load(openfile):
+        loaded_files.append(openfile.name)
+        return original_load(openfile)
+
+    monkeypatch.setattr(lpg_result_store.json, "load", counting_load)
+    store = lpg_result_store.get_lpg_result_store(reports_directory, results_directory)
+    assert lpg_result_store.get_lpg_result_store(reports_directory, results_directory) is store
+
+    events_by_device = store.get_flexibility_events_by_device()
+    assert list(events_by_device) == ["B", "A"]
+    assert [event["TotalDuration"] for event in events_by_device["B"]] == [1, 3]
+    assert store.get_flexibility_events_by_device() is events_by_device
+    assert store.get_car_names() == ["Car1"]
+    meters_driven = store.load_values(store.get_result_filepath("DrivingDistance.Car1"))
+    assert meters_driven.tolist() == [1, 2, 3]
+    assert store.load_values(store.get_result_filepath("DrivingDistance.Car1")) is meters_driven
+    assert len(loaded_files) == 2
+
+    # a changed file gets parsed again
+    with open(flexibility_filepath, "w", encoding="utf-8") as openfile:
+        json.dump(events[:1], openfile)
+    os.utime(flexibility_filepath, ns=(0, 0))
+    assert list(store.get_flexibility_events_by_device()) == ["B"]
+    assert len(loaded_files) == 3
+
+    # after a reset, the next simulation gets a new store
+    lpg_result_store.reset_lpg_result_stores()
+    assert lpg_result_store.get_lpg_result_store(reports_directory, results_directory) is not store
+
+
+@pytest.mark.base
+def test_compute_residents_and_heating_by_residents():
+    """Tests the combination of the bodily activity profiles."""
+    high_activity = np.array([1, 2, 0, 1])
+    low_activity = np.array([1, 0, 2, 0])
+    number_of_residents, heating_by_residents = lpg_result_store.compute_residents_and_heating_by_residents(
+        [high_activity, low_activity], 3
+    )
+    assert number_of_residents.tolist() == [2, 2, 2]
+    assert heating_by_residents.tolist() == [250, 300, 200]
+    with pytest.raises(IndexError):
+        lpg_result_store.compute_residents_and_heating_by_residents([high_activity, low_activity], 5)
+
+
+@pytest.mark.base
+def test_resample_to_timestep():
+    """Tests the averaging and summation of a profile in minutes to longer time steps."""
+    values = [0.1, 0.2, 0.3, 0.4, 0.5]
+    averaged = lpg_result_store.resample_to_timestep(values, number_of_minutes=6, minutes_per_timestep=3, average=True)
+    assert averaged.tolist() == [sum(values[:3]) / 3, sum(values[3:]) / 3]
+    summed = lpg_result_store.resample_to_timestep(values, number_of_minutes=4, minutes_per_timestep=2, average=False)
+    assert summed.tolist() == [sum(values[:2]), sum(values[2:4])]
@@ -160,6 +160,6 @@ def simulation_for_one_time_step(
 
     scaling_factor_number_of_apartments = building_number_of_apartments
 
-    occupancy_outputs = stsv.values[-4:]
+    occupancy_outputs = stsv.values[-4:].tolist()
 
     return occupancy_outputs, scaling_factor_number_of_apartments
@@ -0,0 +1,98 @@
+"""Test for the incremental collection of the pyam data of several result folders."""
+
+# clean
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from hisim import log
+from hisim.postprocessing import pyam_data_collection
+from hisim.postprocessing.pyam_data_collection import PyamDataCollector, PyamDataProcessingModeEnum, PyamDataTypeEnum
+
+
+def write_result_folder(results_folder: str, number: int, value: float) -> str:
+    """Writes the pyam data of a fake simulation with one yearly csv file."""
+    pyam_data_folder = os.path.join(results_folder, f"run_{number}", "pyam_data")
+    os.makedirs(pyam_data_folder, exist_ok=True)
+    with open(os.path.join(pyam_data_folder, "data_information_for_pyam.json"), "w", encoding="utf-8") as openfile:
+        json.dump(
+            {
+                "myModuleConfig": {"total_base_area_in_m2": 100 + number},
+                "pyamDataInformation": {"duration in days": 365},
+            },
+            openfile,
+        )
+    csv_file = os.path.join(pyam_data_folder, "pyam_dataframe_yearly_data.csv")
+    pd.DataFrame(
+        {
+            "model": ["HiSim"] * 2,
+            "scenario": [f"basic_household_{number}12345"] * 2,
+            "region": ["Aachen"] * 2,
+            "variable": ["Power", "Heat"],
+            "unit": ["W", None],
+            "time": [2021] * 2,
+            "value": [value, 2 * value],
+        }
+    ).to_csv(csv_file, index=False)
+    return csv_file
+
+
+@pytest.mark.base
+def test_pyam_data_collection(tmp_path, monkeypatch):
+    """Tests that a second collection reads only new or changed csv files and writes the same table."""
+    # the collector logs its progress, independent of the logging level other tests left behind
+    monkeypatch.setattr(log, "LOGGING_LEVEL", log.LogPrio.INFORMATION)
+    results_folder = os.path.join(str(tmp_path), "examples", "results")
+    for number in range(3):
+        write_result_folder(results_folder, number, float(number))
+    # the collector finds the results relative to the working directory
+    os.makedirs(os.path.join(str(tmp_path), "a", "b"))
+    monkeypatch.chdir(os.path.join(str(tmp_path), "a", "b"))
+    collected_filename = os.path.join(
+        str(tmp_path),
+        "examples",
+        "results_for_scenario_comparison",
+        "data",
+        "data_with_all_parameters",
+        "simulation_duration_of_365_days",
+        "pyam_dataframe_for_365_days_yearly_data.csv",
+    )
+
+    def collect():
+        PyamDataCollector(
+            data_processing_mode=PyamDataProcessingModeEnum.PROCESS_ALL_DATA,
+            simulation_duration_to_check="365",
+            time_resolution_of_data_set=PyamDataTypeEnum.YEARLY,
+        )
+        with open(collected_filename, "r", encoding="utf-8") as openfile:
+            return openfile.read()
+
+    first_collection = collect()
+    collected_data = pd.read_csv(collected_filename)
+    assert len(collected_data) == 6
+    assert sorted(collected_data["hash"].unique()) == [12345, 112345, 212345]
+    assert collected_data["unit"].isna().sum() == 3
+
+    read_csv_files = []
+    original_read_csv = pd.read_csv
+
+    def counting_read_csv(filepath, *args, **kwargs):
+        read_csv_files.append(filepath)
+        return original_read_csv(filepath, *args, **kwargs)
+
+    monkeypatch.setattr(pyam_data_collection.pd, "read_csv", counting_read_csv)
+    assert collect() == first_collection
+    assert not read_csv_files
+
+    # a new result folder and a changed csv file are read again, the others come from the manifest
+    new_csv_file = write_result_folder(results_folder, 3, 3.0)
+    changed_csv_file = write_result_folder(results_folder, 0, 10.0)
+    os.utime(changed_csv_file, ns=(0, 0))
+    collect()
+    assert sorted(os.path.abspath(filepath) for filepath in read_csv_files) == sorted([new_csv_file, changed_csv_file])
+    collected_data = original_read_csv(collected_filename)
+    assert len(collected_data) == 8
+    assert 20.0 in collected_data["value"].values
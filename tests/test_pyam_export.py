@@ -0,0 +1,49 @@
+"""Test for the export of the results as pyam tables."""
+
+# clean
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim import log
+from hisim.postprocessing.postprocessing_main import PostProcessor
+
+
+@pytest.mark.base
+def test_write_results_to_pyam_csv(tmp_path, monkeypatch):
+    """Tests that the pyam table has a row per column and timestep, also if it is written in several batches."""
+    # the post processor logs its execution time, independent of the logging level other tests left behind
+    monkeypatch.setattr(log, "LOGGING_LEVEL", log.LogPrio.INFORMATION)
+    all_outputs = [
+        cp.ComponentOutput("FakeSource", "Power", lt.LoadTypes.ELECTRICITY, lt.Units.WATT, output_description="a"),
+        cp.ComponentOutput("OtherSource", "Temperature", lt.LoadTypes.TEMPERATURE, lt.Units.CELSIUS, output_description="b"),
+        cp.ComponentOutput("OtherSource", "Heat", lt.LoadTypes.HEATING, lt.Units.WATT_HOUR, output_description="c"),
+    ]
+    index = pd.date_range("2021-01-01", periods=48, freq="H")
+    results = pd.DataFrame(
+        np.arange(len(index) * len(all_outputs), dtype=float).reshape(len(index), len(all_outputs)),
+        index=index,
+        columns=[output.get_pretty_name() for output in all_outputs],
+    )
+    my_postprocessor = PostProcessor()
+    my_postprocessor.model = "HiSim_test"
+    my_postprocessor.scenario = "scenario"
+    my_postprocessor.region = "Aachen"
+    # two columns per batch
+    my_postprocessor.PyamRowsPerBatch = 100
+    filename = str(tmp_path / "hourly.csv")
+    my_postprocessor.write_results_to_pyam_csv(results_df=results, filename=filename)
+
+    pyam_data = pd.read_csv(filename, parse_dates=["time"])
+    assert list(pyam_data.columns) == ["model", "scenario", "region", "variable", "unit", "time", "value"]
+    assert len(pyam_data) == results.size
+    for column_number, column in enumerate(results.columns):
+        variable_name, unit = my_postprocessor.get_variable_name_and_unit_from_ppdt_results_column(column)
+        rows = pyam_data.iloc[column_number * len(index) : (column_number + 1) * len(index)]
+        assert (rows["variable"] == variable_name).all() and (rows["unit"] == unit).all()
+        assert (rows["time"].to_numpy() == index.to_numpy()).all()
+        assert np.array_equal(rows["value"].to_numpy(), results[column].to_numpy())
+    assert (pyam_data[["model", "scenario", "region"]] == ["HiSim_test", "scenario", "Aachen"]).all().all()
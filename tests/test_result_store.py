@@ -0,0 +1,79 @@
+"""Test for the preallocated result store."""
+
+# clean
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim import log
+from hisim.result_store import ResultStore
+
+
+@pytest.mark.base
+def test_result_store(tmp_path, monkeypatch):
+    """Tests that the rows get written in place and the dataframe is a view on the matrix."""
+    # the memory mapped result store logs, independent of the logging level other tests left behind
+    monkeypatch.setattr(log, "LOGGING_LEVEL", log.LogPrio.INFORMATION)
+    outputs = [
+        cp.ComponentOutput("FakeSource", "FakeOutput1", lt.LoadTypes.ELECTRICITY, lt.Units.WATT),
+        cp.ComponentOutput("FakeSource", "FakeOutput2", lt.LoadTypes.TEMPERATURE, lt.Units.CELSIUS),
+    ]
+    for index, output in enumerate(outputs):
+        output.global_index = index
+    stsv = cp.SingleTimeStepValues(len(outputs))
+    index = pd.date_range("2021-01-01", periods=3, freq="min")
+
+    for memory_map_directory in [None, str(tmp_path)]:
+        my_result_store = ResultStore(
+            number_of_timesteps=3, all_outputs=outputs, memory_map_directory=memory_map_directory
+        )
+        for timestep in range(3):
+            stsv.values[:] = [timestep, 10 * timestep]
+            my_result_store.write_timestep(timestep, stsv)
+        my_result_store.flush()
+        results = my_result_store.get_data_frame(index=index)
+
+        assert my_result_store.number_of_written_timesteps == 3
+        assert np.shares_memory(results.values, my_result_store.values)
+        assert results.columns[1] == outputs[1].get_pretty_name()
+        assert results.iloc[2, 1] == 20
+
+    saved_matrix = np.load(os.path.join(str(tmp_path), ResultStore.MatrixFilename))
+    assert saved_matrix[1, 1] == 10
+
+
+@pytest.mark.base
+def test_load_result_store(tmp_path, monkeypatch):
+    """Tests that a memory mapped result store can be loaded with its outputs and postprocessing flags."""
+    # the result store logs the memory mapping, independent of the logging level other tests left behind
+    monkeypatch.setattr(log, "LOGGING_LEVEL", log.LogPrio.INFORMATION)
+    outputs = [
+        cp.ComponentOutput(
+            "FakeBattery",
+            "AcBatteryPower",
+            lt.LoadTypes.ELECTRICITY,
+            lt.Units.WATT,
+            postprocessing_flag=[lt.InandOutputType.CHARGE_DISCHARGE, lt.ComponentType.BATTERY],
+        ),
+        cp.ComponentOutput("FakeBuilding", "TemperatureIndoorAir", lt.LoadTypes.TEMPERATURE, lt.Units.CELSIUS),
+    ]
+    my_result_store = ResultStore(
+        number_of_timesteps=4, all_outputs=outputs, memory_map_directory=str(tmp_path), seconds_per_timestep=900
+    )
+    my_result_store.values[:] = np.arange(8, dtype=float).reshape(4, 2)
+    my_result_store.flush()
+
+    loaded_result_store = ResultStore.load(str(tmp_path))
+    assert loaded_result_store.seconds_per_timestep == 900
+    assert loaded_result_store.get_column_names() == my_result_store.get_column_names()
+    assert loaded_result_store.all_outputs[0].postprocessing_flag == outputs[0].postprocessing_flag
+    loaded_postprocessing_flag = loaded_result_store.all_outputs[0].postprocessing_flag
+    assert loaded_postprocessing_flag is not None
+    assert isinstance(loaded_postprocessing_flag[1], lt.ComponentType)
+    assert loaded_result_store.all_outputs[1].postprocessing_flag is None
+    np.testing.assert_array_equal(loaded_result_store.values, my_result_store.values)
@@ -0,0 +1,41 @@
+"""Test for the aggregation of the simulation results."""
+
+# clean
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim.simulationparameters import AggregationLevel, SimulationParameters
+from hisim.simulator import Simulator
+
+
+@pytest.mark.base
+def test_get_std_results():
+    """Tests that temperatures get averaged, energies get summed up and skipped levels stay empty."""
+    my_simulation_parameters = SimulationParameters(
+        datetime.datetime(2021, 1, 1), datetime.datetime(2021, 1, 3), seconds_per_timestep=60
+    )
+    my_simulation_parameters.result_aggregation_levels = [AggregationLevel.CUMULATIVE, AggregationLevel.DAILY]
+    my_simulator = Simulator(
+        module_directory="", module_filename="", setup_function="", my_simulation_parameters=my_simulation_parameters
+    )
+    my_simulator.all_outputs = [
+        cp.ComponentOutput("FakeSource", "Energy", lt.LoadTypes.ELECTRICITY, lt.Units.WATT_HOUR),
+        cp.ComponentOutput("FakeSource", "Temperature", lt.LoadTypes.TEMPERATURE, lt.Units.CELSIUS),
+    ]
+    timesteps = my_simulation_parameters.timesteps
+    results = pd.DataFrame(
+        {"Energy": np.ones(timesteps), "Temperature": np.repeat([10.0, 20.0], timesteps // 2)}
+    )
+
+    cumulative, monthly, daily, hourly = my_simulator.get_std_results(results)
+
+    assert cumulative.columns.tolist() == ["Energy", "Temperature"]
+    assert cumulative.values.tolist() == [[timesteps, 15.0]]
+    assert daily.values.tolist() == [[1440.0, 10.0], [1440.0, 20.0]]
+    assert monthly.empty and hourly.empty
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from hisim import sim_repository
 from hisim import component
@@ -35,3 +36,42 @@ def test_weather():
         DNI.append(stsv.values[my_weather.DNI_output.global_index])
 
     assert sum(DNI) > 950
+
+    # the precomputed timeseries must match the simulated values
+    exogenous_timeseries = my_weather.i_get_exogenous_timeseries()
+    assert exogenous_timeseries is not None
+    assert np.array_equal(exogenous_timeseries[my_weather.DNI_output], DNI)
+
+
+@pytest.mark.base
+def test_preprocessed_weather_data():
+    """Tests that the preprocessed weather data is shared and that the cache file gives the same data."""
+    my_weather_config = weather.WeatherConfig.get_default(
+        location_entry=weather.LocationEnum.Aachen
+    )
+    weather.get_preprocessed_weather_data.cache_clear()
+    weather_index, weather_data = weather.get_preprocessed_weather_data(
+        my_weather_config.source_path, my_weather_config.data_source, 2021
+    )
+    assert len(weather_index) == 60 * 24 * 365
+    assert set(weather_data) == set(weather.WEATHER_FILE_COLUMNS) | {
+        "DNIextra",
+        "altitude",
+        "azimuth",
+        "apparent_zenith",
+    }
+    # all Weather components of a process get the same arrays
+    assert (
+        weather.get_preprocessed_weather_data(
+            my_weather_config.source_path, my_weather_config.data_source, 2021
+        )[1]
+        is weather_data
+    )
+    # a new process reads the cache file
+    weather.get_preprocessed_weather_data.cache_clear()
+    loaded_index, loaded_data = weather.get_preprocessed_weather_data(
+        my_weather_config.source_path, my_weather_config.data_source, 2021
+    )
+    assert loaded_index.equals(weather_index)
+    for name, values in weather_data.items():
+        assert np.array_equal(loaded_data[name], values)